@@ -0,0 +1,82 @@
+"""Benchmark: the __slots__ Zi backend against the tuple-backed one.
+
+Each backend runs in its own interpreter (the backend is fixed when
+src.zi is first imported), timing construction, attribute access,
+hashing and an arithmetic loop over the same values, and reporting the
+memory per instance.
+
+    python -m benchmarks.bench_backend [N]
+"""
+
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROWS = ('construct', 'real+imag', 'hash', 'arithmetic', 'bytes/inst')
+
+
+def _time(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _measure(n):
+    """Run in the child: print one 'label value' line per row."""
+    from src.zi import Zi
+
+    rng = random.Random(33)
+    pairs = [(rng.randint(-10 ** 9, 10 ** 9), rng.randint(-10 ** 9, 10 ** 9))
+             for _ in range(n)]
+    zs = [Zi(a, b) for a, b in pairs]
+
+    def construct():
+        for a, b in pairs:
+            Zi(a, b)
+
+    def access():
+        for z in zs:
+            z.real
+            z.imag
+
+    def hashing():
+        # Fresh objects, so a cached hash can't help either backend.
+        for z in [Zi(a, b) for a, b in pairs]:
+            hash(z)
+            hash(z)
+
+    def arithmetic():
+        acc = Zi(0, 0)
+        for z in zs:
+            acc = (acc + z) * Zi(0, 1) - z.conjugate()
+
+    print('construct', _time(construct))
+    print('real+imag', _time(access))
+    print('hash', _time(hashing))
+    print('arithmetic', _time(arithmetic))
+    print('bytes/inst', sys.getsizeof(zs[0]))
+
+
+def main():
+    if os.environ.get('_BENCH_BACKEND_CHILD'):
+        _measure(int(sys.argv[1]))
+        return
+    n = sys.argv[1] if len(sys.argv) > 1 else '500000'
+    results = {}
+    for backend in ('slots', 'tuple'):
+        env = dict(os.environ, GAUSSIANS_ZI_BACKEND=backend, _BENCH_BACKEND_CHILD='1')
+        out = subprocess.run([sys.executable, '-m', 'benchmarks.bench_backend', n],
+                             env=env, capture_output=True, text=True, check=True).stdout
+        results[backend] = dict(line.split() for line in out.splitlines())
+    print(f"{int(n):,} values; seconds per loop except bytes/inst")
+    print(f"{'':>12} {'slots':>10} {'tuple':>10}")
+    for row in ROWS:
+        s, t = float(results['slots'][row]), float(results['tuple'][row])
+        fmt = '{:>10.0f}' if row == 'bytes/inst' else '{:>10.3f}'
+        print(f"{row:>12} {fmt.format(s)} {fmt.format(t)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark: batch gcd, primality and factorization over a process pool.
+
+Times each operation single-threaded and through ZiPool at 1, 2, 4, ...
+workers up to os.cpu_count(), and reports the speedup over the
+single-threaded loop.
+
+    python -m benchmarks.bench_batch [N]
+"""
+
+import os
+import random
+import sys
+import time
+
+from src.batch import ZiPool
+from src.zi import Zi
+
+
+def _inputs(n, rng):
+    def zi(bound):
+        return Zi(rng.randint(-bound, bound), rng.randint(-bound, bound))
+    return {
+        'gcd': [(zi(10 ** 12), zi(10 ** 12)) for _ in range(n)],
+        'is_prime': [zi(10 ** 4) for _ in range(n)],
+        'factor': [z for z in (zi(10 ** 9) for _ in range(n // 10)) if z],
+    }
+
+
+def _serial(op, values):
+    if op == 'gcd':
+        return [Zi.gcd(a, b) for a, b in values]
+    if op == 'is_prime':
+        return [Zi.is_gaussian_prime(z) for z in values]
+    return [Zi.factor(z) for z in values]
+
+
+def main(n=20_000):
+    rng = random.Random(41)
+    inputs = _inputs(n, rng)
+    cpus = os.cpu_count() or 1
+    counts = [w for w in (1, 2, 4, 8, 16, 32, 64) if w < cpus] + [cpus]
+    print(f"{cpus} CPUs; seconds (speedup over serial)")
+    print(f"{'op':>10} {'values':>9} {'serial':>8}" + ''.join(f" {f'{w}w':>14}" for w in counts))
+    for op, values in inputs.items():
+        start = time.perf_counter()
+        expected = _serial(op, values)
+        serial = time.perf_counter() - start
+        row = f"{op:>10} {len(values):>9,} {serial:>8.2f}"
+        for w in counts:
+            with ZiPool(w) as pool:
+                start = time.perf_counter()
+                got = list(pool.map(op, values))
+                elapsed = time.perf_counter() - start
+            assert got == expected
+            row += f" {elapsed:>7.2f} ({serial / elapsed:>4.1f}x)"
+        print(row)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,43 @@
+"""Benchmark: finding shared factors among N Gaussian integers, with a
+Zi.gcd on every pair versus the product/remainder-tree batch gcd.
+
+    python -m benchmarks.bench_batchgcd [N]
+"""
+
+import random
+import sys
+import time
+
+from src.batchgcd import batch_gcd
+from src.zi import Zi
+
+
+def _pairwise(values):
+    shared = [False] * len(values)
+    for i, x in enumerate(values):
+        for j in range(i + 1, len(values)):
+            if not Zi.gcd(x, values[j]).is_unit:
+                shared[i] = shared[j] = True
+    return shared
+
+
+def main(n=300):
+    rng = random.Random(47)
+    values = [Zi(rng.randint(1, 10 ** 12), rng.randint(1, 10 ** 12)) for _ in range(n)]
+    p = Zi(1_000_003, 2)
+    for k in range(0, n, 50):
+        values[k] = values[k] * p
+    print(f"{n:,} values, components up to 10^12")
+    start = time.perf_counter()
+    shared = _pairwise(values)
+    pairwise = time.perf_counter() - start
+    print(f"  pairwise gcds:  {pairwise:7.2f} s  ({sum(shared):,} share a factor)")
+    start = time.perf_counter()
+    gcds = batch_gcd(values)
+    tree = time.perf_counter() - start
+    print(f"  batch gcd:      {tree:7.2f} s  ({sum(g != 1 for g in gcds):,} share a factor)"
+          f"  {pairwise / tree:6.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
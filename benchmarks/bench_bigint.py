@@ -0,0 +1,57 @@
+"""Benchmark matrix: Zi arithmetic on Python ints against gmpy2 mpz.
+
+For each component size and operation, times the same work with plain
+int components and with the components promoted to mpz, and reports the
+speedup. Without gmpy2 only the Python column is filled in.
+
+    python -m benchmarks.bench_bigint
+"""
+
+import random
+import time
+
+from src import bigint
+from src.zi import Zi
+
+DIGITS = (100, 1_000, 10_000, 100_000)
+OPS = {
+    'mul': lambda a, b: a * b,
+    'divmod': lambda a, b: Zi.modified_divmod(a, b),
+    'gcd': lambda a, b: Zi.gcd(a, b),
+}
+
+
+def _time(op, a, b):
+    reps = 0
+    start = time.perf_counter()
+    while True:
+        op(a, b)
+        reps += 1
+        elapsed = time.perf_counter() - start
+        if elapsed > 0.2:
+            return elapsed / reps
+
+
+def main():
+    rng = random.Random(40)
+    print(f"backends: {', '.join(bigint.available_backends())}; seconds per operation")
+    print(f"{'op':>8} {'digits':>8} {'python':>12} {'gmpy2':>12} {'speedup':>8}")
+    for name, op in OPS.items():
+        for digits in DIGITS:
+            if name == 'gcd' and digits > 1_000:
+                continue  # quadratic number of steps; too slow in pure Python
+            bound = 10 ** digits
+            a = Zi(rng.randint(-bound, bound), rng.randint(-bound, bound))
+            b = Zi(rng.randint(-bound, bound), rng.randint(-bound, bound)) if name == 'mul' \
+                else Zi(rng.randint(-bound, bound) // 7, rng.randint(-bound, bound) // 11)
+            py = _time(op, a, b)
+            if bigint.HAVE_GMPY2:
+                bigint.set_backend('gmpy2')
+                gm = _time(op, bigint.promote(a, 0), bigint.promote(b, 0))
+                print(f"{name:>8} {digits:>8,} {py:>12.2e} {gm:>12.2e} {py / gm:>7.1f}x")
+            else:
+                print(f"{name:>8} {digits:>8,} {py:>12.2e} {'n/a':>12} {'':>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark: varint binary streams against str()-per-line text files.
+
+Writes N Zi (and N/4 Qi) values to a temporary file both ways and reads
+them back, reporting the file size and the seconds for each direction.
+The text baseline parses Zi lines with Zi(complex(line)) and Qi lines
+with Qi(line), which is what loading str() output comes down to.
+
+    python -m benchmarks.bench_binio [N]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from fractions import Fraction
+
+from src.binio import ZiReader, ZiWriter
+from src.qi import Qi
+from src.zi import Zi
+
+
+def _time(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _text(path, values, parse):
+    def write():
+        with open(path, 'w') as f:
+            f.writelines(f"{v}\n" for v in values)
+
+    def read():
+        with open(path) as f:
+            return [parse(line) for line in f]
+
+    return _time(write)[0], _time(read), os.path.getsize(path)
+
+
+def _binary(path, values, kind):
+    def write():
+        with open(path, 'wb') as f, ZiWriter(f, kind) as w:
+            w.write_many(values)
+
+    def read():
+        with open(path, 'rb') as f:
+            return ZiReader(f).read_all()
+
+    return _time(write)[0], _time(read), os.path.getsize(path)
+
+
+def _bench(label, values, kind, parse, path):
+    print(f"{label}: {len(values):,} values")
+    print(f"{'':>8} {'MB':>8} {'write s':>9} {'read s':>9}")
+    for name, (wt, (rt, back), size) in (("text", _text(path, values, parse)),
+                                         ("varint", _binary(path, values, kind))):
+        assert name == "text" or back == values
+        print(f"{name:>8} {size / 1e6:>8.1f} {wt:>9.3f} {rt:>9.3f}")
+    print()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(37)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'values')
+        zs = [Zi(rng.randint(-10 ** 6, 10 ** 6), rng.randint(-10 ** 6, 10 ** 6)) for _ in range(n)]
+        _bench("Zi", zs, 'zi', lambda line: Zi(complex(line)), path)
+        qs = [Qi(Fraction(rng.randint(-999, 999), rng.randint(2, 99)),
+                 Fraction(rng.randint(-999, 999), rng.randint(2, 99)))
+              for _ in range(n // 4)]
+        _bench("Qi", qs, 'qi', Qi, path)
+
+
+if __name__ == '__main__':
+    main()
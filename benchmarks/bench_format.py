@@ -0,0 +1,60 @@
+"""Benchmark: formatting and writing Zi/Qi values as text.
+
+Times textio.dump of N values to a temporary file, against formatting
+the same values through complex (the old Zi.__str__, inexact beyond
+2**53), and against writing the already-formatted text (the I/O floor).
+
+    python -m benchmarks.bench_format [N]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from fractions import Fraction
+
+from src import textio
+from src.qi import Qi
+from src.zi import Zi
+
+
+def _time(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _bench(label, values, path):
+    def via_complex():
+        return '\n'.join(str(complex(v.real, v.imag)) for v in values)
+
+    def dump():
+        with open(path, 'w') as f:
+            textio.dump(values, f)
+
+    text = textio.dumps(values)
+
+    def write_only():
+        with open(path, 'w') as f:
+            f.write(text)
+
+    print(f"{label:>10} {_time(via_complex):>12.3f} {_time(dump):>12.3f} {_time(write_only):>12.3f}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(39)
+    print(f"{n:,} values; seconds")
+    print(f"{'':>10} {'via complex':>12} {'dump':>12} {'write only':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'values.txt')
+        _bench("Zi small", [Zi(rng.randint(-999, 999), rng.randint(-999, 999)) for _ in range(n)], path)
+        _bench("Zi 2**62", [Zi(rng.randint(-2 ** 62, 2 ** 62), rng.randint(-2 ** 62, 2 ** 62))
+                            for _ in range(n)], path)
+        _bench("Qi", [Qi(Fraction(rng.randint(-999, 999), rng.randint(2, 99)), rng.randint(-99, 99))
+                      for _ in range(n // 4)], path)
+
+
+if __name__ == '__main__':
+    main()
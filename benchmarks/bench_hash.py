@@ -0,0 +1,53 @@
+"""Benchmark: dict/set indexing of Zi and Qi with cached hashes.
+
+Inserts N distinct values into a dict several times. The first pass
+computes (and caches) every hash; later passes, like any re-indexing,
+membership test or set operation on the same objects, reuse the cached
+value. For comparison, the "uncached" column recomputes the hash the
+way __hash__ did before caching, hash((real, imag)), on every pass.
+
+    python -m benchmarks.bench_hash [N]
+"""
+
+import random
+import sys
+import time
+from fractions import Fraction
+
+from src.qi import Qi
+from src.zi import Zi
+
+PASSES = 3
+
+
+def _time(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _bench(label, values):
+    print(f"{label}: {len(values):,} values, dict insertion, seconds per pass")
+    cached = [_time(lambda: dict.fromkeys(values)) for _ in range(PASSES)]
+    uncached = [_time(lambda: {hash((v.real, v.imag)): v for v in values}) for _ in range(PASSES)]
+    print(f"{'pass':>6} {'cached':>10} {'uncached':>10}")
+    for k in range(PASSES):
+        print(f"{k + 1:>6} {cached[k]:>10.3f} {uncached[k]:>10.3f}")
+    print(f"memory per instance: {sys.getsizeof(values[0])} bytes")
+    print()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(32)
+    zs = list({Zi(rng.randint(-10 ** 9, 10 ** 9), rng.randint(-10 ** 9, 10 ** 9))
+               for _ in range(n)})
+    _bench("Zi", zs)
+    qs = [Qi(Fraction(rng.randint(-10 ** 6, 10 ** 6), rng.randint(2, 10 ** 6)),
+             Fraction(rng.randint(-10 ** 6, 10 ** 6), rng.randint(2, 10 ** 6)))
+          for _ in range(n // 4)]
+    _bench("Qi", qs)
+
+
+if __name__ == '__main__':
+    main()
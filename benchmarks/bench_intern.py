@@ -0,0 +1,62 @@
+"""Benchmark: effect of interning small Gaussian integers on gcd-heavy work.
+
+Runs the same gcd/xgcd workload with interning enabled and disabled, and
+reports wall time and how many Zi instances were actually allocated.
+
+    python -m benchmarks.bench_intern
+"""
+
+import random
+import time
+
+import src.zi
+from src.zi import Zi
+
+N_PAIRS = 5_000
+
+
+def _workload(pairs):
+    for a, b in pairs:
+        Zi.gcd(a, b)
+        Zi.xgcd(a, b)
+
+
+def _run(pairs, intern_max):
+    allocated = 0
+    make = Zi._make.__func__
+
+    def counting_make(cls, a, b):
+        nonlocal allocated
+        allocated += 1
+        return make(cls, a, b)
+
+    saved, saved_table = src.zi._INTERN_MAX, dict(src.zi._interned)
+    src.zi._INTERN_MAX = intern_max
+    src.zi._interned.clear()
+    Zi._make = classmethod(counting_make)
+    try:
+        start = time.perf_counter()
+        _workload(pairs)
+        elapsed = time.perf_counter() - start
+    finally:
+        Zi._make = classmethod(make)
+        src.zi._INTERN_MAX = saved
+        src.zi._interned.clear()
+        src.zi._interned.update(saved_table)
+    return elapsed, allocated
+
+
+def main():
+    rng = random.Random(31)
+    pairs = [(Zi(rng.randint(-10 ** 6, 10 ** 6), rng.randint(-10 ** 6, 10 ** 6)),
+              Zi(rng.randint(-10 ** 3, 10 ** 3), rng.randint(-10 ** 3, 10 ** 3)))
+             for _ in range(N_PAIRS)]
+    print(f"gcd + xgcd of {N_PAIRS} pairs")
+    print(f"{'interning':>12} {'seconds':>10} {'Zi allocated':>14}")
+    for label, bound in (('off', -1), ('on', src.zi._INTERN_MAX)):
+        elapsed, allocated = _run(pairs, bound)
+        print(f"{label:>12} {elapsed:>10.3f} {allocated:>14,}")
+
+
+if __name__ == '__main__':
+    main()
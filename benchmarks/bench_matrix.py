@@ -0,0 +1,84 @@
+"""Benchmark: linear algebra over Z[i] with nested lists of Zi/Qi versus
+ZiMatrix.
+
+    determinant   Gaussian elimination over Qi  vs  Bareiss (det)
+    product       triple loop over Zi           vs  @ (classical, then
+                                                    with Strassen)
+
+    python -m benchmarks.bench_matrix [N]
+"""
+
+import random
+import sys
+import time
+
+from src import matrix
+from src.matrix import ZiMatrix
+from src.qi import Qi
+from src.zi import Zi
+
+
+def _qi_det(rows):
+    rows = [[Qi(z.real, z.imag) for z in row] for row in rows]
+    n, det = len(rows), Qi(1, 0)
+    for c in range(n):
+        p = next((i for i in range(c, n) if rows[i][c] != 0), None)
+        if p is None:
+            return Qi(0, 0)
+        if p != c:
+            rows[c], rows[p] = rows[p], rows[c]
+            det = -det
+        pivot = rows[c][c]
+        det = det * pivot
+        for i in range(c + 1, n):
+            f = rows[i][c] / pivot
+            rows[i] = [x - f * y for x, y in zip(rows[i], rows[c])]
+    return det
+
+
+def _zi_matmul(a, b):
+    cols = list(zip(*b))
+    return [[sum((x * y for x, y in zip(row, col)), Zi(0)) for col in cols] for row in a]
+
+
+def _time(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main(n=128):
+    rng = random.Random(50)
+
+    def rand(size, bound):
+        return [[Zi(rng.randint(-bound, bound), rng.randint(-bound, bound)) for _ in range(size)]
+                for _ in range(size)]
+
+    d = max(2, n // 4)
+    rows = rand(d, 100)
+    qi, expected = _time(_qi_det, rows)
+    bareiss, det = _time(ZiMatrix(rows).det)
+    assert Qi(det.real, det.imag) == expected
+    print(f"{d}x{d} determinant, entries up to 100")
+    print(f"  Qi elimination:  {qi:7.3f} s")
+    print(f"  Bareiss:         {bareiss:7.3f} s  {qi / bareiss:6.1f}x")
+
+    for bound in (10 ** 6, 10 ** 100):
+        a, b = rand(n, bound), rand(n, bound)
+        naive, expected = _time(_zi_matmul, a, b)
+        a, b = ZiMatrix(a), ZiMatrix(b)
+        old, matrix.STRASSEN_THRESHOLD = matrix.STRASSEN_THRESHOLD, n + 1
+        try:
+            classical, _ = _time(a.__matmul__, b)
+        finally:
+            matrix.STRASSEN_THRESHOLD = old
+        strassen, product = _time(a.__matmul__, b)
+        assert product.tolist() == expected
+        print(f"{n}x{n} product, entries up to 10^{len(str(bound)) - 1}")
+        print(f"  Zi triple loop:  {naive:7.3f} s")
+        print(f"  @, classical:    {classical:7.3f} s  {naive / classical:6.1f}x")
+        print(f"  @, Strassen:     {strassen:7.3f} s  {naive / strassen:6.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 128)
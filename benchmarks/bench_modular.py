@@ -0,0 +1,34 @@
+"""Benchmark: inverting N residues modulo one Gaussian prime, with a
+Zi.mod_inverse per value versus Montgomery batch inversion.
+
+    python -m benchmarks.bench_modular [N]
+"""
+
+import random
+import sys
+import time
+
+from src.modular import batch_inverse
+from src.zi import Zi
+
+
+def main(n=20_000):
+    rng = random.Random(48)
+    # Gaussian primes of norm 10^12 + 61 and 2^127 + 29.
+    for label, m, bound in [('small', Zi(848494, 529205), 10 ** 6),
+                            ('large', Zi(9756332321107114581, 8657664991242725014), 10 ** 38)]:
+        values = [Zi(rng.randint(-bound, bound), rng.randint(-bound, bound)) for _ in range(n)]
+        start = time.perf_counter()
+        single = [Zi.mod_inverse(a, m) for a in values]
+        one_by_one = time.perf_counter() - start
+        start = time.perf_counter()
+        batch = batch_inverse(values, m)
+        batched = time.perf_counter() - start
+        assert all((x - y) % m == 0 for x, y in zip(single, batch))
+        print(f"{n:,} inverses, {label} modulus (norm {m.norm().bit_length()} bits)")
+        print(f"  mod_inverse each:  {one_by_one:6.2f} s")
+        print(f"  batch_inverse:     {batched:6.2f} s  {one_by_one / batched:5.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,51 @@
+"""Benchmark: a product of K powers mod a Gaussian prime, with each
+power computed on its own (square-and-multiply mod m, then multiplied
+in) versus multi_pow, for several K.
+
+    python -m benchmarks.bench_multiexp [BITS]
+"""
+
+import random
+import sys
+import time
+
+from src.multiexp import multi_pow, plan
+from src.zi import Zi
+
+M = Zi(9756332321107114581, 8657664991242725014)     # norm 2^127 + 29, prime
+
+
+def _separate(bases, exponents, m):
+    out = Zi(1)
+    for b, e in zip(bases, exponents):
+        p, b = Zi(1), b % m
+        while e:
+            if e & 1:
+                p = p * b % m
+            b = b * b % m
+            e >>= 1
+        out = out * p % m
+    return out
+
+
+def main(bits=128):
+    rng = random.Random(49)
+    print(f"exponents of {bits} bits, modulus norm {M.norm().bit_length()} bits")
+    for k in (2, 8, 32, 128, 512):
+        bases = [Zi(rng.randint(-10 ** 30, 10 ** 30), rng.randint(-10 ** 30, 10 ** 30))
+                 for _ in range(k)]
+        exponents = [rng.getrandbits(bits) for _ in range(k)]
+        start = time.perf_counter()
+        expected = _separate(bases, exponents, M)
+        separate = time.perf_counter() - start
+        start = time.perf_counter()
+        result = multi_pow(bases, exponents, mod=M)
+        combined = time.perf_counter() - start
+        assert (result - expected) % M == 0
+        method, window, _ = plan(k, bits)
+        print(f"  K={k:4}  separate {separate:7.3f} s   multi_pow {combined:7.3f} s"
+              f"  {separate / combined:5.1f}x  ({method}, window {window})")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 128)
@@ -0,0 +1,51 @@
+"""Benchmark: pickled size and round-trip time for lists of Zi and Qi.
+
+Compares pickling a plain list (one reduce call per element) with
+PackedList (one packed integer block), for small and int64-range Zi
+components and for Qi.
+
+    python -m benchmarks.bench_pickle [N]
+"""
+
+import pickle
+import random
+import sys
+import time
+from fractions import Fraction
+
+from src.packed import PackedList
+from src.qi import Qi
+from src.zi import Zi
+
+
+def _round_trip(values):
+    start = time.perf_counter()
+    data = pickle.dumps(values, pickle.HIGHEST_PROTOCOL)
+    pickle.loads(data)
+    return len(data), time.perf_counter() - start
+
+
+def _bench(label, values):
+    plain_size, plain_time = _round_trip(list(values))
+    packed_size, packed_time = _round_trip(PackedList(values))
+    n = len(values)
+    print(f"{label:>16} {plain_size / n:>10.1f} {packed_size / n:>10.1f}"
+          f" {plain_time:>10.3f} {packed_time:>10.3f}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(36)
+    print(f"{n:,} values; bytes per value, and seconds for dumps + loads")
+    print(f"{'':>16} {'plain B':>10} {'packed B':>10} {'plain s':>10} {'packed s':>10}")
+    _bench("Zi, |c| < 1000", [Zi(rng.randint(-999, 999), rng.randint(-999, 999))
+                              for _ in range(n)])
+    _bench("Zi, int64", [Zi(rng.randint(-2 ** 62, 2 ** 62), rng.randint(-2 ** 62, 2 ** 62))
+                         for _ in range(n)])
+    _bench("Qi", [Qi(Fraction(rng.randint(-999, 999), rng.randint(2, 99)),
+                     Fraction(rng.randint(-999, 999), rng.randint(2, 99)))
+                  for _ in range(n // 4)])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark: the JSON-lines compute service under concurrent clients.
+
+Runs a server on a Unix socket and CLIENTS clients that each issue their
+share of N distinct gcd requests concurrently. Compares micro-batching
+(the default) against one request per batch (max_batch=1), then repeats
+the batched run to time answers served from the shared cache.
+
+    python -m benchmarks.bench_service [N]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.service import ZiClient, ZiServer
+from src.zi import Zi
+
+CLIENTS = 8
+
+
+async def _drive(path, pairs):
+    clients = [await ZiClient.connect(path=path) for _ in range(CLIENTS)]
+    start = time.perf_counter()
+    await asyncio.gather(*(clients[k % CLIENTS].gcd(a, b) for k, (a, b) in enumerate(pairs)))
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    return elapsed
+
+
+async def _run(pairs, repeat=False, **kwargs):
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'zi.sock')
+        async with ZiServer(**kwargs) as server:
+            await server.start(path=path)
+            times = [await _drive(path, pairs)]
+            if repeat:
+                times.append(await _drive(path, pairs))
+            return times, server.stats()
+
+
+def main(n=20_000):
+    rng = random.Random(44)
+    pairs = [(Zi(rng.randint(-10 ** 9, 10 ** 9), rng.randint(-10 ** 9, 10 ** 9)),
+              Zi(rng.randint(-10 ** 9, 10 ** 9), rng.randint(-10 ** 9, 10 ** 9))) for _ in range(n)]
+    print(f"{n:,} gcd requests from {CLIENTS} clients, {os.cpu_count()} CPUs")
+    (single,), stats = asyncio.run(_run(pairs, max_batch=1))
+    print(f"  one per batch:  {single:6.2f} s  {n / single:9,.0f} req/s  ({stats.batches:,} batches)")
+    (batched, cached), stats = asyncio.run(_run(pairs, repeat=True))
+    print(f"  micro-batched:  {batched:6.2f} s  {n / batched:9,.0f} req/s  ({stats.batches:,} batches)")
+    print(f"  cached:         {cached:6.2f} s  {n / cached:9,.0f} req/s  ({stats.cache_hits:,} hits)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
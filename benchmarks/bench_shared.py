@@ -0,0 +1,60 @@
+"""Benchmark: handing a dataset to pool workers as pickled Zi lists versus
+a SharedZiArray.
+
+Each task sums a slice of N Gaussian integers. The list version ships
+every slice to its worker by pickling; the shared version ships only
+the array's name and the slice bounds, and the worker reads the
+published memory in place.
+
+    python -m benchmarks.bench_shared [N]
+"""
+
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.shared import SharedZiArray
+from src.zi import Zi
+from src.ziarray import ZiArray
+
+TASKS = 64
+
+
+def _sum_list(values):
+    return sum(values, Zi(0))
+
+
+def _sum_shared(shared, lo, hi):
+    with shared:
+        return shared.array[lo:hi].sum()
+
+
+def main(n=1_000_000):
+    rng = random.Random(43)
+    values = [Zi(rng.randint(-10 ** 6, 10 ** 6), rng.randint(-10 ** 6, 10 ** 6)) for _ in range(n)]
+    bounds = [(k * n // TASKS, (k + 1) * n // TASKS) for k in range(TASKS)]
+    expected = ZiArray(values).sum()
+
+    with ProcessPoolExecutor() as pool:
+        pool.submit(int).result()  # start the workers before timing
+        start = time.perf_counter()
+        got = sum(pool.map(_sum_list, [values[lo:hi] for lo, hi in bounds]), Zi(0))
+        pickled = time.perf_counter() - start
+        assert got == expected
+
+        start = time.perf_counter()
+        with SharedZiArray(values) as shared:
+            publish = time.perf_counter() - start
+            got = sum(pool.map(_sum_shared, [shared] * TASKS, *zip(*bounds)), Zi(0))
+        shared_total = time.perf_counter() - start
+        assert got == expected
+
+    print(f"{n:,} values in {TASKS} tasks")
+    print(f"  pickled lists:  {pickled:.3f} s")
+    print(f"  shared memory:  {shared_total:.3f} s  (publishing: {publish:.3f} s)")
+    print(f"  speedup:        {pickled / shared_total:.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,32 @@
+"""Benchmark: the sharded Gaussian prime sieve at 1, 2, 4, ... workers.
+
+Sieves the norms up to LIMIT into a temporary directory with each
+worker count up to os.cpu_count(), and reports norms sieved per second.
+
+    python -m benchmarks.bench_sieve [LIMIT]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from src.sieve import sieve
+
+
+def main(limit=10 ** 7):
+    cpus = os.cpu_count() or 1
+    counts = [w for w in (1, 2, 4, 8, 16, 32, 64) if w < cpus] + [cpus]
+    segment_size = max(1 << 16, limit // (4 * cpus))
+    print(f"{cpus} CPUs; norms up to {limit:,}, segments of {segment_size:,}")
+    print(f"{'workers':>8} {'primes':>12} {'seconds':>9} {'norms/s':>12}")
+    for w in counts:
+        with tempfile.TemporaryDirectory() as d:
+            start = time.perf_counter()
+            index = sieve(d, limit, segment_size=segment_size, workers=w)
+            elapsed = time.perf_counter() - start
+        print(f"{w:>8} {len(index):>12,} {elapsed:>9.2f} {limit / elapsed:>12.3g}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 7)
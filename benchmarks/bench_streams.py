@@ -0,0 +1,42 @@
+"""Benchmark: the stream combinators over N Gaussian integers, fed one
+Zi at a time from a list versus from a ZiArray (the chunked array path).
+
+    python -m benchmarks.bench_streams [N]
+"""
+
+import random
+import sys
+import time
+from collections import deque
+
+from src import streams
+from src.zi import Zi
+from src.ziarray import ZiArray
+
+
+def _time(gen):
+    start = time.perf_counter()
+    deque(gen, maxlen=0)
+    return time.perf_counter() - start
+
+
+def main(n=200_000):
+    rng = random.Random(46)
+    values = [Zi(rng.randint(-10 ** 6, 10 ** 6), rng.randint(-10 ** 6, 10 ** 6)) for _ in range(n)]
+    array = ZiArray(values)
+    m = Zi(1009, -31)
+    print(f"{n:,} values, components up to 10^6")
+    for name, make in [
+        ('norms', lambda v: streams.norms(v)),
+        ('norm_filter', lambda v: streams.norm_filter(v, 10 ** 11, 10 ** 12)),
+        ('reduce_mod', lambda v: streams.reduce_mod(v, m)),
+        ('running_prod(mod)', lambda v: streams.running_prod(v, mod=m)),
+        ('prefix_gcd', lambda v: streams.prefix_gcd(v)),
+    ]:
+        scalar = _time(make(iter(values)))
+        vector = _time(make(array))
+        print(f"  {name:18} stream {scalar:6.3f} s   array {vector:6.3f} s   {scalar / vector:5.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,46 @@
+"""Benchmark: bulk text parsing against Qi(str) per line.
+
+Parses N lines of Zi literals and N lines of Qi literals (as written by
+str()) with textio.load, and with a Qi(line) call per line.
+
+    python -m benchmarks.bench_textio [N]
+"""
+
+import random
+import sys
+import time
+from fractions import Fraction
+
+from src import textio
+from src.qi import Qi
+from src.zi import Zi
+
+
+def _time(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _bench(label, lines):
+    per_line, expected = _time(lambda: [Qi(line) for line in lines])
+    bulk, got = _time(lambda: textio.load(lines))
+    assert got == expected
+    print(f"{label:>4} {per_line:>12.3f} {bulk:>12.3f} {len(lines) / bulk:>14,.0f}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(38)
+    zs = [f"{Zi(rng.randint(-10 ** 6, 10 ** 6), rng.randint(-10 ** 6, 10 ** 6))}\n"
+          for _ in range(n)]
+    qs = [f"{Qi(Fraction(rng.randint(-999, 999), rng.randint(2, 99)), Fraction(rng.randint(-999, 999), rng.randint(2, 99)))}\n"
+          for _ in range(n)]
+    print(f"{n:,} lines each; seconds, and lines per second for textio.load")
+    print(f"{'':>4} {'Qi(line)':>12} {'textio.load':>12} {'lines/s':>14}")
+    _bench("Zi", zs)
+    _bench("Qi", qs)
+
+
+if __name__ == '__main__':
+    main()
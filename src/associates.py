@@ -0,0 +1,103 @@
+"""Set and dict containers that treat Gaussian integers as equal up to
+units.
+
+Two Gaussian integers are associates when one is a unit (1, -1, i or -i)
+times the other. AssociateSet and AssociateDict store each element under
+its canonical form (Zi.canonical(): the associate in the first quadrant,
+real > 0 and imag >= 0), so
+
+    Zi(3, 4) in AssociateSet([Zi(-4, 3)])     # True: -4+3i == i*(3+4i)
+
+costs one normalization and one hash, instead of building and looking
+up all four associates. Iteration yields the canonical representatives.
+Anything Zi's arithmetic accepts (ints, complex) may be used as an
+element or key.
+"""
+
+from collections.abc import MutableMapping, MutableSet
+
+from src.zi import Zi
+
+
+def _canonical(z):
+    return Zi._require_zi(z).canonical()[0]
+
+
+class AssociateSet(MutableSet):
+    """A set of Gaussian integers, one per associate class."""
+
+    __slots__ = ('_items',)
+
+    def __init__(self, iterable=()):
+        # A dict rather than a set, to keep insertion order.
+        self._items = dict.fromkeys(map(_canonical, iterable))
+
+    def __contains__(self, z):
+        try:
+            return _canonical(z) in self._items
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, z):
+        self._items[_canonical(z)] = None
+
+    def discard(self, z):
+        self._items.pop(_canonical(z), None)
+
+    def representative(self, z):
+        """The canonical element of z's associate class, if it's in the
+        set; raises KeyError otherwise."""
+        c = _canonical(z)
+        if c not in self._items:
+            raise KeyError(z)
+        return c
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return cls(it)
+
+    def __repr__(self):
+        return f"AssociateSet({list(self._items)!r})"
+
+
+class AssociateDict(MutableMapping):
+    """A dict keyed by associate class: d[z], d[-z], d[1j*z] and d[-1j*z]
+    are all the same entry."""
+
+    __slots__ = ('_items',)
+
+    def __init__(self, other=(), **kwargs):
+        if kwargs:
+            raise TypeError("AssociateDict keys must be Gaussian integers")
+        self._items = {}
+        self.update(other)
+
+    def __getitem__(self, z):
+        return self._items[_canonical(z)]
+
+    def __setitem__(self, z, value):
+        self._items[_canonical(z)] = value
+
+    def __delitem__(self, z):
+        del self._items[_canonical(z)]
+
+    def __contains__(self, z):
+        try:
+            return _canonical(z) in self._items
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return f"AssociateDict({self._items!r})"
@@ -0,0 +1,180 @@
+"""Batch evaluation of Zi number theory over a process pool.
+
+    with ZiPool() as pool:                      # os.cpu_count() workers
+        gs = list(pool.map('gcd', pairs))       # in input order
+        for i, f in pool.map('factor', zs, ordered=False):
+            ...                                 # (input index, result) as ready
+
+Operations (see OPERATIONS): 'gcd', 'xgcd' and 'mod_inverse' take pairs
+(a, b); 'is_prime' and 'factor' take single values. Inputs may be any
+iterable, including a lazy one: it is consumed a chunk at a time, with a
+bounded number of chunks in flight, so memory stays flat however long it
+is.
+
+Chunking is adaptive: the first chunks are small, and each completed
+chunk's run time (measured in the worker) rescales the size of the next
+ones towards TARGET_SECONDS of work per chunk. Inputs travel as a
+PackedList (one packed integer block per chunk, see src/packed.py), and
+Zi results come back the same way.
+
+gcd_many, xgcd_many, is_prime_many and factor_many are one-shot
+shortcuts that start and stop a pool.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import chain, islice
+
+from src.packed import PackedList
+from src.zi import Zi
+
+OPERATIONS = ('gcd', 'xgcd', 'mod_inverse', 'is_prime', 'factor')
+_PAIRWISE = ('gcd', 'xgcd', 'mod_inverse')
+
+# Aim for this much work per chunk: long enough to amortize the transfer
+# and scheduling cost, short enough to balance load across workers.
+TARGET_SECONDS = 0.1
+MIN_CHUNK, MAX_CHUNK = 16, 1 << 16
+# Chunks in flight per worker.
+PREFETCH = 2
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def _compute(op, flat):
+    """Run op over a chunk (flat: a PackedList of operands; pairs are
+    interleaved). Returns results in a compact, picklable form."""
+    if op == 'gcd':
+        return PackedList(map(Zi.gcd, flat[0::2], flat[1::2]))
+    if op == 'xgcd':
+        return PackedList(chain.from_iterable(map(Zi.xgcd, flat[0::2], flat[1::2])))
+    if op == 'mod_inverse':
+        out = []
+        for a, m in zip(flat[0::2], flat[1::2]):
+            try:
+                out.append(Zi.mod_inverse(a, m))
+            except (ValueError, ZeroDivisionError):
+                out.append(None)
+        return out
+    if op == 'is_prime':
+        return bytes(map(Zi.is_gaussian_prime, flat))
+    return [Zi.factor(z) for z in flat]
+
+
+def _pair(op, pair):
+    if len(pair) != 2:
+        raise ValueError(f"{op} takes pairs (a, b), not {pair!r}")
+    return pair
+
+
+def _unpack_results(op, results):
+    if op == 'xgcd':
+        return list(zip(results[0::3], results[1::3], results[2::3]))
+    if op == 'is_prime':
+        return [bool(b) for b in results]
+    return list(results)
+
+
+def _run_chunk(op, flat):
+    """Worker entry point: (seconds spent, results)."""
+    start = time.perf_counter()
+    results = _compute(op, flat)
+    return time.perf_counter() - start, results
+
+
+class ZiPool:
+    """A process pool for the batch operations. workers defaults to
+    os.cpu_count(). Use as a context manager, or call shutdown()."""
+
+    def __init__(self, workers=None, target_seconds=TARGET_SECONDS):
+        self.workers = default_workers() if workers is None else workers
+        if self.workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.target_seconds = target_seconds
+        self._executor = ProcessPoolExecutor(self.workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _next_size(self, size, count, seconds):
+        if seconds <= 0:
+            return min(MAX_CHUNK, size * 2)
+        ideal = count * self.target_seconds / seconds
+        # Move towards the ideal, by at most a factor of 4 per step.
+        return max(MIN_CHUNK, min(MAX_CHUNK, int(min(max(ideal, size / 4), size * 4))))
+
+    def map(self, op, inputs, ordered=True):
+        """Apply op to every input. With ordered=True, yield the results in
+        input order; otherwise yield (index, result) pairs as chunks
+        finish. mod_inverse yields None where there is no inverse."""
+        if op not in OPERATIONS:
+            raise ValueError(f"op must be one of {OPERATIONS}: {op!r}")
+        pairwise = op in _PAIRWISE
+        inputs = iter(inputs)
+        size = MIN_CHUNK
+        start = 0               # index of the next input to submit
+        pending = {}            # future -> (first index, count)
+        done_chunks = {}        # first index -> results, awaiting their turn
+        next_out = 0            # first index of the next chunk to yield (ordered)
+        exhausted = False
+        while True:
+            # Finished chunks waiting for an earlier one count towards the
+            # limit too, or a slow head chunk would let them pile up.
+            while not exhausted and len(pending) + len(done_chunks) < PREFETCH * self.workers:
+                chunk = list(islice(inputs, size))
+                if not chunk:
+                    exhausted = True
+                    break
+                if pairwise:
+                    flat = PackedList(Zi._require_zi(x) for pair in chunk for x in _pair(op, pair))
+                else:
+                    flat = PackedList(map(Zi._require_zi, chunk))
+                future = self._executor.submit(_run_chunk, op, flat)
+                pending[future] = (start, len(chunk))
+                start += len(chunk)
+            if not pending:
+                return
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                first, count = pending.pop(future)
+                seconds, results = future.result()
+                size = self._next_size(size, count, seconds)
+                results = _unpack_results(op, results)
+                if ordered:
+                    done_chunks[first] = results
+                else:
+                    yield from enumerate(results, first)
+            while next_out in done_chunks:
+                results = done_chunks.pop(next_out)
+                yield from results
+                next_out += len(results)
+
+
+def _one_shot(op, inputs, workers, ordered):
+    with ZiPool(workers) as pool:
+        yield from pool.map(op, inputs, ordered)
+
+
+def gcd_many(pairs, workers=None, ordered=True):
+    return _one_shot('gcd', pairs, workers, ordered)
+
+
+def xgcd_many(pairs, workers=None, ordered=True):
+    return _one_shot('xgcd', pairs, workers, ordered)
+
+
+def is_prime_many(values, workers=None, ordered=True):
+    return _one_shot('is_prime', values, workers, ordered)
+
+
+def factor_many(values, workers=None, ordered=True):
+    return _one_shot('factor', values, workers, ordered)
@@ -0,0 +1,138 @@
+"""Batch gcd over Z[i] with product and remainder trees (Bernstein).
+
+batch_gcd(values) gives, for every x in values, gcd(x, P / x), where P
+is the product of all the values: the part of x it shares with the
+others. It takes quasi-linear time instead of the quadratic cost of a
+Zi.gcd on every pair:
+
+    product tree    leaves are the values; each node is the product of
+                    its two children, the root is P
+    remainder tree  walking down from the root, each node's value is its
+                    parent's reduced mod (node)^2, so a leaf x ends up
+                    with r = P mod x^2
+    gcd             x divides both P and x^2, hence r, and
+                    r / x == P / x (mod x), so gcd(x, P / x) == gcd(x, r / x)
+
+Any Euclidean remainder works in the second step (Zi's nearest
+remainder % is used), since each node divides its parent.
+
+Memory: the product tree stores every product once, and batch_gcd
+drops each of its levels as soon as the walk down has used it; squares
+are formed a node at a time and never stored, and each level of
+remainders replaces the one above. When gmpy2 is the bigint backend,
+nodes past bigint.PROMOTE_BITS are promoted to mpz as they are built.
+
+With workers > 1, levels with at least MIN_PARALLEL_NODES nodes are
+split into chunks computed in a process pool (operands travel as
+PackedList blocks, see src/packed.py). The few nodes near the root are
+always computed in this process.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from src import bigint
+from src.packed import PackedList
+from src.zi import Zi
+
+# Levels narrower than this are computed in-process even when workers > 1.
+MIN_PARALLEL_NODES = 64
+# Chunks per worker for a parallel level: a few, to balance the load.
+CHUNKS_PER_WORKER = 4
+
+
+def _products(flat):
+    """Products of the consecutive pairs in flat."""
+    return PackedList(bigint.promote(a * b) for a, b in zip(flat[0::2], flat[1::2]))
+
+
+def _remainders(flat):
+    """r % (x * x) for the consecutive (r, x) pairs in flat."""
+    return PackedList(r % (x * x) for r, x in zip(flat[0::2], flat[1::2]))
+
+
+def _pair_map(fn, pairs, executor, workers):
+    """fn over the consecutive pairs of the flat list pairs, in this
+    process or split across executor."""
+    count = len(pairs) // 2
+    if executor is None or count < MIN_PARALLEL_NODES:
+        return list(fn(pairs))
+    size = -(-count // (workers * CHUNKS_PER_WORKER))
+    chunks = [PackedList(pairs[2 * k:2 * (k + size)]) for k in range(0, count, size)]
+    return [z for part in executor.map(fn, chunks) for z in part]
+
+
+def _next_level(level, executor=None, workers=1):
+    pairs = level[:len(level) & ~1]
+    above = _pair_map(_products, pairs, executor, workers)
+    if len(level) & 1:
+        above.append(level[-1])     # the odd node out moves up unchanged
+    return above
+
+
+def _check_values(values):
+    level = [Zi._require_zi(v) for v in values]
+    if any(not z for z in level):
+        raise ValueError("batch gcd of a zero Gaussian integer")
+    return level
+
+
+def _executor(workers):
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    return ProcessPoolExecutor(workers) if workers > 1 else None
+
+
+def product_tree(values, workers=1):
+    """The product tree of the nonzero Gaussian integers values, as a
+    list of levels: levels[0] is the values, each later level holds the
+    products of adjacent pairs of the one below (an odd last node moves
+    up unchanged), and levels[-1] == [product of all values]. Empty for
+    no values."""
+    level = _check_values(values)
+    if not level:
+        return []
+    executor = _executor(workers)
+    try:
+        return _build(level, executor, workers)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def _build(level, executor, workers):
+    levels = [level]
+    while len(level) > 1:
+        level = _next_level(level, executor, workers)
+        levels.append(level)
+    return levels
+
+
+def _descend(levels, executor, workers):
+    """P mod x^2 for each leaf x, walking down a product tree. Consumes
+    levels, dropping each one once it has been used."""
+    rems = levels.pop()
+    while levels:
+        level = levels.pop()
+        pairs = []
+        for k, x in enumerate(level):
+            pairs += (rems[k >> 1], x)
+        rems = _pair_map(_remainders, pairs, executor, workers)
+    return rems
+
+
+def batch_gcd(values, workers=1):
+    """For each x in values (nonzero Gaussian integers), gcd(x, P / x)
+    where P is the product of all of them, in first-quadrant form (see
+    Zi.canonical): 1 when x shares no prime with the others. With
+    workers > 1 wide tree levels are computed in a process pool."""
+    leaves = _check_values(values)
+    if not leaves:
+        return []
+    executor = _executor(workers)
+    try:
+        levels = _build(leaves, executor, workers)
+        rems = _descend(levels, executor, workers)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return [Zi.gcd(x, r // x).canonical()[0] for x, r in zip(leaves, rems)]
@@ -0,0 +1,100 @@
+"""Big-integer backends for Zi components: Python int, or gmpy2's mpz.
+
+Zi keeps mpz components as they are (any other Integral is converted
+to int) and does its arithmetic with mpz's own operators, so a Zi built
+from mpz components multiplies, divides and takes gcds with GMP. For
+components of a few thousand digits and up that is much faster than Python's int. For small
+components mpz is slower, because of conversion and call overhead, so
+values are only promoted above a size threshold:
+
+    from src import bigint
+    z = bigint.promote(Zi(3 ** 20000, 5 ** 15000))   # mpz parts if gmpy2 is installed
+    w = bigint.demote(z)                             # plain ints again
+
+gmpy2 is optional. When it isn't importable, the 'python' backend is
+the only one, and promote() returns its argument unchanged. Values from
+either backend compare equal and hash alike: mpz(n) == n and
+hash(mpz(n)) == hash(n). Qi keeps its exact Fraction components (an mpz
+or mpq given to Qi is converted), so only Zi arithmetic switches
+backend.
+"""
+
+from src.zi import Zi
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+BACKENDS = ('python', 'gmpy2')
+HAVE_GMPY2 = gmpy2 is not None
+
+# Components with at least this many bits are promoted to mpz.
+PROMOTE_BITS = 4096
+
+_backend = 'gmpy2' if HAVE_GMPY2 else 'python'
+
+
+def available_backends():
+    return BACKENDS if HAVE_GMPY2 else BACKENDS[:1]
+
+
+def get_backend():
+    return _backend
+
+
+def set_backend(name):
+    """Select the backend promote() converts to: 'python' or 'gmpy2'.
+    Selecting 'gmpy2' without gmpy2 installed raises ImportError."""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}: {name!r}")
+    if name == 'gmpy2' and not HAVE_GMPY2:
+        raise ImportError("the gmpy2 backend requires gmpy2")
+    _backend = name
+
+
+def to_backend_int(n, backend=None):
+    """The integer n in the given (default: current) backend's type."""
+    backend = _backend if backend is None else backend
+    if backend == 'gmpy2':
+        if not HAVE_GMPY2:
+            raise ImportError("the gmpy2 backend requires gmpy2")
+        return gmpy2.mpz(n)
+    return int(n)
+
+
+def _promote_int(n, bits):
+    if type(n) is int and n.bit_length() >= bits:
+        return gmpy2.mpz(n)
+    return n
+
+
+def promote(z, bits=None):
+    """z with every component of at least bits (default PROMOTE_BITS)
+    bits converted to the current backend's integer type. Returns z
+    itself when nothing changes (always, for the 'python' backend). Qi
+    values are returned unchanged."""
+    if _backend != 'gmpy2' or not isinstance(z, Zi):
+        return z
+    bits = PROMOTE_BITS if bits is None else bits
+    a, b = _promote_int(z.real, bits), _promote_int(z.imag, bits)
+    if a is z.real and b is z.imag:
+        return z
+    return Zi(a, b)
+
+
+def demote(z):
+    """z with plain Python int components."""
+    if isinstance(z, Zi) and (type(z.real) is not int or type(z.imag) is not int):
+        return Zi(int(z.real), int(z.imag))
+    return z
+
+
+def promote_all(values, bits=None):
+    return [promote(z, bits) for z in values]
+
+
+def demote_all(values):
+    return [demote(z) for z in values]
+
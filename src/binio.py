@@ -0,0 +1,293 @@
+"""Streaming binary serialization of Zi and Qi values: a short header
+followed by the components as zigzag varints.
+
+Stream layout:
+
+    offset  size  field
+    0       8     magic, b'ZIVARINT'
+    8       2     format version, little-endian (currently 1)
+    10      1     kind: 0 Zi, 1 Qi, 2 Qi over a shared denominator
+    11      ...   kind 2 only: the shared denominator, as a varint
+    ...     ...   the values, back to back, until end of stream
+
+Each value is a fixed number of integer fields:
+
+* kind 0 (Zi): real, imag
+* kind 1 (Qi): real numerator, real denominator, imag numerator, imag
+  denominator
+* kind 2 (Qi, shared denominator D): real * D, imag * D
+
+Every field is zigzag-mapped (0, -1, 1, -2, ... to 0, 1, 2, 3, ...) and
+then written as a little-endian base-128 varint: 7 bits per byte, high
+bit set on all but the last byte. Varints have no size limit, so
+components of any size round-trip, and small ones take a byte or two.
+A Qi stream may also hold Zi values (written with denominator 1, and
+read back as Zi).
+
+ZiWriter and ZiReader work over any binary file-like object, buffering
+in chunks, so a stream of any length is written and read incrementally
+with constant memory:
+
+    with open(path, 'wb') as f:
+        with ZiWriter(f) as w:
+            w.write_many(values)
+    with open(path, 'rb') as f:
+        for z in ZiReader(f):
+            ...
+"""
+
+import io
+import struct
+from fractions import Fraction
+
+from src.qi import Qi
+from src.zi import Zi
+
+MAGIC = b'ZIVARINT'
+VERSION = 1
+KINDS = ('zi', 'qi')
+
+_HEADER = struct.Struct('<8sHB')
+_ZI, _QI, _QI_SHARED = 0, 1, 2
+_FIELDS = {_ZI: 2, _QI: 4, _QI_SHARED: 2}
+
+_TERMINATORS = bytes(range(0x80))
+
+# Bytes buffered by a writer before it writes, and read per call by a
+# reader.
+CHUNK_SIZE = 1 << 16
+
+
+def _encode(ints, out):
+    """Append ints to the bytearray out, as zigzag varints."""
+    append = out.append
+    for n in ints:
+        zz = n << 1 if n >= 0 else (~n << 1) | 1
+        while zz >= 0x80:
+            append((zz & 0x7f) | 0x80)
+            zz >>= 7
+        append(zz)
+
+
+def _decode(buf, nfields):
+    """Decode the complete records (of nfields varints each) at the start
+    of buf. Returns (flat list of ints, number of bytes consumed); a
+    trailing partial record is left unconsumed."""
+    # Every varint ends in the stream's only bytes below 0x80, so counting
+    # those (at C speed) gives the number of complete varints, and the
+    # end of the last complete record is found by walking back over the
+    # partial one.
+    ends = len(buf) - len(buf.translate(None, _TERMINATORS))
+    end, skip = len(buf), ends % nfields
+    while end and (buf[end - 1] & 0x80 or skip):
+        end -= 1
+        if not buf[end] & 0x80:
+            skip -= 1
+    ints = []
+    append = ints.append
+    pos = 0
+    while pos < end:
+        b = buf[pos]
+        pos += 1
+        if b < 0x80:
+            append((b >> 1) ^ -(b & 1))
+            continue
+        zz, shift = b & 0x7f, 7
+        while True:
+            b = buf[pos]
+            pos += 1
+            if b < 0x80:
+                zz |= b << shift
+                break
+            zz |= (b & 0x7f) << shift
+            shift += 7
+        append((zz >> 1) ^ -(zz & 1))
+    return ints, end
+
+
+class ZiWriter:
+    """Write Zi (kind 'zi') or Qi (kind 'qi') values to the binary file
+    object f. For kind 'qi', a shared denominator may be given: every
+    value is then stored as two numerators over it, and writing a value
+    whose denominators don't divide it raises ValueError.
+
+    Output is buffered; flush() (or close(), or leaving a with block)
+    writes it out. close() does not close f."""
+
+    def __init__(self, f, kind='zi', denominator=None, chunk_size=CHUNK_SIZE):
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}: {kind!r}")
+        if denominator is not None:
+            if kind != 'qi':
+                raise ValueError("a shared denominator requires kind 'qi'")
+            if not isinstance(denominator, int) or denominator < 1:
+                raise ValueError("denominator must be a positive integer")
+        self._f = f
+        self._chunk_size = chunk_size
+        self._denominator = denominator
+        self._code = _ZI if kind == 'zi' else _QI if denominator is None else _QI_SHARED
+        self._buf = bytearray(_HEADER.pack(MAGIC, VERSION, self._code))
+        if denominator is not None:
+            _encode([denominator], self._buf)
+        self.count = 0
+
+    def _fields(self, v):
+        """The integer fields of the value v, in stream order."""
+        code = self._code
+        if code == _ZI:
+            if not isinstance(v, Zi):
+                v = Zi._require_zi(v)
+            return v.real, v.imag
+        if isinstance(v, Zi):
+            r, i = Fraction(v.real), Fraction(v.imag)
+        elif isinstance(v, Qi):
+            r, i = v.real, v.imag
+        else:
+            raise TypeError(f"cannot write {type(v).__name__} to a Qi stream")
+        if code == _QI:
+            return r.numerator, r.denominator, i.numerator, i.denominator
+        d = self._denominator
+        nr, ni = r * d, i * d
+        if nr.denominator != 1 or ni.denominator != 1:
+            raise ValueError(f"{v!r} is not a multiple of 1/{d}")
+        return nr.numerator, ni.numerator
+
+    def write(self, value):
+        _encode(self._fields(value), self._buf)
+        self.count += 1
+        if len(self._buf) >= self._chunk_size:
+            self._drain()
+
+    def write_many(self, values):
+        """Write every value from the iterable values. If one can't be
+        written, the values before it still are."""
+        fields = self._fields
+        batch = []
+        extend = batch.extend
+        try:
+            for v in values:
+                extend(fields(v))
+                if len(batch) >= 8192:
+                    self._write_batch(batch)
+        finally:
+            self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        _encode(batch, self._buf)
+        self.count += len(batch) // _FIELDS[self._code]
+        batch.clear()
+        if len(self._buf) >= self._chunk_size:
+            self._drain()
+
+    def _drain(self):
+        if self._buf:
+            self._f.write(self._buf)
+            self._buf.clear()
+
+    def flush(self):
+        self._drain()
+        if hasattr(self._f, 'flush'):
+            self._f.flush()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ZiReader:
+    """Iterate over the values in a binary stream written by ZiWriter.
+    The header is read on construction; .kind and .denominator describe
+    the stream."""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self._f = f
+        self._chunk_size = chunk_size
+        raw = f.read(_HEADER.size)
+        if len(raw) < _HEADER.size:
+            raise ValueError("not a Gaussian varint stream: truncated header")
+        magic, version, code = _HEADER.unpack(raw)
+        if magic != MAGIC:
+            raise ValueError("not a Gaussian varint stream: bad magic number")
+        if version != VERSION:
+            raise ValueError(f"unsupported Gaussian varint stream version: {version}")
+        if code not in _FIELDS:
+            raise ValueError(f"unsupported Gaussian varint stream kind: {code}")
+        self._code = code
+        self.kind = KINDS[min(code, 1)]
+        self._buf = bytearray()
+        self.denominator = None
+        if code == _QI_SHARED:
+            self.denominator = self._read_denominator()
+
+    def _read_denominator(self):
+        while True:
+            ints, consumed = _decode(self._buf, 1)
+            if ints:
+                del self._buf[:consumed]
+                return ints[0]
+            more = self._f.read(1)
+            if not more:
+                raise ValueError("truncated Gaussian varint stream header")
+            self._buf += more
+
+    def _values(self, ints):
+        code = self._code
+        if code == _ZI:
+            return list(map(Zi, ints[0::2], ints[1::2]))
+        values = []
+        if code == _QI:
+            for rn, rd, im, idn in zip(*[iter(ints)] * 4):
+                if rd == 1 and idn == 1:
+                    values.append(Zi(rn, im))
+                else:
+                    values.append(Qi(Fraction(rn, rd), Fraction(im, idn)))
+            return values
+        d = self.denominator
+        for rn, im in zip(ints[0::2], ints[1::2]):
+            if rn % d == 0 and im % d == 0:
+                values.append(Zi(rn // d, im // d))
+            else:
+                values.append(Qi(Fraction(rn, d), Fraction(im, d)))
+        return values
+
+    def chunks(self):
+        """Yield the values as lists, one per chunk read from the stream.
+        Raises ValueError if the stream ends partway through a value."""
+        nfields = _FIELDS[self._code]
+        buf = self._buf
+        while True:
+            data = self._f.read(self._chunk_size)
+            if not data:
+                break
+            buf += data
+            ints, consumed = _decode(buf, nfields)
+            del buf[:consumed]
+            if ints:
+                yield self._values(ints)
+        if buf:
+            raise ValueError("Gaussian varint stream ends partway through a value")
+
+    def __iter__(self):
+        for chunk in self.chunks():
+            yield from chunk
+
+    def read_all(self):
+        return [v for chunk in self.chunks() for v in chunk]
+
+
+def dumps(values, kind='zi', denominator=None):
+    """The stream bytes for values."""
+    f = io.BytesIO()
+    with ZiWriter(f, kind, denominator) as w:
+        w.write_many(values)
+    return f.getvalue()
+
+
+def loads(data):
+    """The list of values in the stream bytes data."""
+    return ZiReader(io.BytesIO(data)).read_all()
@@ -0,0 +1,120 @@
+"""Context-local configuration for Gaussian rationals, after the decimal
+module's contexts.
+
+A GaussianContext holds the settings that used to be class-level state
+on Qi:
+
+    max_denominator   default cap for Qi.limit_denominator()   1_000_000
+    unit_symbol       imaginary unit in str(Qi): 'i' or 'j'      'j'
+
+The current context lives in a contextvars.ContextVar, so each thread
+has its own, and each asyncio task runs in a copy of its creator's
+contextvars. Change settings for a block of code with localcontext(),
+which restores the previous context on exit:
+
+    with localcontext(max_denominator=100, unit_symbol='i'):
+        str(q.limit_denominator())
+
+or for the rest of the current thread or task by replacing the context:
+
+    setcontext(getcontext().replace(unit_symbol='i'))
+
+which is what Qi.set_* do. Assigning to a context's attributes instead
+(getcontext().unit_symbol = 'i') changes that object wherever it is
+current: a task shares its creator's context object, not a copy of it.
+
+A thread's first getcontext() gives it a fresh copy of DefaultContext;
+changing DefaultContext changes what later threads start with.
+"""
+
+from contextvars import ContextVar
+
+UNIT_SYMBOLS = ('i', 'j')
+
+
+class GaussianContext:
+    """A set of Gaussian arithmetic settings. Arguments left as None take
+    their value from DefaultContext. Assignments are validated."""
+
+    __slots__ = ('max_denominator', 'unit_symbol')
+
+    def __init__(self, max_denominator=None, unit_symbol=None):
+        for name, value in zip(self.__slots__, (max_denominator, unit_symbol)):
+            setattr(self, name, getattr(DefaultContext, name) if value is None else value)
+
+    def __setattr__(self, name, value):
+        if name == 'max_denominator':
+            if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                raise ValueError("max_denominator must be a positive integer")
+        elif name == 'unit_symbol':
+            if value not in UNIT_SYMBOLS:
+                raise ValueError("unit symbol must be 'i' or 'j'")
+        object.__setattr__(self, name, value)
+
+    def copy(self):
+        return GaussianContext(*(getattr(self, name) for name in self.__slots__))
+
+    __copy__ = copy
+
+    def replace(self, **settings):
+        """A copy with the given settings changed."""
+        ctx = self.copy()
+        for name, value in settings.items():
+            if name not in self.__slots__:
+                raise TypeError(f"unknown context setting: {name!r}")
+            setattr(ctx, name, value)
+        return ctx
+
+    def __eq__(self, other):
+        if not isinstance(other, GaussianContext):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ', '.join(f"{n}={getattr(self, n)!r}" for n in self.__slots__)
+        return f"GaussianContext({fields})"
+
+
+DefaultContext = GaussianContext(max_denominator=1_000_000, unit_symbol='j')
+
+_current = ContextVar('gaussian_context')
+# Bound once: getcontext() is on the hot path of str(Qi) and friends.
+_get = _current.get
+
+
+def getcontext():
+    """The current context."""
+    try:
+        return _get()
+    except LookupError:
+        ctx = DefaultContext.copy()
+        _current.set(ctx)
+        return ctx
+
+
+def setcontext(ctx):
+    """Make ctx the current context."""
+    if not isinstance(ctx, GaussianContext):
+        raise TypeError(f"expected a GaussianContext, not {type(ctx).__name__}")
+    _current.set(ctx)
+
+
+class localcontext:
+    """A context manager that makes a copy of ctx (default: the current
+    context), with any settings given as keywords changed, the current
+    context for the duration of a with block, and returns it."""
+
+    def __init__(self, ctx=None, **settings):
+        self._ctx = ctx
+        self._settings = settings
+        self._token = None
+
+    def __enter__(self):
+        ctx = (getcontext() if self._ctx is None else self._ctx).replace(**self._settings)
+        self._token = _current.set(ctx)
+        return ctx
+
+    def __exit__(self, *exc):
+        _current.reset(self._token)
@@ -0,0 +1,157 @@
+"""Factorization of rational and Gaussian integers.
+
+factor_int(n) factors a rational integer: trial division by small primes,
+then Pollard's rho (Brent's variant) with a Miller-Rabin primality test
+for whatever is left. factor(z) factors a Gaussian integer by factoring
+its norm and lifting each rational prime p to Z[i]:
+
+* 2 = -i * (1+i)**2 ramifies;
+* p == 3 (mod 4) stays prime (and divides z to half its power in the norm);
+* p == 1 (mod 4) splits into two conjugate primes, a + bi and a - bi
+  where a*a + b*b == p (see two_squares); which of them divides z, and
+  how often, is found by trial division.
+
+Zi.factor(z) is the same function.
+"""
+
+import random
+from math import gcd, isqrt
+
+from src.zi import Zi
+
+_SMALL_PRIMES = [p for p in range(2, 1000) if all(p % q for q in range(2, isqrt(p) + 1))]
+# Miller-Rabin with these bases is exact below 3.3 * 10**24, and a strong
+# probable-prime test above that.
+_MR_BASES = _SMALL_PRIMES[:13]
+
+
+def is_prime(n):
+    """Miller-Rabin primality test for a rational integer n."""
+    if n < 2:
+        return False
+    for p in _MR_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    for a in _MR_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _rho(n, rng):
+    """A nontrivial factor of the odd composite n (Pollard-Brent)."""
+    while True:
+        y, c, m = rng.randrange(1, n), rng.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r <<= 1
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def factor_int(n):
+    """The prime factorization of the integer |n| >= 1, as a dict
+    {prime: exponent}."""
+    n = abs(int(n))
+    if n == 0:
+        raise ValueError("0 has no prime factorization")
+    factors = {}
+    for p in _SMALL_PRIMES:
+        if p * p > n:
+            break
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    rng = random.Random(n)
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            d = _rho(m, rng)
+            stack += [d, m // d]
+    return dict(sorted(factors.items()))
+
+
+def sqrt_minus_one(p):
+    """k with k*k == -1 (mod p), for a prime p == 1 (mod 4)."""
+    for c in range(2, p):
+        k = pow(c, (p - 1) // 4, p)
+        if k * k % p == p - 1:
+            return k
+    raise ValueError(f"{p} is not a prime == 1 (mod 4)")
+
+
+def two_squares(p):
+    """(a, b) with a*a + b*b == p and a > b > 0, for a prime p == 1
+    (mod 4). Hermite-Serret: run Euclid's algorithm on p and a square
+    root k of -1; the first two remainders below sqrt(p) are a and b."""
+    a, b = p, sqrt_minus_one(p)
+    while b * b > p:
+        a, b = b, a % b
+    return b, a % b
+
+
+def _divide_out(z, prime):
+    """(z / prime**e, e) for the largest e with prime**e dividing z."""
+    e = 0
+    while True:
+        q, r = Zi.modified_divmod(z, prime)
+        if r:
+            return z, e
+        z, e = q, e + 1
+
+
+def factor(z):
+    """Factor the nonzero Gaussian integer z. Returns (unit, factors):
+    factors is a list of (prime, exponent) pairs, each prime in canonical
+    (first-quadrant) form, ordered by norm and then by components, and
+    z == unit * prod(prime**exponent)."""
+    z = Zi._require_zi(z)
+    if not z:
+        raise ValueError("0 has no prime factorization")
+    factors = []
+    rest = z
+    for p, e in factor_int(z.norm()).items():
+        if p == 2:
+            rest, k = _divide_out(rest, Zi(1, 1))
+            factors.append((Zi(1, 1), k))
+        elif p % 4 == 3:
+            rest, k = _divide_out(rest, Zi(p, 0))
+            factors.append((Zi(p, 0), k))
+        else:
+            a, b = two_squares(p)
+            for prime in (Zi(b, a), Zi(a, b)):
+                rest, k = _divide_out(rest, prime)
+                if k:
+                    factors.append((prime, k))
+    factors.sort(key=lambda f: (f[0].norm(), f[0].real, f[0].imag))
+    return rest, factors
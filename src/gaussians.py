@@ -35,6 +35,11 @@ from fractions import Fraction
 from numbers import Complex  # Only used for equality tests
 from random import randint
 from functools import wraps
+
+try:
+    from src.context import getcontext, setcontext
+except ImportError:  # imported as a top-level module, with src/ on the path
+    from context import getcontext, setcontext
 # import numpy as np
 
 
@@ -284,8 +289,12 @@ class Zi:
 
     @property
     def is_unit(self):
-        """Returns True if this Zi is a unit."""
-        return self in Zi.units()
+        """Returns True if this Zi is a unit.
+
+        The units are exactly the Zis with |re| + |im| == 1, so this is
+        checked directly rather than by building and scanning Zi.units().
+        """
+        return abs(self.real) + abs(self.imag) == 1
 
     @staticmethod
     def two():
@@ -428,7 +437,7 @@ class Zi:
     @staticmethod
     def is_relatively_prime(a, b) -> bool:
         """Returns True if a and b are relatively prime, otherwise it returns false."""
-        return Zi.gcd(a, b) in Zi.units()
+        return Zi.gcd(a, b).is_unit
 
     # Defining "is_gaussian_prime" as a staticmethod allows it to be easily used on both
     # Gaussian integers and real integers. If it had been defined as a normal method,
@@ -490,39 +499,41 @@ def isprime(n: int) -> bool:
 class Qi:
     """Gaussian Rational Number Class"""
 
-    __max_denominator = 1_000_000
+    # The denominator cap applied to str/int/float/complex components is
+    # the current context's max_denominator (see context.py).
 
     __slots__ = ("__real", "__imag")
 
     def __init__(self, re=Fraction(0, 1), im=Fraction(0, 1)):
+        max_denominator = getcontext().max_denominator
 
         if isinstance(re, Fraction):
             self.__real = re
         elif isinstance(re, (str, int, float)):
-            self.__real = Fraction(re).limit_denominator(self.__max_denominator)
+            self.__real = Fraction(re).limit_denominator(max_denominator)
         elif isinstance(re, (complex, Zi)):
-            self.__real = Fraction(re.real).limit_denominator(self.__max_denominator)
+            self.__real = Fraction(re.real).limit_denominator(max_denominator)
         else:
             raise TypeError(f"{re} is not a supported type")
 
         if isinstance(re, (complex, Zi)):
-            self.__imag = Fraction(re.imag).limit_denominator(self.__max_denominator)
+            self.__imag = Fraction(re.imag).limit_denominator(max_denominator)
         elif isinstance(im, Fraction):
             self.__imag = im
         elif isinstance(im, (str, int, float)):
-            self.__imag = Fraction(im).limit_denominator(self.__max_denominator)
+            self.__imag = Fraction(im).limit_denominator(max_denominator)
         else:
             raise TypeError(f"{im} is not a supported type")
 
     @classmethod
     def max_denominator(cls):
-        return cls.__max_denominator
+        return getcontext().max_denominator
 
     @classmethod
     def set_max_denominator(cls, value):
         if value > 1:
-            cls.__max_denominator = value
-            return cls.__max_denominator
+            setcontext(getcontext().replace(max_denominator=value))
+            return value
         else:
             raise ValueError("max_denominator must be > 1")
 
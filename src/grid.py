@@ -0,0 +1,302 @@
+"""Lazy collections of Gaussian integers: rectangular grids (ZiGrid),
+arithmetic progressions (ZiRange), and enumeration in order of
+increasing norm (by_norm).
+
+Like Python's built-in range, these never materialize their elements:
+len(), indexing, slicing and `in` are all O(1), slices are themselves
+lazy, and elements are only built (as Zi) when indexed or iterated.
+to_ziarray() exports the elements to a ZiArray using bulk array
+operations rather than one Zi per element.
+"""
+
+import heapq
+from array import array
+from fractions import Fraction
+from itertools import chain, repeat
+
+from src.zi import Zi
+from src.ziarray import ZiArray
+
+
+def _inclusive_range(start, stop, step):
+    """range(start, stop, step), but including stop when it is reached."""
+    if step == 0:
+        raise ValueError("step components must not be zero")
+    return range(start, stop + (1 if step > 0 else -1), step)
+
+
+def _to_ziarray(reals, imags, n, layout):
+    """Build a ZiArray of length n from two int64 arrays of components."""
+    if layout == 'split':
+        data = reals + imags
+    else:
+        data = array('q', bytes(16 * n))
+        mv = memoryview(data)
+        mv[0::2] = memoryview(reals)
+        mv[1::2] = memoryview(imags)
+    return ZiArray.from_buffer(data, layout)
+
+
+class ZiGrid:
+    """The Gaussian integers x + yi on a rectangular lattice, from
+    lower_left to upper_right inclusive, with the given (x, y) step. With
+    a single argument, the grid runs from 0 to that corner.
+
+    Elements are ordered row by row: all x for the first y, then all x
+    for the next y, and so on. E.g. ZiGrid(Zi(1, 1)) is
+    [0, 1, i, 1+i]."""
+
+    __slots__ = ('_xs', '_ys', '_idx')
+
+    def __init__(self, lower_left, upper_right=None, step=(1, 1)) -> None:
+        if upper_right is None:
+            lower_left, upper_right = Zi(), lower_left
+        x0, y0 = Zi._require_zi(lower_left)
+        x1, y1 = Zi._require_zi(upper_right)
+        sx, sy = step
+        self._xs = _inclusive_range(x0, x1, sx)
+        self._ys = _inclusive_range(y0, y1, sy)
+        self._idx = range(len(self._xs) * len(self._ys))
+
+    @classmethod
+    def _view(cls, xs, ys, idx):
+        obj = cls.__new__(cls)
+        obj._xs, obj._ys, obj._idx = xs, ys, idx
+        return obj
+
+    # ---------------- Accessors -----------------------
+
+    @property
+    def reals(self) -> range:
+        """The range of real parts (columns) of the underlying grid."""
+        return self._xs
+
+    @property
+    def imags(self) -> range:
+        """The range of imaginary parts (rows) of the underlying grid."""
+        return self._ys
+
+    @property
+    def shape(self):
+        """(rows, columns) of the underlying grid. A slice of a grid keeps
+        the shape of the grid it was taken from."""
+        return len(self._ys), len(self._xs)
+
+    def _at(self, k):
+        """The element at flat index k of the underlying (unsliced) grid."""
+        row, col = divmod(k, len(self._xs))
+        return Zi(self._xs[col], self._ys[row])
+
+    def _flat_index(self, z):
+        """The flat index of z in the underlying grid, or None."""
+        z = Zi._ensure_zi(z)
+        if z is None or z.real not in self._xs or z.imag not in self._ys:
+            return None
+        return self._ys.index(z.imag) * len(self._xs) + self._xs.index(z.real)
+
+    def __len__(self):
+        return len(self._idx)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return ZiGrid._view(self._xs, self._ys, self._idx[idx])
+        return self._at(self._idx[idx])
+
+    def __iter__(self):
+        if self._idx == range(len(self._xs) * len(self._ys)):
+            return (Zi(x, y) for y in self._ys for x in self._xs)
+        return map(self._at, self._idx)
+
+    def __reversed__(self):
+        return iter(self[::-1])
+
+    def __contains__(self, z):
+        k = self._flat_index(z)
+        return k is not None and k in self._idx
+
+    def index(self, z):
+        """The position of z in this grid. Raises ValueError if absent."""
+        k = self._flat_index(z)
+        if k is None or k not in self._idx:
+            raise ValueError(f"{z!r} is not in grid")
+        return self._idx.index(k)
+
+    def count(self, z):
+        return int(z in self)
+
+    def __eq__(self, other):
+        if not isinstance(other, ZiGrid):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        xs, ys = self._xs, self._ys
+        if not xs or not ys:
+            return "ZiGrid(empty)"
+        text = (f"ZiGrid({Zi(xs[0], ys[0])!r}, {Zi(xs[-1], ys[-1])!r}, "
+                f"step=({xs.step}, {ys.step}))")
+        if self._idx != range(len(xs) * len(ys)):
+            text += f"[{self._idx.start}:{self._idx.stop}:{self._idx.step}]"
+        return text
+
+    def rows(self):
+        """The underlying grid as a list of rows (lists of Zi), one per
+        imaginary part. This is what the original grid() prototype in
+        notebooks/Misc/scratchwork7-range.ipynb returned."""
+        return [[Zi(x, y) for x in self._xs] for y in self._ys]
+
+    def to_ziarray(self, layout='interleaved'):
+        """Export the elements to a ZiArray, without building a Zi per
+        element."""
+        xs, ys, idx = self._xs, self._ys, self._idx
+        ncols = len(xs)
+        if idx == range(ncols * len(ys)):
+            reals = array('q', xs) * len(ys)
+            imags = array('q', chain.from_iterable(repeat(y, ncols) for y in ys))
+        else:
+            reals = array('q', (xs[k % ncols] for k in idx))
+            imags = array('q', (ys[k // ncols] for k in idx))
+        return _to_ziarray(reals, imags, len(idx), layout)
+
+
+class ZiRange:
+    """Gaussian integers in arithmetic progression: start, start + step,
+    start + 2*step, ... stopping before stop, like the built-in range.
+    stop must lie on the line through start in the direction of step,
+    i.e. (stop - start) / step must be real; it needn't be reached
+    exactly, e.g. ZiRange(0, 5+5j, 2+2j) is [0, 2+2i, 4+4i].
+
+    With a single argument, the range runs from 0 to that value (with
+    step 1, so the argument must then be real)."""
+
+    __slots__ = ('_start', '_step', '_k')
+
+    def __init__(self, start, stop=None, step=1) -> None:
+        if stop is None:
+            start, stop = Zi(), start
+        start = Zi._require_zi(start)
+        stop = Zi._require_zi(stop)
+        step = Zi._require_zi(step)
+        if not step:
+            raise ValueError("ZiRange() step must not be zero")
+        t = (stop - start) / step  # exact: a Zi or a Qi
+        if t.imag != 0:
+            raise ValueError(f"stop {stop} is not on the line from {start} with step {step}")
+        t = Fraction(t.real)
+        self._start = start
+        self._step = step
+        self._k = range(max(0, -(-t.numerator // t.denominator)))
+
+    @classmethod
+    def _view(cls, start, step, k):
+        obj = cls.__new__(cls)
+        obj._start, obj._step, obj._k = start, step, k
+        return obj
+
+    @property
+    def start(self) -> Zi:
+        return self._start + self._step * self._k.start
+
+    @property
+    def step(self) -> Zi:
+        return self._step * self._k.step
+
+    def __len__(self):
+        return len(self._k)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return ZiRange._view(self._start, self._step, self._k[idx])
+        return self._start + self._step * self._k[idx]
+
+    def __iter__(self):
+        start, step = self._start, self._step
+        return (start + step * k for k in self._k)
+
+    def __reversed__(self):
+        return iter(self[::-1])
+
+    def __contains__(self, z):
+        k = self._position(z)
+        return k is not None and k in self._k
+
+    def _position(self, z):
+        """The integer k with z == start + k*step, or None."""
+        z = Zi._ensure_zi(z)
+        if z is None:
+            return None
+        t = (z - self._start) / self._step
+        if isinstance(t, Zi) and t.imag == 0:
+            return t.real
+        return None
+
+    def index(self, z):
+        k = self._position(z)
+        if k is None or k not in self._k:
+            raise ValueError(f"{z!r} is not in range")
+        return self._k.index(k)
+
+    def count(self, z):
+        return int(z in self)
+
+    def __eq__(self, other):
+        if not isinstance(other, ZiRange):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        if len(self) == 0:
+            return True
+        return self.start == other.start and (len(self) == 1 or self.step == other.step)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ZiRange({self.start!r}, {self.start + self.step * len(self)!r}, {self.step!r})"
+
+    def to_ziarray(self, layout='interleaved'):
+        """Export the elements to a ZiArray, without building a Zi per
+        element."""
+        a, b = self._start
+        c, d = self._step
+        ks = self._k
+        reals = array('q', range(a + c * ks.start, a + c * ks.stop, c * ks.step)
+                      if c else repeat(a + c * ks.start, len(ks)))
+        imags = array('q', range(b + d * ks.start, b + d * ks.stop, d * ks.step)
+                      if d else repeat(b + d * ks.start, len(ks)))
+        return _to_ziarray(reals, imags, len(ks), layout)
+
+
+def by_norm(max_norm=None, up_to_units=False):
+    """Generate Gaussian integers in nondecreasing order of norm, starting
+    with 0, and stopping after norm max_norm (or never, if None).
+
+    If up_to_units is True, only one representative of each associate
+    class is generated: 0, and then the associate a + bi with a > 0 and
+    b >= 0 (i.e. in the first quadrant, excluding the imaginary axis).
+    Otherwise each representative is followed by its three associates,
+    i*z, -z and -i*z, which have the same norm.
+
+    Candidates are kept in a heap holding the next unvisited point of
+    each row b of the first quadrant, and a row is only added once the
+    row below it has been entered. So after reaching norm N the heap
+    holds O(sqrt(N)) entries, rather than the O(N) points inside the
+    disc that a generate-and-sort approach needs."""
+    if max_norm is not None and max_norm < 0:
+        return
+    yield Zi(0, 0)
+    heap = [(1, 1, 0)]  # (norm, a, b): the next point a + bi on row b
+    while heap:
+        n, a, b = heap[0]
+        if max_norm is not None and n > max_norm:
+            return
+        if a == 1:
+            # Entering row b: start row b + 1 at its first point, 1 + (b+1)i.
+            heapq.heappush(heap, (1 + (b + 1) * (b + 1), 1, b + 1))
+        heapq.heapreplace(heap, (n + 2 * a + 1, a + 1, b))
+        yield Zi(a, b)
+        if not up_to_units:
+            yield Zi(-b, a)
+            yield Zi(-a, -b)
+            yield Zi(b, -a)
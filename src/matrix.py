@@ -0,0 +1,272 @@
+"""Matrices over the Gaussian integers, with fraction-free algorithms.
+
+ZiMatrix is an immutable rectangular matrix of Zi. Everything stays in
+Z[i]; nothing goes through Qi or Fraction:
+
+    A @ B           product (Strassen's method for large ones, see below)
+    A.T             transpose
+    A.det()         determinant, by Bareiss elimination
+    A.rank()        rank, by the same elimination
+    A + B, A - B, -A, z * A
+
+Bareiss elimination updates every entry below and right of the pivot
+as (a * pivot - b * c) // (previous pivot). The division is exact (the
+entries are minors of the original matrix), so intermediate values grow
+only as fast as determinants do, where Gaussian elimination over Qi
+builds up fractions.
+
+Products are computed on the integer component matrices. The real and
+imaginary parts of A @ B take three integer products (Gauss's trick):
+
+    P1 = Ar Br,  P2 = Ai Bi,  P3 = (Ar + Ai)(Br + Bi)
+    re = P1 - P2,  im = P3 - P1 - P2
+
+Each integer product whose dimensions are all at least
+STRASSEN_THRESHOLD is done with Strassen's 7-multiplication recursion
+(padding odd dimensions with zeros), switching back to the classical
+row-by-column product below the threshold.
+"""
+
+from operator import add, mul, sub
+
+from src.zi import Zi
+
+# Integer products with every dimension at least this use Strassen's method.
+STRASSEN_THRESHOLD = 64
+
+_ZERO = Zi(0, 0)
+
+
+# ---------------- Integer Matrix Products -----------------------
+
+def _madd(x, y):
+    return [list(map(add, r, s)) for r, s in zip(x, y)]
+
+
+def _msub(x, y):
+    return [list(map(sub, r, s)) for r, s in zip(x, y)]
+
+
+def _classical(x, y):
+    """x @ y for lists of lists of ints."""
+    cols = list(zip(*y)) if y else []
+    return [[sum(map(mul, row, col)) for col in cols] for row in x]
+
+
+def _quarters(x, rows, cols):
+    """x (rows by cols, both even) split into its four blocks."""
+    r, c = rows // 2, cols // 2
+    return ([row[:c] for row in x[:r]], [row[c:] for row in x[:r]],
+            [row[:c] for row in x[r:]], [row[c:] for row in x[r:]])
+
+
+def _pad(x, rows, cols):
+    """x, extended with zero rows and columns to rows by cols."""
+    width = len(x[0]) if x else 0
+    out = [row + [0] * (cols - width) for row in x]
+    out += [[0] * cols for _ in range(rows - len(x))]
+    return out
+
+
+def _strassen(x, y, n, k, m):
+    """x @ y for an n by k and a k by m matrix of ints."""
+    if min(n, k, m) < STRASSEN_THRESHOLD:
+        return _classical(x, y)
+    n2, k2, m2 = n + (n & 1), k + (k & 1), m + (m & 1)
+    if (n2, k2, m2) != (n, k, m):
+        z = _strassen(_pad(x, n2, k2), _pad(y, k2, m2), n2, k2, m2)
+        return [row[:m] for row in z[:n]]
+    a11, a12, a21, a22 = _quarters(x, n, k)
+    b11, b12, b21, b22 = _quarters(y, k, m)
+    h, j, l = n // 2, k // 2, m // 2
+    p1 = _strassen(_madd(a11, a22), _madd(b11, b22), h, j, l)
+    p2 = _strassen(_madd(a21, a22), b11, h, j, l)
+    p3 = _strassen(a11, _msub(b12, b22), h, j, l)
+    p4 = _strassen(a22, _msub(b21, b11), h, j, l)
+    p5 = _strassen(_madd(a11, a12), b22, h, j, l)
+    p6 = _strassen(_msub(a21, a11), _madd(b11, b12), h, j, l)
+    p7 = _strassen(_msub(a12, a22), _madd(b21, b22), h, j, l)
+    c11 = _madd(_msub(_madd(p1, p4), p5), p7)
+    c12 = _madd(p3, p5)
+    c21 = _madd(p2, p4)
+    c22 = _madd(_madd(_msub(p1, p2), p3), p6)
+    return [r + s for r, s in zip(c11, c12)] + [r + s for r, s in zip(c21, c22)]
+
+
+# ---------------- Fraction-free Elimination -----------------------
+
+def _bareiss(rows):
+    """Bareiss elimination of rows (a list of lists of Zi), in place, to
+    row echelon form, taking the first nonzero entry in each column as
+    its pivot. Returns (rank, sign, last pivot), where sign is -1 if an
+    odd number of rows were swapped."""
+    nrows, ncols = len(rows), len(rows[0]) if rows else 0
+    prev, sign, r = Zi(1, 0), 1, 0
+    for c in range(ncols):
+        if r == nrows:
+            break
+        p = next((i for i in range(r, nrows) if rows[i][c]), None)
+        if p is None:
+            continue
+        if p != r:
+            rows[r], rows[p] = rows[p], rows[r]
+            sign = -sign
+        top = rows[r]
+        pivot = top[c]
+        for i in range(r + 1, nrows):
+            row = rows[i]
+            f = row[c]
+            for j in range(c + 1, ncols):
+                row[j] = (row[j] * pivot - f * top[j]) // prev
+            row[c] = _ZERO
+        prev, r = pivot, r + 1
+    return r, sign, prev
+
+
+class ZiMatrix:
+    """An immutable matrix of Gaussian integers, built from an iterable
+    of rows (each an iterable of values Zi accepts), all of one length."""
+
+    __slots__ = ('_rows', '_ncols')
+
+    def __init__(self, rows=()) -> None:
+        rows = tuple(tuple(Zi._require_zi(v) for v in row) for row in rows)
+        ncols = len(rows[0]) if rows else 0
+        if any(len(row) != ncols for row in rows):
+            raise ValueError("rows must all have the same length")
+        self._rows, self._ncols = rows, ncols
+
+    @classmethod
+    def _of(cls, rows, ncols):
+        obj = cls.__new__(cls)
+        obj._rows, obj._ncols = rows, ncols
+        return obj
+
+    @classmethod
+    def _from_parts(cls, re, im, ncols):
+        return cls._of(tuple(tuple(map(Zi, r, i)) for r, i in zip(re, im)), ncols)
+
+    @classmethod
+    def zeros(cls, nrows, ncols=None):
+        ncols = nrows if ncols is None else ncols
+        return cls._of(tuple((_ZERO,) * ncols for _ in range(nrows)), ncols)
+
+    @classmethod
+    def identity(cls, n):
+        one = Zi(1, 0)
+        return cls._of(tuple(tuple(one if i == j else _ZERO for j in range(n))
+                             for i in range(n)), n)
+
+    # ---------------- Accessors -----------------------
+
+    @property
+    def shape(self):
+        """(rows, columns)."""
+        return len(self._rows), self._ncols
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, idx):
+        """m[i, j] is an entry, m[i] a row (a tuple of Zi)."""
+        if isinstance(idx, tuple):
+            i, j = idx
+            return self._rows[i][j]
+        return self._rows[idx]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def tolist(self):
+        """The rows, as a list of lists of Zi."""
+        return [list(row) for row in self._rows]
+
+    def _parts(self):
+        """The real and imaginary component matrices, as lists of lists."""
+        return ([[z.real for z in row] for row in self._rows],
+                [[z.imag for z in row] for row in self._rows])
+
+    def __eq__(self, other):
+        if not isinstance(other, ZiMatrix):
+            return NotImplemented
+        return self.shape == other.shape and self._rows == other._rows
+
+    def __hash__(self):
+        return hash((self._ncols, self._rows))
+
+    def __repr__(self):
+        return f"ZiMatrix({[list(row) for row in self._rows]!r})"
+
+    # ---------------- Arithmetic -----------------------
+
+    def _check_shape(self, other):
+        if self.shape != other.shape:
+            raise ValueError(f"shape mismatch: {self.shape} and {other.shape}")
+
+    def __add__(self, other):
+        if not isinstance(other, ZiMatrix):
+            return NotImplemented
+        self._check_shape(other)
+        return ZiMatrix._of(tuple(tuple(map(add, r, s)) for r, s in zip(self._rows, other._rows)),
+                            self._ncols)
+
+    def __sub__(self, other):
+        if not isinstance(other, ZiMatrix):
+            return NotImplemented
+        self._check_shape(other)
+        return ZiMatrix._of(tuple(tuple(map(sub, r, s)) for r, s in zip(self._rows, other._rows)),
+                            self._ncols)
+
+    def __neg__(self):
+        return ZiMatrix._of(tuple(tuple(-z for z in row) for row in self._rows), self._ncols)
+
+    def __mul__(self, scalar):
+        """Entrywise product with a scalar (anything Zi accepts)."""
+        z = Zi._ensure_zi(scalar)
+        if z is None:
+            return NotImplemented
+        return ZiMatrix._of(tuple(tuple(z * v for v in row) for row in self._rows), self._ncols)
+
+    __rmul__ = __mul__
+
+    def __matmul__(self, other):
+        if not isinstance(other, ZiMatrix):
+            return NotImplemented
+        (n, k), (k2, m) = self.shape, other.shape
+        if k != k2:
+            raise ValueError(f"shape mismatch: {self.shape} @ {other.shape}")
+        if k == 0:
+            return ZiMatrix.zeros(n, m)
+        (ar, ai), (br, bi) = self._parts(), other._parts()
+        p1 = _strassen(ar, br, n, k, m)
+        p2 = _strassen(ai, bi, n, k, m)
+        p3 = _strassen(_madd(ar, ai), _madd(br, bi), n, k, m)
+        return ZiMatrix._from_parts(_msub(p1, p2), _msub(_msub(p3, p1), p2), m)
+
+    def transpose(self):
+        # zip() of no rows is empty, so a 0 by n matrix gets n empty rows.
+        rows = tuple(zip(*self._rows)) if self._rows else ((),) * self._ncols
+        return ZiMatrix._of(rows, len(self._rows))
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    # ---------------- Elimination -----------------------
+
+    def det(self):
+        """The determinant, by Bareiss fraction-free elimination. The
+        matrix must be square; the empty matrix has determinant 1."""
+        n, m = self.shape
+        if n != m:
+            raise ValueError(f"determinant of a non-square {n}x{m} matrix")
+        if n == 0:
+            return Zi(1, 0)
+        rank, sign, pivot = _bareiss(self.tolist())
+        if rank < n:
+            return _ZERO
+        return pivot if sign > 0 else -pivot
+
+    def rank(self):
+        """The rank (over Q(i), which equals that over Z[i])."""
+        return _bareiss(self.tolist())[0]
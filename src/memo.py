@@ -0,0 +1,102 @@
+"""Opt-in, bounded memoization of Zi.gcd, Zi.xgcd and Zi.mod_inverse.
+
+    memo = ZiMemo(maxsize=4096)
+    memo.gcd(a, b)          # same result as Zi.gcd(a, b)
+    memo.stats()            # MemoStats(hits=..., misses=..., ...)
+
+Results are cached in one least-recently-used table shared by the three
+operations, keyed by associate-normalized operands: a = u*a' with a' in
+the first quadrant and u a unit (a.canonical() == (a', u)), and the key
+is (a', b/u). Euclid's algorithm commutes with multiplying both operands by
+a unit (every quotient is unchanged, every remainder is multiplied by
+u), so
+
+    gcd(a, b)  == u * gcd(a', b/u)
+    xgcd(a, b) == (u * g, s, t)   where (g, s, t) = xgcd(a', b/u)
+
+exactly -- not merely up to a unit -- and a memoized call returns the
+same value the plain one would. The four associates of a share a cache
+entry.
+
+A ZiMemo is safe to share between threads: the table and counters are
+guarded by a lock, which is not held while a result is computed (two
+threads missing on the same key may both compute it; one result wins).
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+from src.zi import Zi
+
+MemoStats = namedtuple('MemoStats', 'hits misses evictions size maxsize')
+
+
+class ZiMemo:
+    """A bounded LRU cache in front of Zi.gcd, Zi.xgcd and
+    Zi.mod_inverse. maxsize is the number of entries kept (None means
+    unbounded)."""
+
+    def __init__(self, maxsize=1024):
+        if maxsize is not None and (not isinstance(maxsize, int) or maxsize < 1):
+            raise ValueError("maxsize must be a positive integer or None")
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def __repr__(self):
+        return f"ZiMemo(maxsize={self.maxsize})"
+
+    def __len__(self):
+        return len(self._cache)
+
+    def _lookup(self, op, a, b, compute):
+        """compute(a', b') on the normalized operands, cached, together
+        with the unit u that relates them to (a, b)."""
+        a = Zi._require_zi(a)
+        b = Zi._require_zi(b)
+        a1, u = a.canonical()
+        b1 = b * u.conjugate()
+        key = (op, a1, b1)
+        with self._lock:
+            try:
+                result = self._cache[key]
+            except KeyError:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._cache.move_to_end(key)
+                return result, u
+        result = compute(a1, b1)
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+                    self._evictions += 1
+        return result, u
+
+    def gcd(self, a, b):
+        g, u = self._lookup('gcd', a, b, Zi.gcd)
+        return u * g
+
+    def xgcd(self, a, b):
+        (g, s, t), u = self._lookup('xgcd', a, b, Zi.xgcd)
+        return u * g, s, t
+
+    def mod_inverse(self, a, m):
+        """Zi.mod_inverse(a, m), with its xgcd(a, m) served from the
+        cache."""
+        return Zi._mod_inverse_by(a, m, self.xgcd)
+
+    def stats(self):
+        with self._lock:
+            return MemoStats(self._hits, self._misses, self._evictions,
+                             len(self._cache), self.maxsize)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._cache.clear()
+            self._hits = self._misses = self._evictions = 0
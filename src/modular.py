@@ -0,0 +1,56 @@
+"""Arithmetic on many residues modulo one Gaussian modulus.
+
+batch_inverse(values, m) inverts every value modulo m with Montgomery's
+trick: it forms the prefix products c_k = a_0 a_1 ... a_k (mod m),
+inverts only the last one with a single xgcd, and walks back,
+
+    a_k^-1   = c_k^-1 * c_(k-1)
+    c_(k-1)^-1 = c_k^-1 * a_k
+
+so k inverses cost one xgcd and 3(k - 1) modular multiplications
+instead of k xgcds.
+
+A value sharing a prime with m makes the whole product non-invertible.
+Then the batch is split in halves, and each half is retried on its own;
+halves whose product is invertible still take the fast path, and the
+recursion bottoms out at the single values that have no inverse, which
+come back as None (as in ZiPool.map('mod_inverse')). A batch with j
+such values costs O(j log k) extra xgcds.
+"""
+
+from src.zi import Zi
+
+
+def _invert(values, m):
+    """Inverses of the reduced values modulo m, None where there is none."""
+    prefix = []
+    acc = None
+    for a in values:
+        acc = a if acc is None else acc * a % m
+        prefix.append(acc)
+    g, s, _ = Zi.xgcd(acc, m)
+    if not g.is_unit:
+        if len(values) == 1:
+            return [None]
+        mid = len(values) // 2
+        return _invert(values[:mid], m) + _invert(values[mid:], m)
+    inv = s * g.conjugate() % m         # (a_0 ... a_(k-1))^-1
+    out = [None] * len(values)
+    for k in range(len(values) - 1, 0, -1):
+        out[k] = inv * prefix[k - 1] % m
+        inv = inv * values[k] % m
+    out[0] = inv
+    return out
+
+
+def batch_inverse(values, m):
+    """A list with the inverse of each of values modulo m (the x with
+    a*x == 1 mod m, reduced mod m and congruent to Zi.mod_inverse(a, m)),
+    or None for each value not coprime to m."""
+    m = Zi._require_zi(m)
+    if not m:
+        raise ZeroDivisionError("modulus is zero Zi")
+    values = [Zi._require_zi(a) % m for a in values]
+    if not values:
+        return []
+    return _invert(values, m)
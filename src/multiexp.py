@@ -0,0 +1,145 @@
+"""Simultaneous multi-exponentiation of Gaussian integers.
+
+multi_pow(bases, exponents, mod=None) is the product of every
+base ** exponent, reduced mod m after each multiplication if a modulus
+is given. Computing each power on its own costs about 1.5 * bits
+multiplications per base; the methods here share the squarings across
+all the bases instead:
+
+    'straus'      (Straus/Shamir interleaving) precompute base**d for
+                  every w-bit digit d of each base, then scan the
+                  exponents w bits at a time: w squarings of the
+                  accumulator, and one table multiply per base
+    'pippenger'   (bucket method) scan c bits at a time; per window,
+                  multiply each base into the bucket for its digit, then
+                  combine the buckets as prod(bucket[d] ** d) with two
+                  multiplications per bucket, by running products
+
+Straus needs a table per base, so it suits a few bases; Pippenger's
+per-window cost of 2^(c+1) bucket multiplications is amortized over
+many. By default (method=None) multi_pow estimates the multiplication
+count of both, at their best window sizes, and uses the cheaper.
+
+Negative exponents need a modulus: those bases are inverted mod m first
+(with modular.batch_inverse), and a base with no inverse raises
+ValueError, as Zi.mod_inverse does.
+"""
+
+from src.modular import batch_inverse
+from src.zi import Zi
+
+METHODS = ('straus', 'pippenger')
+# Window sizes tried by the cost estimates.
+_STRAUS_WINDOWS = range(1, 7)
+_PIPPENGER_WINDOWS = range(1, 17)
+
+
+def _straus_cost(k, bits, w):
+    return k * ((1 << w) - 2) + -(-bits // w) * k + bits
+
+
+def _pippenger_cost(k, bits, c):
+    return -(-bits // c) * (k + (2 << c)) + bits
+
+
+def plan(k, bits):
+    """(method, window, estimated multiplications) for k bases with
+    exponents of at most bits bits: the cheaper method at its best
+    window size."""
+    w = min(_STRAUS_WINDOWS, key=lambda w: _straus_cost(k, bits, w))
+    c = min(_PIPPENGER_WINDOWS, key=lambda c: _pippenger_cost(k, bits, c))
+    straus, pippenger = _straus_cost(k, bits, w), _pippenger_cost(k, bits, c)
+    return ('straus', w, straus) if straus <= pippenger else ('pippenger', c, pippenger)
+
+
+def _straus(bases, exponents, mul, w, windows):
+    mask = (1 << w) - 1
+    tables = []
+    for b in bases:
+        table = [None, b]
+        for _ in range(mask - 1):
+            table.append(mul(table[-1], b))
+        tables.append(table)
+    acc = None
+    for shift in range((windows - 1) * w, -1, -w):
+        if acc is not None:
+            for _ in range(w):
+                acc = mul(acc, acc)
+        for table, e in zip(tables, exponents):
+            d = (e >> shift) & mask
+            if d:
+                acc = table[d] if acc is None else mul(acc, table[d])
+    return acc
+
+
+def _pippenger(bases, exponents, mul, c, windows):
+    mask = (1 << c) - 1
+    acc = None
+    for shift in range((windows - 1) * c, -1, -c):
+        if acc is not None:
+            for _ in range(c):
+                acc = mul(acc, acc)
+        buckets = [None] * (mask + 1)
+        for b, e in zip(bases, exponents):
+            d = (e >> shift) & mask
+            if d:
+                buckets[d] = b if buckets[d] is None else mul(buckets[d], b)
+        # prod(buckets[d] ** d) = prod over d of (buckets[d] ... buckets[mask]).
+        running = total = None
+        for d in range(mask, 0, -1):
+            if buckets[d] is not None:
+                running = buckets[d] if running is None else mul(running, buckets[d])
+            if running is not None:
+                total = running if total is None else mul(total, running)
+        if total is not None:
+            acc = total if acc is None else mul(acc, total)
+    return acc
+
+
+def multi_pow(bases, exponents, mod=None, method=None):
+    """The product of base ** exponent over the pairs of bases and
+    exponents (ints), as a Zi, reduced mod mod (nearest remainder) after
+    every multiplication if mod is given; then congruent to the plain
+    product. method is 'straus', 'pippenger' or None to choose by cost
+    (see plan)."""
+    if method is not None and method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}: {method!r}")
+    bases = [Zi._require_zi(b) for b in bases]
+    exponents = list(exponents)
+    if len(bases) != len(exponents):
+        raise ValueError("bases and exponents differ in length")
+    for e in exponents:
+        if not isinstance(e, int):
+            raise TypeError(f"exponents must be ints, not {type(e).__name__}")
+    if mod is not None:
+        m = Zi._require_zi(mod)
+        if not m:
+            raise ZeroDivisionError("modulus is zero Zi")
+        one = Zi(1, 0) % m
+        mul = lambda a, b: a * b % m
+        bases = [b % m for b in bases]
+        negative = [k for k, e in enumerate(exponents) if e < 0]
+        if negative:
+            inverses = batch_inverse([bases[k] for k in negative], m)
+            for k, inverse in zip(negative, inverses):
+                if inverse is None:
+                    raise ValueError(f"{bases[k]!r} is not invertible modulo {m!r}")
+                bases[k], exponents[k] = inverse, -exponents[k]
+    else:
+        if any(e < 0 for e in exponents):
+            raise ValueError("negative exponents need a modulus")
+        one = Zi(1, 0)
+        mul = Zi.__mul__
+    pairs = [(b, e) for b, e in zip(bases, exponents) if e]
+    if not pairs:
+        return one
+    bases, exponents = [b for b, _ in pairs], [e for _, e in pairs]
+    bits = max(exponents).bit_length()
+    if method is None:
+        method, window, _ = plan(len(bases), bits)
+    elif method == 'straus':
+        window = min(_STRAUS_WINDOWS, key=lambda w: _straus_cost(len(bases), bits, w))
+    else:
+        window = min(_PIPPENGER_WINDOWS, key=lambda c: _pippenger_cost(len(bases), bits, c))
+    run = _straus if method == 'straus' else _pippenger
+    return run(bases, exponents, mul, window, -(-bits // window))
@@ -0,0 +1,111 @@
+"""Packed pickling of lists of Gaussian integers and rationals.
+
+A plain list of Zi or Qi pickles one reduce call per element. PackedList
+is a list subclass that instead pickles all of its components as a
+single block of integers:
+
+    pickle.dumps(PackedList(values))    # or packed.dumps(values)
+
+The block holds 2 ints per element (real, imag) when every element is a
+Zi, and 4 (real and imaginary numerator and denominator) when any is a
+Qi. It is stored as little-endian bytes of the narrowest of int8, int16,
+int32 and int64 that holds every integer, and as a list of Python ints
+(still without per-element class references) when some integer exceeds
+int64. Unpickling gives back a PackedList of equal
+values.
+
+Only Zi and Qi elements are accepted; anything else raises TypeError.
+"""
+
+import pickle
+import sys
+from array import array
+from fractions import Fraction
+from itertools import chain
+
+from src.qi import Qi
+from src.zi import Zi
+
+# Element layouts: 2 ints per Zi, or 4 ints per value when any is a Qi.
+_ZI, _QI = 'zi', 'qi'
+
+
+class PackedList(list):
+    """A list of Zi/Qi values that pickles as one packed integer block."""
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return _unpickle, _pack(self)
+
+    def __copy__(self):
+        return PackedList(self)
+
+
+def _components(values):
+    """(layout, iterator over the component ints)."""
+    if all(type(v) is Zi for v in values):
+        return _ZI, chain.from_iterable((z.real, z.imag) for z in values)
+    for v in values:
+        if not isinstance(v, (Zi, Qi)):
+            raise TypeError(f"PackedList holds only Zi and Qi, not {type(v).__name__}")
+    return _QI, chain.from_iterable(_qi_ints(v) for v in values)
+
+
+def _qi_ints(v):
+    if isinstance(v, Zi):
+        return v.real, 1, v.imag, 1
+    r, i = v.real, v.imag
+    return r.numerator, r.denominator, i.numerator, i.denominator
+
+
+# Little-endian integer widths, narrowest first: (typecode, bound) where
+# every int in [-bound, bound) fits.
+_WIDTHS = [(code, 1 << (8 * array(code).itemsize - 1)) for code in 'bhiq']
+
+
+def _pack(values):
+    """(layout, typecode, block): block is little-endian bytes of the
+    narrowest array type holding every component, or a list of ints if
+    some component exceeds int64 (typecode None)."""
+    layout, ints = _components(values)
+    ints = list(ints)
+    lo, hi = (min(ints), max(ints)) if ints else (0, 0)
+    for code, bound in _WIDTHS:
+        if -bound <= lo and hi < bound:
+            block = array(code, ints)
+            if sys.byteorder == 'big':
+                block.byteswap()
+            return layout, code, block.tobytes()
+    return layout, None, ints
+
+
+def _unpack(layout, code, block):
+    if code is not None:
+        arr = array(code)
+        arr.frombytes(block)
+        if sys.byteorder == 'big':
+            arr.byteswap()
+        block = arr.tolist()
+    if layout == _ZI:
+        return list(map(Zi, block[0::2], block[1::2]))
+    values = []
+    for rn, rd, im, idn in zip(*[iter(block)] * 4):
+        if rd == 1 and idn == 1:
+            values.append(Zi(rn, im))
+        else:
+            values.append(Qi(Fraction(rn, rd), Fraction(im, idn)))
+    return values
+
+
+def _unpickle(layout, code, block):
+    return PackedList(_unpack(layout, code, block))
+
+
+def dumps(values, protocol=pickle.HIGHEST_PROTOCOL):
+    """pickle.dumps(PackedList(values))."""
+    return pickle.dumps(PackedList(values), protocol)
+
+
+def loads(data):
+    return pickle.loads(data)
@@ -0,0 +1,542 @@
+"""A local asyncio compute service for Gaussian integer number theory,
+speaking JSON lines over a Unix or TCP socket.
+
+Each request is one line holding a JSON object; each response is one
+line echoing the request's id:
+
+    {"id": 7, "op": "gcd", "args": [[12, 5], [3, -4]], "timeout": 0.5}
+    {"id": 7, "result": [1, 0]}
+    {"id": 8, "error": {"type": "DeadlineExceeded", "message": "..."}}
+
+Gaussian integers are [real, imag] pairs (a plain integer is also
+accepted as an argument). The operations are those of src/batch.py:
+
+    op             args      result
+    gcd            a, b      g
+    xgcd           a, b      [g, s, t]
+    mod_inverse    a, m      x, or a ValueError if a has no inverse mod m
+    is_prime       z         true / false
+    factor         z         {"unit": u, "factors": [[p, e], ...]}
+
+timeout (seconds, optional) is the request's deadline: if no result is
+ready by then the response is a DeadlineExceeded error. Responses to
+one connection's requests may arrive in any order.
+
+The server micro-batches: requests arriving within batch_delay of each
+other (up to max_batch of them) are grouped by operation and evaluated
+together through a ZiPool. Results are kept in an LRU cache shared by
+every client, and identical requests in flight at the same time are
+computed once. Backpressure is applied at two levels: each connection
+may have at most max_pending requests in flight before the server stops
+reading from it, and at most queue_size requests wait for a batch before
+all connections stop being read.
+
+    async with ZiServer(workers=4) as server:
+        await server.start(path='/tmp/zi.sock')
+        await server.serve_forever()
+
+    async with await ZiClient.connect(path='/tmp/zi.sock') as client:
+        g = await client.gcd(Zi(12, 5), Zi(3, -4))
+
+or run a server with python -m src.service --unix /tmp/zi.sock.
+"""
+
+import argparse
+import asyncio
+import json
+from collections import OrderedDict, namedtuple
+
+from src.batch import OPERATIONS, ZiPool
+from src.zi import Zi
+
+MAX_BATCH = 256
+BATCH_DELAY = 0.002
+MAX_PENDING = 64
+QUEUE_SIZE = 4096
+CACHE_SIZE = 1 << 16
+# Longest request line accepted, in bytes.
+MAX_LINE = 1 << 20
+
+_ARITY = {'gcd': 2, 'xgcd': 2, 'mod_inverse': 2, 'is_prime': 1, 'factor': 1}
+
+ServiceStats = namedtuple('ServiceStats', 'requests batches computed cache_hits coalesced expired')
+
+
+class ServiceError(Exception):
+    """An error response from the service. kind is its type name."""
+
+    def __init__(self, kind, message):
+        super().__init__(f"{kind}: {message}")
+        self.kind = kind
+        self.message = message
+
+
+class DeadlineExceeded(ServiceError, TimeoutError):
+    """The request's deadline passed before its result was ready."""
+
+    def __init__(self, message="deadline exceeded"):
+        super().__init__('DeadlineExceeded', message)
+
+
+# ----------------------------------------------------------------------
+# Wire encoding
+# ----------------------------------------------------------------------
+
+def _encode_zi(z):
+    return [z.real, z.imag]
+
+
+def _decode_zi(x):
+    if type(x) is int:
+        return Zi(x)
+    if isinstance(x, list) and len(x) == 2 and all(type(c) is int for c in x):
+        return Zi(x[0], x[1])
+    raise ValueError(f"not a Gaussian integer: {x!r}")
+
+
+def _encode_result(op, result):
+    if op in ('gcd', 'mod_inverse'):
+        return _encode_zi(result)
+    if op == 'xgcd':
+        return [_encode_zi(z) for z in result]
+    if op == 'is_prime':
+        return result
+    unit, factors = result
+    return {'unit': _encode_zi(unit), 'factors': [[_encode_zi(p), e] for p, e in factors]}
+
+
+def _decode_result(op, result):
+    if op in ('gcd', 'mod_inverse'):
+        return _decode_zi(result)
+    if op == 'xgcd':
+        return tuple(map(_decode_zi, result))
+    if op == 'is_prime':
+        return result
+    return _decode_zi(result['unit']), [(_decode_zi(p), e) for p, e in result['factors']]
+
+
+def _error(kind, message):
+    return {'error': {'type': kind, 'message': message}}
+
+
+def _parse_request(line):
+    """(id, op, args, timeout) for a request line; raises ValueError with
+    the id (or None) as its second argument."""
+    try:
+        msg = json.loads(line)
+    except ValueError:
+        raise ValueError("request is not valid JSON", None) from None
+    if not isinstance(msg, dict):
+        raise ValueError("request must be a JSON object", None)
+    rid = msg.get('id')
+    op, args, timeout = msg.get('op'), msg.get('args'), msg.get('timeout')
+    if op not in _ARITY:
+        raise ValueError(f"op must be one of {OPERATIONS}: {op!r}", rid)
+    if not isinstance(args, list) or len(args) != _ARITY[op]:
+        raise ValueError(f"{op} takes {_ARITY[op]} argument(s)", rid)
+    if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+        raise ValueError("timeout must be a positive number of seconds", rid)
+    try:
+        args = tuple(map(_decode_zi, args))
+    except ValueError as e:
+        raise ValueError(str(e), rid) from None
+    if op == 'factor' and not args[0]:
+        raise ValueError("0 has no prime factorization", rid)
+    return rid, op, args, timeout
+
+
+# ----------------------------------------------------------------------
+# Server
+# ----------------------------------------------------------------------
+
+class _Pending:
+    """One distinct computation waiting for a batch, and the future its
+    waiters share. deadline is the latest of theirs (None: no deadline)."""
+
+    __slots__ = ('op', 'args', 'key', 'future', 'deadline')
+
+    def __init__(self, op, args, key, future, deadline):
+        self.op = op
+        self.args = args
+        self.key = key
+        self.future = future
+        self.deadline = deadline
+
+
+class ZiServer:
+    """The compute service. Evaluates batches on pool (a ZiPool), or on a
+    ZiPool of workers processes that the server creates and shuts down."""
+
+    def __init__(self, workers=None, pool=None, max_batch=MAX_BATCH, batch_delay=BATCH_DELAY,
+                 max_pending=MAX_PENDING, queue_size=QUEUE_SIZE, cache_size=CACHE_SIZE):
+        self._own_pool = pool is None
+        self._pool = ZiPool(workers) if pool is None else pool
+        self.max_batch = max_batch
+        self.batch_delay = batch_delay
+        self.max_pending = max_pending
+        self.cache_size = cache_size
+        self._queue = asyncio.Queue(queue_size)
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._server = None
+        self._tasks = set()
+        self._counts = dict.fromkeys(ServiceStats._fields, 0)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def stats(self):
+        return ServiceStats(**self._counts)
+
+    @property
+    def address(self):
+        """The listening socket's address: a path, or (host, port)."""
+        return self._server.sockets[0].getsockname()
+
+    async def start(self, path=None, host='127.0.0.1', port=0):
+        """Listen on the Unix socket path, or else on TCP host:port (port 0
+        picks a free one; see address)."""
+        # Start the pool's workers before accepting any connection: forked
+        # workers inherit the open sockets, and would keep them open.
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, lambda: list(self._pool.map('gcd', [(1, 1)])))
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._serve, path, limit=MAX_LINE)
+        else:
+            self._server = await asyncio.start_server(self._serve, host, port, limit=MAX_LINE)
+        self._slots = asyncio.Semaphore(self._pool.workers)
+        self._spawn(self._batcher())
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+        # Connection handlers are cancelled too (closing their sockets),
+        # before waiting for the server: it waits for every connection.
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        if self._own_pool:
+            self._pool.shutdown()
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    # ---------------- Connections -----------------------
+
+    async def _serve(self, reader, writer):
+        me = asyncio.current_task()
+        self._tasks.add(me)
+        lock = asyncio.Lock()
+        slots = asyncio.Semaphore(self.max_pending)
+        tasks = set()
+
+        def done(task):
+            tasks.discard(task)
+            slots.release()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # longer than MAX_LINE
+                    await self._send(writer, lock, {'id': None, **_error('BadRequest', "request line too long")})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Stop reading this connection while it has max_pending
+                # requests in flight.
+                await slots.acquire()
+                task = asyncio.create_task(self._answer(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(done)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.CancelledError):
+            # Cancelled by close(); end quietly, as for a lost client.
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            self._tasks.discard(me)
+
+    async def _send(self, writer, lock, response):
+        data = json.dumps(response, separators=(',', ':')).encode() + b'\n'
+        async with lock:
+            try:
+                writer.write(data)
+                await writer.drain()
+            except ConnectionError:
+                pass  # the client has gone; nothing to answer
+
+    async def _answer(self, line, writer, lock):
+        try:
+            rid, op, args, timeout = _parse_request(line)
+        except ValueError as e:
+            await self._send(writer, lock, {'id': e.args[1], **_error('BadRequest', e.args[0])})
+            return
+        response = await self._evaluate(op, args, timeout)
+        await self._send(writer, lock, {'id': rid, **response})
+
+    # ---------------- Evaluation -----------------------
+
+    async def _evaluate(self, op, args, timeout):
+        """The response body ({'result': ...} or {'error': ...}) for one
+        request."""
+        self._counts['requests'] += 1
+        key = (op, *((z.real, z.imag) for z in args))
+        body = self._cache.get(key)
+        if body is not None:
+            self._cache.move_to_end(key)
+            self._counts['cache_hits'] += 1
+            return body
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._counts['coalesced'] += 1
+            if pending.deadline is not None:
+                pending.deadline = None if deadline is None else max(deadline, pending.deadline)
+        else:
+            pending = _Pending(op, args, key, loop.create_future(), deadline)
+            try:
+                if deadline is None:
+                    await self._queue.put(pending)
+                else:
+                    await asyncio.wait_for(self._queue.put(pending), deadline - loop.time())
+            except TimeoutError:
+                pending.future.cancel()
+                return _error('DeadlineExceeded', "server queue full until the deadline")
+            # Registered only once queued: a request coalesced onto one still
+            # waiting for queue space would share its fate if that put timed
+            # out. (Identical requests both waiting for space are queued twice.)
+            self._inflight.setdefault(key, pending)
+        try:
+            # Shielded: one waiter timing out must not cancel the shared
+            # computation.
+            if deadline is None:
+                return await asyncio.shield(pending.future)
+            return await asyncio.wait_for(asyncio.shield(pending.future), deadline - loop.time())
+        except TimeoutError:
+            return _error('DeadlineExceeded', "deadline exceeded")
+        except asyncio.CancelledError:
+            # The batcher cancels a computation whose deadline passed
+            # before it ran.
+            if not pending.future.cancelled():
+                raise
+            return _error('DeadlineExceeded', "deadline exceeded")
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            end = loop.time() + self.batch_delay
+            while len(batch) < self.max_batch:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                remaining = end - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except TimeoutError:
+                    break
+            groups = {}
+            for pending in batch:
+                groups.setdefault(pending.op, []).append(pending)
+            for op, group in groups.items():
+                await self._slots.acquire()
+                self._spawn(self._run_batch(op, group))
+
+    async def _run_batch(self, op, group):
+        loop = asyncio.get_running_loop()
+        try:
+            now = loop.time()
+            live = []
+            for p in group:
+                if p.deadline is not None and p.deadline <= now:
+                    self._counts['expired'] += 1
+                    self._finish(p, None)
+                else:
+                    live.append(p)
+            if not live:
+                return
+            self._counts['batches'] += 1
+            inputs = [p.args if len(p.args) == 2 else p.args[0] for p in live]
+            try:
+                results = await loop.run_in_executor(None, lambda: list(self._pool.map(op, inputs)))
+            except Exception as e:
+                for p in live:
+                    self._finish(p, _error('InternalError', f"{type(e).__name__}: {e}"))
+                return
+            self._counts['computed'] += len(live)
+            for p, result in zip(live, results):
+                if result is None:  # mod_inverse: no inverse
+                    body = _error('ValueError', f"{_encode_zi(p.args[0])} is not invertible "
+                                                f"mod {_encode_zi(p.args[1])}")
+                else:
+                    body = {'result': _encode_result(op, result)}
+                self._remember(p.key, body)
+                self._finish(p, body)
+        finally:
+            self._slots.release()
+            for p in group:
+                if not p.future.done():
+                    p.future.cancel()
+
+    def _finish(self, pending, body):
+        """Resolve pending's future with body (None: its deadline passed)."""
+        if self._inflight.get(pending.key) is pending:
+            del self._inflight[pending.key]
+        if pending.future.done():
+            return
+        if body is None:
+            pending.future.cancel()
+        else:
+            pending.future.set_result(body)
+
+    def _remember(self, key, body):
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = body
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+# ----------------------------------------------------------------------
+# Client
+# ----------------------------------------------------------------------
+
+class ZiClient:
+    """An asyncio client for ZiServer. Calls may be made concurrently over
+    one connection; each is matched to its response by id."""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._waiting = {}
+        self._listener = asyncio.create_task(self._listen())
+
+    @classmethod
+    async def connect(cls, path=None, host='127.0.0.1', port=None):
+        """Connect to the server on the Unix socket path, or at host:port."""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        self._writer.close()
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _listen(self):
+        error = ConnectionError("connection to the Gaussian compute service closed")
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                msg = json.loads(line)
+                future = self._waiting.pop(msg.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(msg)
+        except ConnectionError as e:
+            error = e
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._waiting.clear()
+
+    async def call(self, op, *args, timeout=None):
+        """The decoded result of op on args. Raises DeadlineExceeded or
+        ServiceError for an error response."""
+        if op not in _ARITY:
+            raise ValueError(f"op must be one of {OPERATIONS}: {op!r}")
+        if self._listener.done():
+            raise ConnectionError("connection to the Gaussian compute service closed")
+        self._next_id += 1
+        rid = self._next_id
+        request = {'id': rid, 'op': op, 'args': [_encode_zi(Zi._require_zi(a)) for a in args]}
+        if timeout is not None:
+            request['timeout'] = timeout
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[rid] = future
+        self._writer.write(json.dumps(request, separators=(',', ':')).encode() + b'\n')
+        await self._writer.drain()
+        msg = await future
+        if 'error' in msg:
+            kind, message = msg['error']['type'], msg['error']['message']
+            if kind == 'DeadlineExceeded':
+                raise DeadlineExceeded(message)
+            raise ServiceError(kind, message)
+        return _decode_result(op, msg['result'])
+
+    async def gcd(self, a, b, timeout=None):
+        return await self.call('gcd', a, b, timeout=timeout)
+
+    async def xgcd(self, a, b, timeout=None):
+        return await self.call('xgcd', a, b, timeout=timeout)
+
+    async def mod_inverse(self, a, m, timeout=None):
+        return await self.call('mod_inverse', a, m, timeout=timeout)
+
+    async def is_prime(self, z, timeout=None):
+        return await self.call('is_prime', z, timeout=timeout)
+
+    async def factor(self, z, timeout=None):
+        return await self.call('factor', z, timeout=timeout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gaussian integer compute service (JSON lines)")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument('--unix', metavar='PATH', help="listen on this Unix socket")
+    where.add_argument('--port', type=int, help="listen on this TCP port")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    async def run():
+        async with ZiServer(workers=args.workers) as server:
+            await server.start(path=args.unix, host=args.host, port=args.port)
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""ZiArrays in shared memory, for passing large datasets to worker
+processes without copying.
+
+A SharedZiArray is a ZiArray (its .array) whose int64 storage is a
+multiprocessing.shared_memory block. The parent publishes the data once;
+pickling a SharedZiArray -- which is what happens when it is passed to a
+process pool -- sends only the block's name, length and layout, and the
+worker attaches to the same memory. Workers read slices of it and write
+results into another shared array in place:
+
+    def square(src, dst, lo, hi):
+        with src, dst:                    # attached: closed, not unlinked
+            for i in range(lo, hi):
+                dst[i] = src[i] * src[i]
+
+    with SharedZiArray(values) as src, SharedZiArray.zeros(len(values)) as dst:
+        with ProcessPoolExecutor() as pool:
+            for lo in range(0, len(src), 10000):
+                pool.submit(square, src, dst, lo, min(lo + 10000, len(src)))
+        results = dst.array.tolist()
+
+The process that creates a block owns it. Leaving a with block, or
+calling close(), unmaps the memory; the owner also unlinks it, freeing
+it for good once every process has closed it. Any views of .array
+(slices, .real, .imag, ...) must be dropped before closing.
+"""
+
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from src.ziarray import ZiArray, _check_layout
+
+
+def _tracker_pid():
+    return getattr(resource_tracker._resource_tracker, '_pid', None)
+
+
+def _open(name, owner_tracker=None):
+    """Attach to the shared memory block name, leaving its cleanup to the
+    owner. Python 3.13+ can be told not to track the attachment. Before
+    that, attaching registers the block with this process's resource
+    tracker, which unlinks it when the process exits: harmless when that
+    is the owner's tracker (pool workers forked after it started share
+    it), but otherwise the registration has to be withdrawn. owner_tracker
+    is the owner's tracker pid; if it isn't known, a tracker this process
+    was already using is assumed to be the owner's."""
+    try:
+        return SharedMemory(name, track=False)
+    except TypeError:
+        pass
+    if owner_tracker is None:
+        owner_tracker = _tracker_pid()
+    shm = SharedMemory(name)
+    if _tracker_pid() != owner_tracker:
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+def _attach(name, length, layout, owner_tracker):
+    obj = SharedZiArray.__new__(SharedZiArray)
+    obj._setup(_open(name, owner_tracker), length, layout, owner=False, tracker=owner_tracker)
+    return obj
+
+
+class SharedZiArray:
+    """A ZiArray of the Gaussian integers values, in a new shared memory
+    block owned by this process. Use as a context manager, or call close()
+    when done."""
+
+    def __init__(self, values=(), layout='interleaved'):
+        if not isinstance(values, ZiArray):
+            values = ZiArray(values, layout)
+        self._create(len(values), layout)
+        self.array[:] = values
+
+    @classmethod
+    def zeros(cls, n, layout='interleaved'):
+        """A shared array of n zeros (new shared memory is zero-filled)."""
+        obj = cls.__new__(cls)
+        obj._create(n, layout)
+        return obj
+
+    def _create(self, n, layout):
+        _check_layout(layout)
+        # A block can't be empty, so a zero-length array still takes a byte.
+        self._setup(SharedMemory(create=True, size=max(16 * n, 1)), n, layout, owner=True)
+
+    @classmethod
+    def attach(cls, name, length, layout='interleaved'):
+        """Attach to the existing block name, holding length elements in
+        the given layout. The result does not own the block."""
+        return _attach(name, length, layout, None)
+
+    def _setup(self, shm, length, layout, owner, tracker=None):
+        self._shm = shm
+        # The pid of the resource tracker the owner registered the block
+        # with, passed on to attachers (see _open).
+        self._tracker = _tracker_pid() if owner else tracker
+        self.owner = owner
+        self.length = length
+        self.layout = layout
+        self.array = ZiArray.from_buffer(shm.buf[:16 * length], layout)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def closed(self):
+        return self.array is None
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, idx):
+        return self.array[idx]
+
+    def __setitem__(self, idx, value):
+        self.array[idx] = value
+
+    def __repr__(self):
+        state = 'closed' if self.closed else 'owner' if self.owner else 'attached'
+        return (f"<SharedZiArray {self.name!r} length={self.length} "
+                f"layout={self.layout!r} ({state})>")
+
+    def __reduce__(self):
+        if self.closed:
+            raise ValueError("cannot pickle a closed SharedZiArray")
+        return _attach, (self.name, self.length, self.layout, self._tracker)
+
+    def close(self):
+        """Unmap the shared memory, unlinking it too if this process owns
+        it. The array is unusable afterwards. Raises BufferError if views
+        of it are still alive (the owner's block is unlinked regardless)."""
+        if self.closed:
+            return
+        arr, self.array = self.array, None
+        for view in (arr._re, arr._im, arr._buf):
+            view.release()
+        if self.owner:
+            self._shm.unlink()
+        try:
+            self._shm.close()
+        except BufferError:
+            raise BufferError("cannot close SharedZiArray: views of its array are still in use") from None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,279 @@
+"""Segmented, multi-process sieve for the Gaussian primes up to a norm.
+
+Every Gaussian prime is an associate of one of
+
+* 1 + i, of norm 2;
+* a + bi and b + ai, where a*a + b*b == p for a rational prime
+  p == 1 (mod 4), of norm p;
+* q, for a rational prime q == 3 (mod 4), of norm q*q;
+
+so listing them by norm comes down to a sieve of Eratosthenes over the
+norms. Primes are given in first-quadrant form (real > 0, imag >= 0; see
+Zi.canonical), ordered by norm and then by real part.
+
+segment_primes(lo, hi) sieves one half-open norm range in memory.
+sieve() splits [0, limit] into segments of segment_size norms, sieves
+them in worker processes, and writes each to its own shard file in a
+directory:
+
+    index = sieve('primes/', 10 ** 9)
+    index.shard_for(123456789)       # the Shard holding that norm
+    for z in index.primes(10 ** 6, 2 * 10 ** 6):
+        ...
+
+Shards are binary Zi streams (see src/binio.py), named by segment
+number. index.json, the merged index, lists each finished shard's norm
+range, file name and prime count, and whether the run is complete.
+While a run is in progress, each finished shard is appended as one line
+to index.journal instead, so checkpointing costs O(1) per shard however
+many there are. The journal is merged into index.json (atomically) and
+removed when the run completes, and when an interrupted run is resumed:
+calling sieve() again with the same limit and segment size skips the
+segments already done. ShardIndex.load() includes journalled shards.
+"""
+
+import json
+import os
+from bisect import bisect_right
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import compress
+from math import isqrt
+
+from src import binio
+from src.factor import two_squares
+from src.zi import Zi
+
+FORMAT = 1
+INDEX_NAME = 'index.json'
+JOURNAL_NAME = 'index.journal'
+# Norms per segment: a bytearray of this many bytes per worker.
+SEGMENT_SIZE = 1 << 22
+
+Shard = namedtuple('Shard', ['lo', 'hi', 'file', 'count'])
+
+
+def _small_primes(n):
+    """The rational primes <= n."""
+    if n < 2:
+        return []
+    flags = bytearray(b'\x01') * (n + 1)
+    flags[0] = flags[1] = 0
+    for p in range(2, isqrt(n) + 1):
+        if flags[p]:
+            flags[p * p::p] = bytes(len(range(p * p, n + 1, p)))
+    return list(compress(range(n + 1), flags))
+
+
+def _rational_primes(lo, hi, base):
+    """The rational primes in [lo, hi), given base, the primes up to
+    isqrt(hi - 1)."""
+    lo = max(lo, 2)
+    if lo >= hi:
+        return []
+    flags = bytearray(b'\x01') * (hi - lo)
+    for p in base:
+        start = max(p * p, -(-lo // p) * p)
+        if start >= hi:
+            continue
+        flags[start - lo::p] = bytes(len(range(start - lo, hi - lo, p)))
+    return list(compress(range(lo, hi), flags))
+
+
+def segment_primes(lo, hi):
+    """The Gaussian primes (one per associate class, in first-quadrant
+    form) with lo <= norm < hi, ordered by norm and then real part."""
+    lo = max(lo, 0)
+    if lo >= hi:
+        return []
+    base = _small_primes(isqrt(hi - 1))
+    found = []
+    for p in _rational_primes(lo, hi, base):
+        if p & 3 == 1:
+            a, b = two_squares(p)
+            found += [(p, b, a), (p, a, b)]
+        elif p == 2:
+            found.append((2, 1, 1))
+    # Inert primes q have norm q*q, so q <= isqrt(hi - 1): a base prime.
+    for q in base:
+        if q & 3 == 3 and lo <= q * q:
+            found.append((q * q, q, 0))
+    found.sort()
+    return [Zi(a, b) for _, a, b in found]
+
+
+def _shard_file(k):
+    return f'shard-{k:06d}.zv'
+
+
+def _sieve_shard(directory, k, lo, hi):
+    """Worker: sieve segment k, covering norms [lo, hi), into its shard
+    file. Returns the Shard."""
+    primes = segment_primes(lo, hi)
+    name = _shard_file(k)
+    path = os.path.join(directory, name)
+    with open(path + '.tmp', 'wb') as f:
+        with binio.ZiWriter(f) as w:
+            w.write_many(primes)
+    os.replace(path + '.tmp', path)
+    return Shard(lo, hi, name, len(primes))
+
+
+class ShardIndex:
+    """The merged index of a sieve directory: the finished shards, sorted
+    by norm range. A complete index covers the norms 0 to limit."""
+
+    def __init__(self, directory, limit, segment_size, shards=(), complete=False):
+        self.directory = directory
+        self.limit = limit
+        self.segment_size = segment_size
+        self.shards = sorted(shards)
+        self.complete = complete
+
+    @classmethod
+    def load(cls, directory):
+        """The index in directory: index.json, plus any shards recorded
+        in the journal since it was written."""
+        with open(os.path.join(directory, INDEX_NAME)) as f:
+            data = json.load(f)
+        if data.get('format') != FORMAT:
+            raise ValueError(f"unsupported sieve index format: {data.get('format')!r}")
+        index = cls(directory, data['limit'], data['segment_size'],
+                    [Shard(*s) for s in data['shards']], data['complete'])
+        index._replay()
+        return index
+
+    def _journal_path(self):
+        return os.path.join(self.directory, JOURNAL_NAME)
+
+    def _replay(self):
+        """Add the shards recorded in the journal. A torn last line, from
+        a run killed mid-write, is ignored."""
+        try:
+            f = open(self._journal_path())
+        except FileNotFoundError:
+            return
+        with f:
+            done = {s.lo for s in self.shards}
+            for line in f:
+                try:
+                    shard = Shard(*json.loads(line))
+                except (ValueError, TypeError):
+                    break
+                if shard.lo not in done:
+                    done.add(shard.lo)
+                    self.add(shard)
+
+    def record(self, shard):
+        """Add a finished shard, and append it to the journal."""
+        self.add(shard)
+        with open(self._journal_path(), 'a') as f:
+            f.write(json.dumps(list(shard)) + '\n')
+
+    def save(self):
+        """Write index.json, atomically replacing any previous one, and
+        drop the journal, whose shards it now includes."""
+        data = {
+            'format': FORMAT,
+            'limit': self.limit,
+            'segment_size': self.segment_size,
+            'complete': self.complete,
+            'shards': [list(s) for s in self.shards],
+        }
+        path = os.path.join(self.directory, INDEX_NAME)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(data, f, indent=1)
+        os.replace(path + '.tmp', path)
+        try:
+            os.remove(self._journal_path())
+        except FileNotFoundError:
+            pass
+
+    def add(self, shard):
+        i = bisect_right(self.shards, shard)
+        self.shards.insert(i, shard)
+
+    def __len__(self):
+        """The number of primes in the finished shards."""
+        return sum(s.count for s in self.shards)
+
+    def path(self, shard):
+        return os.path.join(self.directory, shard.file)
+
+    def shard_for(self, norm):
+        """The Shard whose norm range holds norm, or None if that segment
+        hasn't been sieved."""
+        i = bisect_right(self.shards, (norm, float('inf'))) - 1
+        if i >= 0 and self.shards[i].lo <= norm < self.shards[i].hi:
+            return self.shards[i]
+        return None
+
+    def primes(self, lo=0, hi=None):
+        """Yield the primes with lo <= norm < hi (default: every prime in
+        the index), read from the shards in order. Norms in segments that
+        haven't been sieved are skipped."""
+        for shard in self.shards:
+            if shard.hi <= lo or (hi is not None and shard.lo >= hi):
+                continue
+            whole = lo <= shard.lo and (hi is None or shard.hi <= hi)
+            with open(self.path(shard), 'rb') as f:
+                for z in binio.ZiReader(f):
+                    if whole or (lo <= z.norm() and (hi is None or z.norm() < hi)):
+                        yield z
+
+
+def _segments(limit, segment_size):
+    for k, lo in enumerate(range(0, limit + 1, segment_size)):
+        yield k, lo, min(lo + segment_size, limit + 1)
+
+
+def sieve(directory, limit, segment_size=SEGMENT_SIZE, workers=None, resume=True):
+    """Sieve the Gaussian primes of norm up to limit into shard files in
+    directory (created if needed), using workers processes (default
+    os.cpu_count()). Returns the complete ShardIndex.
+
+    With resume=True, a previous run's index.json is picked up and its
+    finished shards kept; it must have been made with the same limit and
+    segment_size, or ValueError is raised. With resume=False, everything
+    is sieved afresh."""
+    if limit < 0:
+        raise ValueError("limit must be non-negative")
+    if segment_size < 1:
+        raise ValueError("segment_size must be positive")
+    os.makedirs(directory, exist_ok=True)
+    index = None
+    if resume and os.path.exists(os.path.join(directory, INDEX_NAME)):
+        index = ShardIndex.load(directory)
+        if (index.limit, index.segment_size) != (limit, segment_size):
+            raise ValueError(
+                f"{directory} holds a sieve with limit {index.limit} and segment size "
+                f"{index.segment_size}; pass resume=False to start over")
+        # A shard whose file has gone missing is sieved again.
+        index.shards = [s for s in index.shards if os.path.exists(index.path(s))]
+    if index is None:
+        index = ShardIndex(directory, limit, segment_size)
+    # Start from a compacted index.json and an empty journal.
+    index.save()
+    done = {s.lo for s in index.shards}
+    todo = iter([seg for seg in _segments(limit, segment_size) if seg[1] not in done])
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(workers)
+    try:
+        pending = set()
+        while True:
+            # Keep a couple of segments queued per worker, no more: each
+            # one in flight holds a segment_size bytearray.
+            for k, lo, hi in todo:
+                pending.add(executor.submit(_sieve_shard, directory, k, lo, hi))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index.record(future.result())
+    finally:
+        executor.shutdown(cancel_futures=True)
+    index.complete = True
+    index.save()
+    return index
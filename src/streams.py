@@ -0,0 +1,137 @@
+"""Lazy combinators over streams of Gaussian integers.
+
+Each function takes an iterable of Gaussian integers (Zi, or ints) and
+returns a generator, consuming its input one element or chunk at a time,
+so an unbounded stream is processed in constant memory:
+
+    running_prod(values, mod=m)     running product, reduced mod m
+    prefix_gcd(values)              gcd of each prefix
+    running_sum(values)             sum of each prefix
+    norms(values)                   the norm of each value
+    norm_filter(values, lo, hi)     the values with lo <= norm < hi
+    reduce_mod(values, m)           each value % m
+    batched(values, n)              lists of n values
+
+Every running result is exactly what folding the plain Zi operation
+over the prefix gives (e.g. running_prod yields acc = acc * z % m after
+each z).
+
+When values is a ZiArray (a table loaded with zifile.load, say), norms,
+norm_filter and reduce_mod take the array path instead, chunk by chunk
+(chunk_size elements at a time): they work on the int64 components
+directly, without building a Zi per element, and with numpy if it is
+already imported (see ZiArray and ZiDivisor). batched then yields
+ZiArray views rather than lists.
+"""
+
+import sys
+from itertools import compress, islice
+from operator import add, mul
+
+from src.zi import Zi
+from src.ziarray import CHUNK_SIZE, ZiArray, ZiDivisor
+
+# numpy computes a chunk's norms only when every component is below this
+# in magnitude, so a*a + b*b fits in int64.
+_NUMPY_NORM_BOUND = 1 << 31
+
+
+def batched(values, n):
+    """Yield successive batches of n values (the last may be shorter): as
+    lists, or as ZiArray views when values is a ZiArray."""
+    if n < 1:
+        raise ValueError("n must be at least 1")
+    if isinstance(values, ZiArray):
+        yield from values.chunks(n)
+        return
+    it = iter(values)
+    while batch := list(islice(it, n)):
+        yield batch
+
+
+def running_sum(values):
+    """Yield the sum of each prefix of values."""
+    acc = Zi(0, 0)
+    for z in values:
+        acc = acc + z
+        yield acc
+
+
+def running_prod(values, mod=None):
+    """Yield the product of each prefix of values. If mod is given, the
+    running product is reduced modulo mod after every multiplication
+    (Zi's nearest-remainder %), so it stays small; the last value yielded
+    is then ZiArray(values).prod(mod)."""
+    if mod is not None:
+        mod = Zi._require_zi(mod)
+        acc = Zi(1, 0) % mod
+        for z in values:
+            acc = acc * z % mod
+            yield acc
+    else:
+        acc = Zi(1, 0)
+        for z in values:
+            acc = acc * z
+            yield acc
+
+
+def prefix_gcd(values):
+    """Yield the gcd of each prefix of values (Zi.gcd folded from 0)."""
+    g = Zi(0, 0)
+    gcd = Zi.gcd
+    for z in values:
+        g = gcd(g, z)
+        yield g
+
+
+def _chunk_norms(chunk):
+    """The norms of a ZiArray chunk's elements, as a list of ints."""
+    np = sys.modules.get('numpy')
+    if np is not None and len(chunk):
+        re, im = np.asarray(chunk.real), np.asarray(chunk.imag)
+        big = max(abs(int(re.min())), abs(int(re.max())), abs(int(im.min())), abs(int(im.max())))
+        if big < _NUMPY_NORM_BOUND:
+            return (re * re + im * im).tolist()
+    re, im = chunk.real, chunk.imag
+    return list(map(add, map(mul, re, re), map(mul, im, im)))
+
+
+def norms(values, chunk_size=CHUNK_SIZE):
+    """Yield the norm of each value."""
+    if isinstance(values, ZiArray):
+        for chunk in values.chunks(chunk_size):
+            yield from _chunk_norms(chunk)
+        return
+    for z in values:
+        yield Zi._require_zi(z).norm()
+
+
+def norm_filter(values, lo=0, hi=None, chunk_size=CHUNK_SIZE):
+    """Yield the values whose norm n has lo <= n < hi (no upper bound if
+    hi is None), in order."""
+    if isinstance(values, ZiArray):
+        for chunk in values.chunks(chunk_size):
+            if hi is None:
+                keep = [n >= lo for n in _chunk_norms(chunk)]
+            else:
+                keep = [lo <= n < hi for n in _chunk_norms(chunk)]
+            yield from map(Zi, compress(chunk.real, keep), compress(chunk.imag, keep))
+        return
+    for z in values:
+        n = Zi._require_zi(z).norm()
+        if lo <= n and (hi is None or n < hi):
+            yield z
+
+
+def reduce_mod(values, m, chunk_size=CHUNK_SIZE):
+    """Yield each value % m. m may be a Zi (or anything Zi accepts) or a
+    prepared ZiDivisor."""
+    divisor = ZiDivisor._of(m)
+    if isinstance(values, ZiArray):
+        for chunk in values.chunks(chunk_size):
+            yield from divisor.mod(chunk)
+        return
+    m = divisor.divisor
+    for z in values:
+        yield Zi._require_zi(z) % m
+
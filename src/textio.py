@@ -0,0 +1,204 @@
+"""Bulk text parsing and formatting of Gaussian integer and rational
+literals.
+
+Reads one literal per line, in any of the forms str() produces for Zi,
+Qi and complex, and that Qi(str) accepts:
+
+    5    -3/4    2.5    4j    -3/5i    (3+4j)    (1/2-3/5j)    7-2i
+
+Each line is matched by a single regular expression. Integer components
+are converted with int() and only fractional or decimal ones go through
+Fraction. Values whose components are both whole come back as Zi, and
+the rest as Qi, just like Qi(...) itself. Blank lines are skipped. A line
+that isn't a literal raises ParseError, which carries its (1-based) line
+number.
+
+    with open(path) as f:
+        values = load(f)                  # a list of Zi / Qi
+    with open(path) as f:
+        for chunk in parse_chunks(f):     # lists of up to CHUNK_SIZE values
+            ...
+
+dump() goes the other way, writing str(v) for each value, one per line,
+in one write() call per chunk. Zi and Qi both format exactly from their
+integer components, so dump() then load() round-trips any value.
+"""
+
+import re
+from fractions import Fraction
+from itertools import islice
+
+from src.qi import Qi
+from src.zi import Zi
+from src.ziarray import ZiArray
+
+# Lines parsed per chunk by parse_chunks(), and written per write() call
+# by dump().
+CHUNK_SIZE = 1 << 14
+
+_NUMBER = r'\d+(?:\.\d+|/\d+)?'
+# An optional real part and an optional signed imaginary part (at least
+# one of them), optionally inside a pair of parentheses.
+_LITERAL = re.compile(
+    rf'''\s*(\()?\s*(?:
+        (?P<re>[+-]?{_NUMBER})(?:\s*(?P<sign>[+-])\s*(?P<im>{_NUMBER})[ij])?
+      | (?P<im_only>[+-]?{_NUMBER})[ij]
+    )\s*(?(1)\))\s*''',
+    re.VERBOSE,
+)
+
+
+class ParseError(ValueError):
+    """A line that isn't a Gaussian literal. lineno is 1-based."""
+
+    def __init__(self, lineno, line, reason="cannot parse Gaussian literal"):
+        super().__init__(f"line {lineno}: {reason}: {line.strip()!r}")
+        self.lineno = lineno
+        self.line = line
+
+
+def _number(s):
+    if '.' in s:
+        return Fraction(s)
+    num, slash, den = s.partition('/')
+    if slash:
+        # Cheaper than Fraction(s), which runs its own regex.
+        return Fraction(int(num), int(den))
+    return int(s)
+
+
+def _value(m):
+    """The Zi or Qi for a match of _LITERAL."""
+    re_, im_only = m.group('re', 'im_only')
+    if im_only is not None:
+        r, i = 0, _number(im_only)
+    else:
+        r = _number(re_)
+        im = m.group('im')
+        if im is None:
+            i = 0
+        else:
+            i = _number(im)
+            if m.group('sign') == '-':
+                i = -i
+    if type(r) is int and type(i) is int:
+        return Zi(r, i)
+    return Qi(r, i)
+
+
+def parse(s):
+    """The Zi or Qi for the single literal s; raises ValueError."""
+    m = _LITERAL.fullmatch(s)
+    if m is None:
+        raise ValueError(f"cannot parse Gaussian literal: {s!r}")
+    try:
+        return _value(m)
+    except ZeroDivisionError:
+        raise ValueError(f"zero denominator in Gaussian literal: {s!r}") from None
+
+
+def _parse_chunk(lines, first_lineno, integers_only=False):
+    values = []
+    append = values.append
+    match = _LITERAL.fullmatch
+    for lineno, line in enumerate(lines, first_lineno):
+        m = match(line)
+        if m is None:
+            if line.isspace() or not line:
+                continue
+            raise ParseError(lineno, line)
+        try:
+            v = _value(m)
+        except ZeroDivisionError:
+            raise ParseError(lineno, line, "zero denominator") from None
+        if integers_only and not isinstance(v, Zi):
+            raise ParseError(lineno, line, "not a Gaussian integer")
+        append(v)
+    return values
+
+
+def _chunks(lines, chunk_size, integers_only=False):
+    lines = iter(lines)
+    lineno = 1
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        values = _parse_chunk(chunk, lineno, integers_only)
+        lineno += len(chunk)
+        if values:
+            yield values
+
+
+def parse_chunks(lines, chunk_size=CHUNK_SIZE):
+    """Parse an iterable of lines (such as a text file), yielding lists of
+    values, one per chunk_size lines read."""
+    return _chunks(lines, chunk_size)
+
+
+def iter_parse(lines, chunk_size=CHUNK_SIZE):
+    """Like parse_chunks, but yields the values one at a time."""
+    for chunk in _chunks(lines, chunk_size):
+        yield from chunk
+
+
+def load(lines, chunk_size=CHUNK_SIZE):
+    """All the values in an iterable of lines, as a list."""
+    values = []
+    for chunk in _chunks(lines, chunk_size):
+        values += chunk
+    return values
+
+
+def load_array(lines, layout='interleaved', chunk_size=CHUNK_SIZE):
+    """All the values in an iterable of lines, as a ZiArray. Every literal
+    must be a Gaussian integer; anything else raises ParseError."""
+    values = []
+    for chunk in _chunks(lines, chunk_size, integers_only=True):
+        values += chunk
+    return ZiArray(values, layout)
+
+
+def format_lines(values, chunk_size=CHUNK_SIZE):
+    """Yield the text of values, one string of up to chunk_size
+    newline-terminated lines at a time."""
+    values = iter(values)
+    while True:
+        chunk = list(islice(values, chunk_size))
+        if not chunk:
+            return
+        yield _format_chunk(chunk)
+
+
+def _format_chunk(values):
+    """The newline-terminated str() of each value, as one string. Zi values
+    with two nonzero parts -- almost all of them, typically -- are
+    formatted inline with %-formatting rather than through a __str__ call
+    each, which roughly halves the time."""
+    lines = []
+    append = lines.append
+    zi = Zi
+    for v in values:
+        if type(v) is zi:
+            a, b = v._real, v._imag
+            if a and b:
+                append('(%d%+dj)' % (a, b))
+                continue
+        append(str(v))
+    append('')
+    return '\n'.join(lines)
+
+
+def dump(values, f, chunk_size=CHUNK_SIZE):
+    """Write values to the text file f, one literal per line. Returns the
+    number of values written."""
+    count = 0
+    for text in format_lines(values, chunk_size):
+        f.write(text)
+        count += text.count('\n')
+    return count
+
+
+def dumps(values):
+    """The text dump() would write, as a string."""
+    return ''.join(format_lines(values))
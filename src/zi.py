@@ -2,37 +2,111 @@
 
 from fractions import Fraction
 from math import sqrt
-from numbers import Complex
+from numbers import Complex, Integral
+from operator import index
+import os
 import random as rnd
 
+try:
+    from gmpy2 import mpz as _mpz
+except ImportError:
+    _mpz = None
+
+# Components bounding the interned small values (see Zi.__new__), and
+# the intern table itself, keyed by (real << 10) + imag.
+_INTERN_MAX = 256
+_interned = {}
+
 
 class Zi(Complex):
     """A class that represents a Gaussian integer. In mathematics, the set of all integers
     is denoted by Z, and the set of all Gaussian integers is denoted by Z[i]."""
 
-    __slots__ = ('_real', '_imag')
+    # _hash and _norm cache hash(self) and self.norm(), computed on first
+    # use (an unset slot reads as AttributeError). Each costs one pointer
+    # per instance: 64 bytes per Zi instead of 48 on 64-bit CPython.
+    __slots__ = ('_real', '_imag', '_hash', '_norm')
 
-    def __init__(self, real = None, imag = None) -> None:
-        if isinstance(real, (complex, Zi)):
-            if imag is None:
-                super().__setattr__('_real', round(real.real))
-                super().__setattr__('_imag', round(real.imag))
-            else:
+    def __new__(cls, real=None, imag=None):
+        if type(real) is int and type(imag) is int:
+            a, b = real, imag
+        elif isinstance(real, (complex, Zi)):
+            if imag is not None:
                 raise TypeError(f"imag must be None if real is a complex: {imag}")
-        elif isinstance(real, (int, float)):
-            super().__setattr__('_real', round(real))
-            if isinstance(imag, (int, float)):
-                super().__setattr__('_imag', round(imag))
-            elif imag is None:
-                super().__setattr__('_imag', 0)
+            if type(real) is cls:
+                return real  # immutable, so Zi(z) can simply be z
+            a, b = round(real.real), round(real.imag)
+        elif isinstance(real, (int, float, Integral)):
+            a = Zi._component(real)
+            if imag is None:
+                b = 0
+            elif isinstance(imag, (int, float, Integral)):
+                b = Zi._component(imag)
             else:
                 raise TypeError(f"Invalid type for imag: {imag}")
         elif real is None and imag is None:
-            super().__setattr__('_real', 0)
-            super().__setattr__('_imag', 0)
+            a, b = 0, 0
         else:
             raise TypeError(f"Invalid type for real: {real}")
 
+        # Small values are interned: every Zi(a, b) with both components
+        # in [-_INTERN_MAX, _INTERN_MAX] is the same shared instance, so
+        # gcd/xgcd loops, units, etc. stop allocating fresh copies of 0,
+        # 1, i, ... on every call. Instances are created on first use.
+        # Subclasses bypass the table, so it only ever holds exact Zi, and
+        # small mpz components are stored as plain ints, so a shared
+        # instance never carries an mpz.
+        if cls is Zi and -_INTERN_MAX <= a <= _INTERN_MAX and -_INTERN_MAX <= b <= _INTERN_MAX:
+            if type(a) is not int or type(b) is not int:
+                a, b = int(a), int(b)
+            key = (a << 10) + b
+            obj = _interned.get(key)
+            if obj is None:
+                obj = _interned[key] = cls._make(a, b)
+            return obj
+        return cls._make(a, b)
+
+    @classmethod
+    def _make(cls, a, b):
+        """Allocate a Zi from two ints, bypassing argument checks and the
+        intern table."""
+        obj = object.__new__(cls)
+        object.__setattr__(obj, '_real', a)
+        object.__setattr__(obj, '_imag', b)
+        return obj
+
+    @staticmethod
+    def _component(x):
+        """A constructor argument as a component: floats are rounded, and
+        gmpy2's mpz (see src/bigint.py) is kept as it is, so Zi arithmetic
+        runs on it natively. Every other Integral -- bools, int
+        subclasses, fixed-width types such as numpy's int64, which would
+        silently overflow -- becomes a plain int."""
+        if isinstance(x, float):
+            return round(x)
+        if _mpz is not None and type(x) is _mpz:
+            return x
+        return index(x)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Zi is immutable: cannot set {name!r}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Zi is immutable: cannot delete {name!r}")
+
+    def __reduce__(self):
+        # Rebuild through the constructor (default slot pickling would
+        # bypass it, and trip over __setattr__ and the intern table). The
+        # module-level _unpickle, rather than the class, is what gets
+        # pickled, so a pickle loads under whichever backend is active.
+        return _unpickle, (self._real, self._imag)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
     # ---------------- Accessors -----------------------
 
     @property
@@ -65,7 +139,7 @@ class Zi(Complex):
             return x
         if isinstance(x, complex):
             return Zi(x)
-        if isinstance(x, (int, float)):
+        if isinstance(x, (int, float, Integral)):
             return Zi(x, 0)
         return None
 
@@ -104,12 +178,23 @@ class Zi(Complex):
         return f"Zi({self.real}, {self.imag})"
 
     def __str__(self):
-        if self.imag == 0:
-            return str(self._real)
-        return str(complex(self.real, self.imag))
+        """Formatted like str(complex): '5', '4j', '(3-4j)'. Built straight
+        from the integer components (not via complex), so it's exact for
+        components of any size."""
+        a, b = self._real, self._imag
+        if b == 0:
+            return str(a)
+        if a == 0:
+            return f"{b}j"
+        return f"({a}{b:+d}j)"
 
     def __hash__(self):
-        return hash((self.real, self.imag))
+        try:
+            return self._hash
+        except AttributeError:
+            h = hash((self._real, self._imag))
+            super().__setattr__('_hash', h)
+            return h
 
     def __complex__(self):
         return complex(self.real, self.imag)
@@ -131,7 +216,12 @@ class Zi(Complex):
         return Zi(self._real, -self.imag)
 
     def norm(self):
-        return self.real * self.real + self.imag * self.imag
+        try:
+            return self._norm
+        except AttributeError:
+            n = self._real * self._real + self._imag * self._imag
+            super().__setattr__('_norm', n)
+            return n
 
     # ---------------- Arithmetic -----------------------------
 
@@ -211,7 +301,7 @@ class Zi(Complex):
     def __floordiv__(self, other):
         """Gaussian integers have no natural total order, so 'floor'
         division is defined as rounding to the nearest Gaussian integer
-        (using exact Fraction arithmetic, so it stays precise regardless
+        (using exact integer arithmetic, so it stays precise regardless
         of coefficient size). This is distinct from __truediv__, which
         now returns the exact quotient as a Qi."""
         oth = Zi._ensure_zi(other)
@@ -221,7 +311,18 @@ class Zi(Complex):
         if n == 0:
             raise ZeroDivisionError("division by zero Zi")
         num = self * oth.conjugate()
-        return Zi(round(Fraction(num.real, n)), round(Fraction(num.imag, n)))
+        return Zi(Zi._round_div(num.real, n), Zi._round_div(num.imag, n))
+
+    @staticmethod
+    def _round_div(x, n):
+        """round(Fraction(x, n)) for integers x and n > 0 -- i.e. x / n
+        rounded to the nearest integer, with ties going to the even
+        neighbour -- but computed with a single integer divmod instead of
+        building a Fraction (and its gcd)."""
+        q, r = divmod(x, n)
+        if r > n - r or (r == n - r and q & 1):
+            q += 1
+        return q
 
     def __rfloordiv__(self, other):
         oth = Zi._ensure_zi(other)
@@ -240,14 +341,14 @@ class Zi(Complex):
         if not isinstance(exponent, int):
             return NotImplemented
         if exponent == 0:
-            return Zi(1, 0)
+            return _ONE
         # For a negative exponent, Zi(1, 0) / self now returns the EXACT
         # inverse (a Qi, unless self is a unit) rather than a rounded
         # approximation. The multiplication loop below works correctly
         # even when base/result become Qi partway through, since Qi's
         # arithmetic methods handle mixed Zi/Qi operands transparently.
-        base, exp = (self, exponent) if exponent > 0 else (Zi(1, 0) / self, -exponent)
-        result = Zi(1, 0)
+        base, exp = (self, exponent) if exponent > 0 else (_ONE / self, -exponent)
+        result = _ONE
         while exp > 0:
             if exp & 1:
                 result = result * base
@@ -268,7 +369,7 @@ class Zi(Complex):
         Returns a Zi if self is a unit, otherwise a Qi. Provided so that
         inverse() works uniformly on any value coming out of Qi's
         arithmetic, since a Qi with denominator 1 collapses into a Zi."""
-        return Zi(1, 0) / self
+        return _ONE / self
 
     # ---------- Array Conversion ----------
 
@@ -338,7 +439,7 @@ class Zi(Complex):
         norm only when division rounds to nearest."""
         a = Zi._require_zi(a)
         b = Zi._require_zi(b)
-        if b == Zi(0, 0):
+        if not b:
             raise ZeroDivisionError("division by zero Zi")
         q = a // b  # rounds to nearest Gaussian integer
         r = a - b * q
@@ -348,7 +449,7 @@ class Zi(Complex):
     def gcd(a, b):
         a = Zi._require_zi(a)
         b = Zi._require_zi(b)
-        while b != Zi(0, 0):
+        while b:
             _, r = Zi.modified_divmod(a, b)
             a, b = b, r
         return a
@@ -360,15 +461,44 @@ class Zi(Complex):
         a = Zi._require_zi(a)
         b = Zi._require_zi(b)
         old_r, r = a, b
-        old_s, s = Zi(1, 0), Zi(0, 0)
-        old_t, t = Zi(0, 0), Zi(1, 0)
-        while r != Zi(0, 0):
+        old_s, s = _ONE, _ZERO
+        old_t, t = _ZERO, _ONE
+        while r:
             q, _ = Zi.modified_divmod(old_r, r)
             old_r, r = r, old_r - q * r
             old_s, s = s, old_s - q * s
             old_t, t = t, old_t - q * t
         return old_r, old_s, old_t
 
+    @staticmethod
+    def factor(z):
+        """Prime factorization of the nonzero Gaussian integer z: returns
+        (unit, [(prime, exponent), ...]) with z == unit * the product of
+        prime**exponent, each prime in first-quadrant form. See
+        src/factor.py."""
+        from src.factor import factor
+        return factor(z)
+
+    @staticmethod
+    def mod_inverse(a, m):
+        """The x with a*x == 1 (mod m), reduced mod m. Raises ValueError if
+        a and m are not coprime. From xgcd: a*s + m*t == g, and when g is
+        a unit its inverse is its conjugate, so x = s * conj(g)."""
+        return Zi._mod_inverse_by(a, m, Zi.xgcd)
+
+    @staticmethod
+    def _mod_inverse_by(a, m, xgcd):
+        """mod_inverse(a, m), taking (g, s, t) from xgcd(a, m): shared
+        with ZiMemo, which passes its cached xgcd."""
+        a = Zi._require_zi(a)
+        m = Zi._require_zi(m)
+        if not m:
+            raise ZeroDivisionError("modulus is zero Zi")
+        g, s, _ = xgcd(a, m)
+        if not g.is_unit:
+            raise ValueError(f"{a!r} is not invertible modulo {m!r}")
+        return (s * g.conjugate()) % m
+
     # ---------- utilities ----------
 
     @staticmethod
@@ -381,11 +511,11 @@ class Zi(Complex):
 
     @staticmethod
     def eye():
-        return Zi(0, 1)
+        return _I
 
     @staticmethod
     def units():
-        return [Zi(1), -Zi(1), Zi.eye(), -Zi.eye()]
+        return list(_UNITS)
 
     @property
     def is_unit(self):
@@ -395,4 +525,50 @@ class Zi(Complex):
 
     @staticmethod
     def two():
-        return Zi(1, 1)
+        return _TWO
+
+    def canonical(self):
+        """Return (c, u): the associate c of self in the first quadrant
+        (real > 0, imag >= 0) and the unit u with self == u * c. Zero is
+        its own canonical form, with u == 1. Two Gaussian integers are
+        associates iff their canonical forms are equal."""
+        a, b = self._real, self._imag
+        if a > 0 and b >= 0:
+            return self, _ONE
+        if b > 0 and a <= 0:
+            return Zi(b, -a), _I            # self == i * (b - ai)
+        if a < 0 and b <= 0:
+            return Zi(-a, -b), _UNITS[1]    # self == -1 * (-a - bi)
+        if b < 0 and a >= 0:
+            return Zi(-b, a), _UNITS[3]     # self == -i * (-b + ai)
+        return self, _ONE
+
+
+def _unpickle(real, imag):
+    return Zi(real, imag)
+
+
+# ---------- Backend selection ----------
+#
+# GAUSSIANS_ZI_BACKEND=tuple swaps in TupleZi (src/zi_tuple.py), the same
+# class laid out as a 2-tuple. It must be chosen before anything creates
+# a Zi, since the two backends do not interoperate; everything that does
+# `from src.zi import Zi` picks up the selected one. SlotsZi is always
+# the __slots__ class defined above.
+
+BACKENDS = ('slots', 'tuple')
+BACKEND = os.environ.get('GAUSSIANS_ZI_BACKEND', 'slots')
+if BACKEND not in BACKENDS:
+    raise ValueError(f"GAUSSIANS_ZI_BACKEND must be one of {BACKENDS}: {BACKEND!r}")
+
+SlotsZi = Zi
+if BACKEND == 'tuple':
+    from src.zi_tuple import TupleZi as Zi
+
+
+# Shared constants (interned, since they're within _INTERN_MAX).
+_ZERO = Zi(0, 0)
+_ONE = Zi(1, 0)
+_I = Zi(0, 1)
+_TWO = Zi(1, 1)
+_UNITS = (_ONE, Zi(-1, 0), _I, Zi(0, -1))
@@ -0,0 +1,101 @@
+"""Tuple-backed Gaussian integer: the Zi API with a 2-tuple layout.
+
+TupleZi stores (real, imag) as the items of a tuple subclass instead of
+in __slots__. Reading a component is then a C-level tuple index (via
+operator.itemgetter) rather than a slot descriptor behind a Python
+property, construction is a single tuple.__new__ call rather than two
+object.__setattr__ calls, and hashing is tuple's own hash, which equals
+the slots backend's hash((real, imag)). The price is that a tuple
+subclass cannot carry extra slots, so hash and norm are recomputed
+rather than cached.
+
+Everything else -- arithmetic, division, gcd and the static utilities,
+interning, immutability, pickling -- is the slots class's code, copied
+over verbatim below. Those methods refer to `Zi` through src.zi's
+module globals, which name TupleZi once it is the selected backend.
+
+Select it with the environment variable GAUSSIANS_ZI_BACKEND=tuple
+(see src/zi.py); it is not meant to be mixed with the slots backend in
+one process.
+"""
+
+from abc import update_abstractmethods
+from numbers import Complex
+from operator import itemgetter
+
+import src.zi as _zi
+
+
+class TupleZi(tuple, Complex):
+    """A Gaussian integer a + bi, stored as the tuple (a, b)."""
+
+    __slots__ = ()
+
+    @classmethod
+    def _make(cls, a, b):
+        """Allocate a TupleZi from two ints, bypassing argument checks and
+        the intern table."""
+        return tuple.__new__(cls, (a, b))
+
+    real = _real = property(itemgetter(0))
+    imag = _imag = property(itemgetter(1))
+
+    __getitem__ = tuple.__getitem__
+    __hash__ = tuple.__hash__
+
+    # Read-only stand-ins for the slots backend's cache slots.
+    _hash = property(tuple.__hash__)
+
+    def norm(self):
+        a, b = self
+        return a * a + b * b
+
+    _norm = property(norm)
+
+    # tuple's lexicographic ordering makes no sense for Z[i] (and the
+    # slots backend has none); refuse it the same way. Against a plain
+    # tuple, returning NotImplemented would hand the comparison to the
+    # tuple's reflected method, so raise here instead.
+
+    def _no_ordering(symbol):
+        def compare(self, other):
+            if isinstance(other, tuple):
+                raise TypeError(f"'{symbol}' not supported between instances of "
+                                f"'{type(self).__name__}' and '{type(other).__name__}'")
+            return NotImplemented
+        return compare
+
+    __lt__ = _no_ordering('<')
+    __le__ = _no_ordering('<=')
+    __gt__ = _no_ordering('>')
+    __ge__ = _no_ordering('>=')
+    del _no_ordering
+
+    # Likewise a plain tuple is not a Zi: without these, tuple's own
+    # comparison would answer the reflected (3, 4) == Zi(3, 4) with True.
+
+    def __eq__(self, other):
+        result = _zi.SlotsZi.__eq__(self, other)
+        if result is NotImplemented and isinstance(other, tuple):
+            return False
+        return result
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+
+# Take every other method from the slots class. __slots__ and its member
+# descriptors are skipped (they describe the other layout), as is the
+# class's own bookkeeping.
+_SKIP = set(_zi.SlotsZi.__slots__) | {
+    '__slots__', '__module__', '__qualname__', '__doc__', '__dict__',
+    '__abstractmethods__', '_abc_impl',
+}
+for _name, _attr in vars(_zi.SlotsZi).items():
+    if _name not in _SKIP and _name not in vars(TupleZi):
+        setattr(TupleZi, _name, _attr)
+del _name, _attr
+update_abstractmethods(TupleZi)
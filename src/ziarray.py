@@ -0,0 +1,497 @@
+"""Gaussian integer array (ZiArray): a fixed-length sequence of Gaussian
+integers stored as machine int64 components rather than as Zi objects.
+
+The components live in a single buffer in one of two layouts:
+
+* 'interleaved': re0, im0, re1, im1, ...  (the layout of numpy's
+  complex arrays, and of an (n, 2) int64 array)
+* 'split':       re0, re1, ..., im0, im1, ...  (two contiguous halves)
+
+Either way the data can be handed to (or taken from) numpy, array.array,
+mmap, or any other buffer-protocol object without building a Zi per
+element. Individual elements are only materialized as Zi when indexed.
+numpy is optional: it's imported lazily, only by the methods that
+produce or consume numpy arrays.
+"""
+
+import sys
+from array import array
+from itertools import chain
+
+from src.zi import Zi
+
+LAYOUTS = ('interleaved', 'split')
+
+# The range of a signed 64-bit component.
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+# Default number of elements per chunk for the chunked reductions.
+CHUNK_SIZE = 1 << 16
+
+# Buffer formats that describe a native signed 64-bit integer.
+_INT64_FORMATS = ('q', '@q', '=q', 'l', '@l')
+# Buffer formats that describe raw bytes, reinterpreted as int64.
+_BYTE_FORMATS = ('B', 'b', 'c')
+
+
+def _numpy():
+    """Import numpy on demand, so that it stays an optional dependency."""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("this operation requires numpy") from None
+    return numpy
+
+
+def _check_layout(layout):
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be one of {LAYOUTS}: {layout!r}")
+
+
+def _int64_view(buf):
+    """Return a 1-D memoryview of format 'q' over buf, without copying.
+    Raises TypeError if buf doesn't hold (or can't be reinterpreted as)
+    native int64 values."""
+    mv = buf if isinstance(buf, memoryview) else memoryview(buf)
+    if mv.format == 'q' and mv.ndim == 1:
+        return mv
+    if mv.format not in _INT64_FORMATS + _BYTE_FORMATS or (
+            mv.format in _INT64_FORMATS and mv.itemsize != 8):
+        raise TypeError(f"buffer must hold int64 values, not format {mv.format!r}")
+    if not mv.c_contiguous:
+        raise TypeError("buffer must be C-contiguous")
+    if mv.nbytes % 8:
+        raise ValueError(f"buffer size ({mv.nbytes} bytes) is not a multiple of 8")
+    return mv.cast('B').cast('q')
+
+
+def _int64_array(values):
+    """array('q', values), reporting out-of-range components as
+    OverflowError rather than array's less specific message."""
+    try:
+        return array('q', values)
+    except OverflowError:
+        raise OverflowError("Gaussian integer component does not fit in int64") from None
+
+
+class ZiArray:
+    """A fixed-length array of Gaussian integers with int64 components.
+
+    Indexing returns a Zi; slicing returns a ZiArray view that shares the
+    same storage (no copy). Assigning to an element or slice writes
+    through to the underlying buffer."""
+
+    __slots__ = ('_re', '_im', '_buf', '_layout')
+
+    def __init__(self, values=(), layout='interleaved') -> None:
+        _check_layout(layout)
+        zs = [Zi._require_zi(v) for v in values]
+        if layout == 'interleaved':
+            data = _int64_array(chain.from_iterable((z.real, z.imag) for z in zs))
+        else:
+            data = _int64_array(chain((z.real for z in zs), (z.imag for z in zs)))
+        self._bind(memoryview(data), layout)
+
+    def _bind(self, buf, layout):
+        """Point this array at buf (a 1-D 'q' memoryview) in the given
+        layout. buf must have an even number of elements."""
+        if len(buf) % 2:
+            raise ValueError("buffer must hold an even number of int64 components")
+        if layout == 'interleaved':
+            re, im = buf[0::2], buf[1::2]
+        else:
+            n = len(buf) // 2
+            re, im = buf[:n], buf[n:]
+        self._buf = buf
+        self._re = re
+        self._im = im
+        self._layout = layout
+
+    @classmethod
+    def _view(cls, re, im, buf, layout):
+        """Build a ZiArray over existing component views, without copying.
+        buf is the contiguous storage for the view, or None if the view is
+        strided or otherwise not a single contiguous block."""
+        obj = cls.__new__(cls)
+        obj._re = re
+        obj._im = im
+        obj._buf = buf
+        obj._layout = layout
+        return obj
+
+    # ---------------- Alternate Constructors -----------------------
+
+    @classmethod
+    def zeros(cls, n, layout='interleaved'):
+        """An array of n zeros."""
+        _check_layout(layout)
+        obj = cls.__new__(cls)
+        obj._bind(memoryview(array('q', bytes(16 * n))), layout)
+        return obj
+
+    @classmethod
+    def from_buffer(cls, buf, layout='interleaved'):
+        """Wrap an existing int64 buffer (array.array('q'), bytearray,
+        mmap, numpy int64 array, ...) without copying. The buffer holds
+        2n components in the given layout. Writes through the ZiArray are
+        visible in buf, and vice versa; a read-only buffer gives a
+        read-only ZiArray."""
+        _check_layout(layout)
+        obj = cls.__new__(cls)
+        obj._bind(_int64_view(buf), layout)
+        return obj
+
+    @classmethod
+    def from_split(cls, real, imag):
+        """Wrap two separate int64 buffers of equal length, holding the
+        real and imaginary components respectively, without copying.
+        The result has 'split' layout but no single backing buffer."""
+        re, im = _int64_view(real), _int64_view(imag)
+        if len(re) != len(im):
+            raise ValueError(f"real and imag lengths differ: {len(re)} != {len(im)}")
+        return cls._view(re, im, None, 'split')
+
+    @classmethod
+    def from_complex(cls, data, layout='interleaved'):
+        """Build an array from complex values, rounding each component to
+        the nearest integer exactly as Zi(complex) does. data may be a
+        numpy complex array (converted without any per-element Python
+        objects), a buffer of doubles holding interleaved (re, im) pairs,
+        or any iterable of complex numbers."""
+        _check_layout(layout)
+        np = _numpy_if_array(data)
+        if np is not None:
+            pairs = np.rint(np.ascontiguousarray(data, dtype=np.complex128).view(np.float64))
+            # float(INT64_MAX) rounds up to 2**63, itself out of range.
+            if np.any(~np.isfinite(pairs) | (np.abs(pairs) >= 2.0 ** 63)):
+                raise OverflowError("Gaussian integer component does not fit in int64")
+            pairs = pairs.astype(np.int64)
+            if layout == 'split':
+                pairs = np.concatenate((pairs[0::2], pairs[1::2]))
+            return cls.from_buffer(pairs, layout)
+        try:
+            mv = memoryview(data)
+        except TypeError:
+            mv = None
+        if mv is not None and mv.format in ('d', '@d', '=d'):
+            if mv.ndim != 1:
+                mv = mv.cast('B').cast('d')
+            data = _int64_array(map(round, mv))
+            if layout == 'split':
+                data = array('q', chain(data[0::2], data[1::2]))
+            return cls.from_buffer(data, layout)
+        return cls((complex(c) for c in data), layout)
+
+    # ---------------- Accessors -----------------------
+
+    @property
+    def layout(self) -> str:
+        return self._layout
+
+    @property
+    def real(self) -> memoryview:
+        """The real components, as a (possibly strided) int64 memoryview
+        over this array's storage."""
+        return self._re
+
+    @property
+    def imag(self) -> memoryview:
+        """The imaginary components, as a (possibly strided) int64
+        memoryview over this array's storage."""
+        return self._im
+
+    @property
+    def readonly(self) -> bool:
+        return self._re.readonly
+
+    @property
+    def buffer(self) -> memoryview:
+        """The contiguous int64 storage backing this array, in its layout.
+        Raises BufferError for views (e.g. stepped slices) whose elements
+        are not one contiguous block; use copy() first."""
+        if self._buf is None:
+            raise BufferError("ZiArray view is not contiguous; use copy() first")
+        return self._buf
+
+    def __len__(self):
+        return len(self._re)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            re, im = self._re[idx], self._im[idx]
+            buf = None
+            if self._buf is not None and self._layout == 'interleaved':
+                start, stop, step = idx.indices(len(self._re))
+                if step == 1:
+                    buf = self._buf[2 * start:2 * max(start, stop)]
+            return ZiArray._view(re, im, buf, self._layout)
+        return Zi(self._re[idx], self._im[idx])
+
+    def __setitem__(self, idx, value):
+        if isinstance(idx, slice):
+            re, im = self._re[idx], self._im[idx]
+            values = value if isinstance(value, ZiArray) else ZiArray(value)
+            if len(values) != len(re):
+                raise ValueError(f"slice assignment length mismatch: {len(values)} != {len(re)}")
+            try:
+                re[:] = values._re
+                im[:] = values._im
+            except NotImplementedError:  # memoryview can't copy strided -> strided
+                for k in range(len(re)):
+                    re[k] = values._re[k]
+                    im[k] = values._im[k]
+            return
+        z = Zi._require_zi(value)
+        try:
+            self._re[idx] = z.real
+            self._im[idx] = z.imag
+        except ValueError:
+            raise OverflowError("Gaussian integer component does not fit in int64") from None
+
+    def __iter__(self):
+        return map(Zi, self._re, self._im)
+
+    def __eq__(self, other):
+        if not isinstance(other, ZiArray):
+            return NotImplemented
+        return self._re == other._re and self._im == other._im
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ZiArray({self.tolist()!r}, layout={self._layout!r})"
+
+    # ---------------- Buffer Protocol -----------------------
+
+    def __buffer__(self, flags):
+        """PEP 688 buffer export (Python 3.12+): memoryview(arr) exposes
+        the contiguous int64 storage directly."""
+        return self.buffer
+
+    def __array__(self, dtype=None, copy=None):
+        """numpy conversion: an (n, 2) int64 array of (re, im) rows. For a
+        contiguous interleaved array this is a zero-copy view."""
+        np = _numpy()
+        if self._buf is not None and self._layout == 'interleaved' and copy is not True:
+            arr = np.frombuffer(self._buf, dtype=np.int64).reshape(-1, 2)
+        elif copy is False:
+            raise ValueError("ZiArray cannot be converted to (n, 2) without a copy")
+        else:
+            arr = np.column_stack((np.asarray(self._re), np.asarray(self._im)))
+        if dtype is not None:
+            arr = arr.astype(dtype, copy=False)
+        return arr
+
+    # ---------------- Conversion -----------------------
+
+    def copy(self, layout=None):
+        """A new, independent, contiguous array, optionally converting to a
+        different layout."""
+        layout = self._layout if layout is None else layout
+        _check_layout(layout)
+        if layout == 'interleaved':
+            data = array('q', bytes(16 * len(self)))
+            mv = memoryview(data)
+            mv[0::2] = self._re
+            mv[1::2] = self._im
+        else:
+            n = len(self)
+            data = array('q', bytes(16 * n))
+            mv = memoryview(data)
+            mv[:n] = self._re
+            mv[n:] = self._im
+        obj = ZiArray.__new__(ZiArray)
+        obj._bind(memoryview(data), layout)
+        return obj
+
+    def tobytes(self):
+        """The components, as raw native int64 bytes in this array's layout."""
+        if self._buf is not None:
+            return self._buf.tobytes()
+        return self.copy().buffer.tobytes()
+
+    def tolist(self):
+        """A list of Zi, one per element."""
+        return list(self)
+
+    def to_complex(self):
+        """A numpy complex128 array of the elements. Requires numpy."""
+        np = _numpy()
+        out = np.empty(len(self), dtype=np.complex128)
+        out.real = np.asarray(self._re)
+        out.imag = np.asarray(self._im)
+        return out
+
+    # ---------------- Chunked Reductions -----------------------
+
+    def chunks(self, chunk_size=CHUNK_SIZE):
+        """Yield consecutive views of at most chunk_size elements. Walking
+        a large (e.g. memory-mapped) array this way touches its storage
+        one chunk at a time, in order."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        for start in range(0, len(self), chunk_size):
+            yield self[start:start + chunk_size]
+
+    def sum(self, chunk_size=CHUNK_SIZE):
+        """The exact sum of all elements, as a Zi. Partial sums are
+        Python ints, so they never overflow int64."""
+        re = im = 0
+        for chunk in self.chunks(chunk_size):
+            re += sum(chunk._re)
+            im += sum(chunk._im)
+        return Zi(re, im)
+
+    def prod(self, mod=None, chunk_size=CHUNK_SIZE):
+        """The product of all elements, as a Zi. If mod is given, the
+        running product is reduced modulo mod after every multiplication
+        (using Zi's nearest-remainder %), so it stays small."""
+        if mod is not None:
+            mod = Zi._require_zi(mod)
+            acc = Zi(1, 0) % mod
+        else:
+            acc = Zi(1, 0)
+        for chunk in self.chunks(chunk_size):
+            for a, b in zip(chunk._re.tolist(), chunk._im.tolist()):
+                acc = acc * Zi(a, b)
+                if mod is not None:
+                    acc = acc % mod
+        return acc
+
+    # ---------------- Division by a Fixed Divisor -----------------------
+
+    def divmod(self, divisor, chunk_size=CHUNK_SIZE):
+        """Elementwise Zi.modified_divmod(z, divisor) over the array.
+        Returns (quotients, remainders) as two new ZiArrays. divisor may
+        be a Zi (or anything Zi accepts) or a prepared ZiDivisor."""
+        return ZiDivisor._of(divisor).divmod(self, chunk_size)
+
+    def mod(self, divisor, chunk_size=CHUNK_SIZE):
+        """Elementwise z % divisor over the array, as a new ZiArray."""
+        return ZiDivisor._of(divisor).mod(self, chunk_size)
+
+    def gcd(self, chunk_size=CHUNK_SIZE):
+        """The gcd of all elements (Zi.gcd folded over the array), as a
+        Zi. Stops reading as soon as the running gcd becomes a unit, since
+        it can't change after that (up to a unit factor)."""
+        g = Zi(0, 0)
+        for chunk in self.chunks(chunk_size):
+            for a, b in zip(chunk._re.tolist(), chunk._im.tolist()):
+                g = Zi.gcd(g, Zi(a, b))
+                if g.is_unit:
+                    return g
+        return g
+
+
+class ZiDivisor:
+    """A fixed Gaussian integer divisor c + di, prepared for dividing many
+    values by it. The quotient of a + bi is
+
+        ((a + bi)(c - di)) / n,  n = c^2 + d^2,
+
+    rounded component-wise to the nearest integer with ties to even, so
+    results are exactly those of Zi.modified_divmod / Zi.__mod__ (see
+    Zi._round_div). The conjugate and norm are computed once, here, and
+    each element then costs a few integer multiplications and two
+    divmods by n, with no Zi or Fraction built along the way.
+
+    When numpy is already imported and the products above fit in int64,
+    whole chunks are processed as numpy arrays instead."""
+
+    __slots__ = ('divisor', '_c', '_d', '_n')
+
+    # numpy is used only when |component| * |divisor component| stays
+    # below this, so every intermediate (a*c + b*d, etc.) fits in int64.
+    _NUMPY_BOUND = 1 << 61
+
+    def __init__(self, divisor) -> None:
+        divisor = Zi._require_zi(divisor)
+        n = divisor.norm()
+        if n == 0:
+            raise ZeroDivisionError("division by zero Zi")
+        self.divisor = divisor
+        self._c, self._d, self._n = divisor.real, divisor.imag, n
+
+    @staticmethod
+    def _of(divisor):
+        return divisor if isinstance(divisor, ZiDivisor) else ZiDivisor(divisor)
+
+    def __repr__(self):
+        return f"ZiDivisor({self.divisor!r})"
+
+    def _divmod_lists(self, res, ims, want_q):
+        """Quotient and remainder components for parallel lists of real and
+        imaginary parts. Returns (q_re, q_im, r_re, r_im); the quotient
+        lists are empty unless want_q."""
+        c, d, n = self._c, self._d, self._n
+        q_re, q_im, r_re, r_im = [], [], [], []
+        for a, b in zip(res, ims):
+            qr, rr = divmod(a * c + b * d, n)
+            if rr > n - rr or (rr == n - rr and qr & 1):
+                qr += 1
+            qi, ri = divmod(b * c - a * d, n)
+            if ri > n - ri or (ri == n - ri and qi & 1):
+                qi += 1
+            if want_q:
+                q_re.append(qr)
+                q_im.append(qi)
+            r_re.append(a - (c * qr - d * qi))
+            r_im.append(b - (c * qi + d * qr))
+        return q_re, q_im, r_re, r_im
+
+    def _divmod_numpy(self, np, chunk):
+        """numpy version of _divmod_lists for one chunk, or None if the
+        chunk's components are too large for exact int64 arithmetic."""
+        a, b = np.asarray(chunk.real), np.asarray(chunk.imag)
+        if not len(a):
+            return None
+        big = max(abs(int(a.min())), abs(int(a.max())), abs(int(b.min())), abs(int(b.max())))
+        if big * max(abs(self._c), abs(self._d), 1) >= self._NUMPY_BOUND:
+            return None
+        c, d, n = self._c, self._d, self._n
+        qr, rr = np.divmod(a * c + b * d, n)
+        qr += (rr > n - rr) | ((rr == n - rr) & (qr & 1 == 1))
+        qi, ri = np.divmod(b * c - a * d, n)
+        qi += (ri > n - ri) | ((ri == n - ri) & (qi & 1 == 1))
+        return qr, qi, a - (c * qr - d * qi), b - (c * qi + d * qr)
+
+    def _run(self, values, chunk_size, want_q):
+        values = values if isinstance(values, ZiArray) else ZiArray(values)
+        np = sys.modules.get('numpy') if self._n < self._NUMPY_BOUND else None
+        n = len(values)
+        q = ZiArray.zeros(n, values.layout) if want_q else None
+        r = ZiArray.zeros(n, values.layout)
+        for start, chunk in zip(range(0, n, chunk_size), values.chunks(chunk_size)):
+            stop = start + len(chunk)
+            parts = self._divmod_numpy(np, chunk) if np is not None else None
+            if parts is None:
+                lists = self._divmod_lists(chunk.real.tolist(), chunk.imag.tolist(), want_q)
+                parts = [_int64_array(part) for part in lists]
+            if want_q:
+                q._re[start:stop] = _int64_view(parts[0])
+                q._im[start:stop] = _int64_view(parts[1])
+            r._re[start:stop] = _int64_view(parts[2])
+            r._im[start:stop] = _int64_view(parts[3])
+        return q, r
+
+    def divmod(self, values, chunk_size=CHUNK_SIZE):
+        """(quotients, remainders) of every element of values (a ZiArray,
+        or any iterable of Gaussian integers) divided by this divisor, as
+        two ZiArrays with the same layout as values."""
+        return self._run(values, chunk_size, want_q=True)
+
+    def mod(self, values, chunk_size=CHUNK_SIZE):
+        """The remainders of every element of values modulo this divisor,
+        as a ZiArray. Skips building the quotients."""
+        return self._run(values, chunk_size, want_q=False)[1]
+
+
+def _numpy_if_array(data):
+    """Return the numpy module if data is a numpy array, else None. Never
+    imports numpy itself: if it isn't already loaded, data can't be one
+    of its arrays."""
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(data, np.ndarray):
+        return np
+    return None
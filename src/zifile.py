@@ -0,0 +1,121 @@
+"""On-disk storage for ZiArray: a small fixed header followed by the raw
+int64 components, so a file can be memory-mapped and used in place.
+
+File layout (all header fields little-endian):
+
+    offset  size  field
+    0       8     magic, b'ZIARRAY\\0'
+    8       2     format version (currently 1)
+    10      1     component dtype code (b'q': signed int64)
+    11      1     byte order of the data (b'<' little, b'>' big)
+    12      1     layout (0: interleaved, 1: split)
+    13      3     reserved (zero)
+    16      8     length: number of Gaussian integers
+    24      40    reserved (zero)
+    64      ...   2 * length int64 components, in the given layout
+
+load() maps the file rather than reading it, so opening even a very
+large table is immediate; pages are only read from disk as elements (or
+slices, which are views) are touched. The chunked reductions on ZiArray
+(sum, prod, gcd) walk a mapped array sequentially, one chunk at a time.
+"""
+
+import mmap
+import struct
+import sys
+from collections import namedtuple
+
+from src.ziarray import LAYOUTS, ZiArray, _check_layout
+
+MAGIC = b'ZIARRAY\0'
+VERSION = 1
+HEADER_SIZE = 64
+
+_HEADER = struct.Struct('<8sHcc B3x Q40x')
+_BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+
+# Bytes written per call by save(), so saving never makes a full copy of
+# a large array in memory.
+_WRITE_CHUNK = 1 << 16
+
+ZiFileHeader = namedtuple('ZiFileHeader', ['version', 'dtype', 'byteorder', 'layout', 'length'])
+
+
+def _pack_header(length, layout):
+    return _HEADER.pack(MAGIC, VERSION, b'q', _BYTE_ORDER, LAYOUTS.index(layout), length)
+
+
+def read_header(f):
+    """Read and validate the header of a ZiArray file, given a path or a
+    binary file object positioned at its start. Returns a ZiFileHeader."""
+    if isinstance(f, (str, bytes)) or hasattr(f, '__fspath__'):
+        with open(f, 'rb') as fh:
+            return read_header(fh)
+    raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise ValueError("not a ZiArray file: truncated header")
+    magic, version, dtype, byteorder, layout, length = _HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError("not a ZiArray file: bad magic number")
+    if version != VERSION:
+        raise ValueError(f"unsupported ZiArray file version: {version}")
+    if dtype != b'q':
+        raise ValueError(f"unsupported ZiArray component dtype: {dtype!r}")
+    if layout >= len(LAYOUTS):
+        raise ValueError(f"unsupported ZiArray layout code: {layout}")
+    return ZiFileHeader(version, dtype.decode(), byteorder.decode(), LAYOUTS[layout], length)
+
+
+def save(path, arr, layout=None):
+    """Write arr (a ZiArray, or any iterable of Gaussian integers) to path,
+    in the given layout (default: arr's own layout). Writes in chunks, so
+    saving a memory-mapped or otherwise large array needs little memory."""
+    if not isinstance(arr, ZiArray):
+        arr = ZiArray(arr)
+    layout = arr.layout if layout is None else layout
+    _check_layout(layout)
+    with open(path, 'wb') as f:
+        f.write(_pack_header(len(arr), layout))
+        if layout == 'interleaved':
+            for chunk in arr.chunks(_WRITE_CHUNK):
+                f.write(chunk.copy(layout='interleaved').buffer)
+        else:
+            for part in (arr.real, arr.imag):
+                for start in range(0, len(part), _WRITE_CHUNK):
+                    f.write(part[start:start + _WRITE_CHUNK].tobytes())
+
+
+def load(path, mode='r'):
+    """Memory-map a ZiArray file and return it as a ZiArray, without
+    reading the data. mode is 'r' (read-only), 'r+' (writes go to the
+    file) or 'c' (copy-on-write: writes stay private to this process)."""
+    access = {'r': mmap.ACCESS_READ, 'r+': mmap.ACCESS_WRITE, 'c': mmap.ACCESS_COPY}
+    if mode not in access:
+        raise ValueError(f"mode must be 'r', 'r+' or 'c': {mode!r}")
+    with open(path, 'r+b' if mode == 'r+' else 'rb') as f:
+        header = read_header(f)
+        if header.byteorder.encode() != _BYTE_ORDER:
+            raise ValueError(f"ZiArray file byte order {header.byteorder!r} "
+                             f"does not match this machine")
+        nbytes = HEADER_SIZE + 16 * header.length
+        f.seek(0, 2)
+        if f.tell() < nbytes:
+            raise ValueError("ZiArray file is shorter than its header declares")
+        if header.length == 0:
+            return ZiArray(layout=header.layout)
+        mm = mmap.mmap(f.fileno(), nbytes, access=access[mode])
+    # The memoryview keeps the mapping alive for as long as the array (or
+    # any view sliced from it) is in use.
+    return ZiArray.from_buffer(memoryview(mm)[HEADER_SIZE:nbytes], header.layout)
+
+
+def create(path, length, layout='interleaved'):
+    """Create a zero-filled ZiArray file of the given length, and return
+    it memory-mapped for writing (mode 'r+'). The file is sized with
+    truncate(), so on most filesystems no data blocks are written up
+    front."""
+    _check_layout(layout)
+    with open(path, 'wb') as f:
+        f.write(_pack_header(length, layout))
+        f.truncate(HEADER_SIZE + 16 * length)
+    return load(path, mode='r+')
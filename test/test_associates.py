@@ -0,0 +1,86 @@
+"""Unit tests for AssociateSet and AssociateDict."""
+
+import random
+import unittest
+
+from src.associates import AssociateDict, AssociateSet
+from src.zi import Zi
+
+
+# ----------------------------------------------------------------------
+# AssociateSet
+# ----------------------------------------------------------------------
+
+class TestAssociateSet(unittest.TestCase):
+    def test_associates_collapse(self):
+        z = Zi(3, 4)
+        s = AssociateSet(u * z for u in Zi.units())
+        self.assertEqual(len(s), 1)
+        self.assertEqual(list(s), [Zi(3, 4)])
+        for u in Zi.units():
+            self.assertIn(u * z, s)
+        self.assertNotIn(Zi(4, 3), s)
+        self.assertNotIn("nope", s)
+
+    def test_matches_brute_force_dedup(self):
+        rng = random.Random(35)
+        zs = [Zi(rng.randint(-20, 20), rng.randint(-20, 20)) for _ in range(500)]
+        classes = {frozenset(u * z for u in Zi.units()) for z in zs}
+        self.assertEqual(len(AssociateSet(zs)), len(classes))
+
+    def test_mutation_and_set_operations(self):
+        s = AssociateSet([Zi(1, 2), Zi(2, 1)])
+        s.add(Zi(-2, 1))        # i*(1+2i): already present
+        self.assertEqual(len(s), 2)
+        s.discard(Zi(-1, 2))    # i*(2+i)
+        self.assertEqual(list(s), [Zi(1, 2)])
+        with self.assertRaises(KeyError):
+            s.remove(Zi(7, 7))
+        both = AssociateSet([3, 5j]) | AssociateSet([-5, 7])
+        self.assertIsInstance(both, AssociateSet)
+        self.assertEqual(set(both), {Zi(3), Zi(5), Zi(7)})
+        self.assertEqual(set(AssociateSet([3, 5]) & AssociateSet([-3j])), {Zi(3)})
+
+    def test_representative(self):
+        s = AssociateSet([Zi(-5, 2)])
+        self.assertEqual(s.representative(Zi(5, -2)), Zi(2, 5))
+        with self.assertRaises(KeyError):
+            s.representative(Zi(1, 1))
+
+
+# ----------------------------------------------------------------------
+# AssociateDict
+# ----------------------------------------------------------------------
+
+class TestAssociateDict(unittest.TestCase):
+    def test_associates_share_an_entry(self):
+        d = AssociateDict()
+        d[Zi(2, -7)] = 'a'
+        for u in Zi.units():
+            self.assertEqual(d[u * Zi(2, -7)], 'a')
+        d[Zi(-2, 7)] = 'b'
+        self.assertEqual(len(d), 1)
+        self.assertEqual(dict(d), {Zi(7, 2): 'b'})
+        del d[Zi(0, 1) * Zi(2, -7)]
+        self.assertEqual(len(d), 0)
+        with self.assertRaises(KeyError):
+            d[Zi(2, -7)]
+
+    def test_construction_and_get(self):
+        d = AssociateDict({Zi(1, 1): 1, 3j: 2})
+        self.assertEqual(d.get(Zi(-1, 1)), 1)
+        self.assertEqual(d.get(-3), 2)
+        self.assertIsNone(d.get(Zi(4, 0)))
+        self.assertNotIn("nope", d)
+        with self.assertRaises(TypeError):
+            AssociateDict(x=1)
+
+    def test_counting_classes(self):
+        d = AssociateDict()
+        for z in (Zi(1, 2), Zi(-2, 1), Zi(2, 1), Zi(-1, -2)):
+            d[z] = d.get(z, 0) + 1
+        self.assertEqual(dict(d), {Zi(1, 2): 3, Zi(2, 1): 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+"""Unit tests for the process-pool batch API."""
+
+import random
+import threading
+import unittest
+from concurrent.futures import Future
+
+from src import batch
+from src.batch import ZiPool, factor_many, gcd_many, is_prime_many, xgcd_many
+from src.zi import Zi
+
+
+def _random_zi(rng, bound=10 ** 4):
+    return Zi(rng.randint(-bound, bound), rng.randint(-bound, bound))
+
+
+def _random_pairs(seed, n):
+    rng = random.Random(seed)
+    return [(_random_zi(rng), _random_zi(rng)) for _ in range(n)]
+
+
+class _HeldHeadExecutor:
+    """Runs chunks in-process: the first one finishes only after a delay,
+    every later one at once. Records how many were submitted before the
+    first finished."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.submitted = 0
+        self.before_head = None
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = Future()
+        if self.submitted > 1:
+            future.set_result(fn(*args))
+            return future
+
+        def finish():
+            self.before_head = self.submitted
+            future.set_result(fn(*args))
+
+        threading.Timer(self.delay, finish).start()
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class _PoolTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ZiPool(workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+
+# ----------------------------------------------------------------------
+# Results match the single-threaded functions
+# ----------------------------------------------------------------------
+
+class TestResults(_PoolTest):
+    def test_gcd_and_xgcd(self):
+        pairs = _random_pairs(41, 1000)
+        self.assertEqual(list(self.pool.map('gcd', pairs)), [Zi.gcd(a, b) for a, b in pairs])
+        self.assertEqual(list(self.pool.map('xgcd', pairs)), [Zi.xgcd(a, b) for a, b in pairs])
+
+    def test_mod_inverse_none_where_not_invertible(self):
+        pairs = [(Zi(3, 2), Zi(7)), (Zi(2), Zi(4)), (Zi(1), Zi(0)), (Zi(2, 1), Zi(5, 3))]
+        expected = [Zi.mod_inverse(*pairs[0]), None, None, Zi.mod_inverse(*pairs[3])]
+        self.assertEqual(list(self.pool.map('mod_inverse', pairs)), expected)
+
+    def test_is_prime(self):
+        values = [Zi(a, b) for a in range(-20, 21) for b in range(-20, 21)]
+        got = list(self.pool.map('is_prime', values))
+        self.assertEqual(got, [Zi.is_gaussian_prime(z) for z in values])
+        self.assertTrue(all(type(r) is bool for r in got))
+
+    def test_factor(self):
+        rng = random.Random(41)
+        values = [z for z in (_random_zi(rng, 10 ** 8) for _ in range(200)) if z]
+        self.assertEqual(list(self.pool.map('factor', values)), [Zi.factor(z) for z in values])
+
+    def test_accepts_ints_and_large_components(self):
+        big = Zi(2 ** 100 + 3, -(2 ** 90))
+        self.assertEqual(list(self.pool.map('gcd', [(12, 18), (big, big * Zi(3, 1))])),
+                         [Zi.gcd(12, 18), Zi.gcd(big, big * Zi(3, 1))])
+
+    def test_empty_input(self):
+        self.assertEqual(list(self.pool.map('gcd', [])), [])
+
+    def test_unknown_op(self):
+        with self.assertRaises(ValueError):
+            list(self.pool.map('sqrt', [Zi(1)]))
+
+    def test_bad_input_raises(self):
+        with self.assertRaises(TypeError):
+            list(self.pool.map('is_prime', [Zi(1), '2']))
+
+    def test_pairs_must_have_two_items(self):
+        for bad in [(Zi(1), Zi(2), Zi(3)), (Zi(1),)]:
+            with self.assertRaises(ValueError, msg=bad):
+                list(self.pool.map('gcd', [(Zi(4), Zi(6)), bad, (Zi(8), Zi(12))]))
+
+
+# ----------------------------------------------------------------------
+# Streaming and chunking
+# ----------------------------------------------------------------------
+
+class TestStreaming(_PoolTest):
+    def test_unordered_yields_every_index_once(self):
+        pairs = _random_pairs(42, 2000)
+        got = dict(self.pool.map('gcd', pairs, ordered=False))
+        self.assertEqual(sorted(got), list(range(len(pairs))))
+        self.assertEqual([got[i] for i in range(len(pairs))], [Zi.gcd(a, b) for a, b in pairs])
+
+    def test_lazy_input_is_consumed_incrementally(self):
+        consumed = []
+
+        def values():
+            for n in range(100000):
+                consumed.append(n)
+                yield Zi(n, 1)
+
+        results = self.pool.map('is_prime', values())
+        first = next(results)
+        self.assertEqual(first, Zi.is_gaussian_prime(Zi(0, 1)))
+        self.assertLess(len(consumed), 100000)
+        results.close()
+
+    def test_slow_head_chunk_bounds_buffered_results(self):
+        pool = ZiPool(workers=2)
+        pool.shutdown()
+        pool._executor = executor = _HeldHeadExecutor(0.2)
+        values = [Zi(n, 1) for n in range(2000)]
+        self.assertEqual(list(pool.map('is_prime', values)),
+                         [Zi.is_gaussian_prime(z) for z in values])
+        self.assertLessEqual(executor.before_head, batch.PREFETCH * pool.workers)
+
+    def test_next_size_adapts(self):
+        pool = self.pool
+        # Chunks far quicker than the target grow, by at most 4x a step.
+        self.assertEqual(pool._next_size(16, 16, 1e-6), 64)
+        # Slow chunks shrink, but never below MIN_CHUNK.
+        self.assertEqual(pool._next_size(4096, 4096, pool.target_seconds * 2), 2048)
+        self.assertEqual(pool._next_size(16, 16, 100.0), batch.MIN_CHUNK)
+        self.assertEqual(pool._next_size(batch.MAX_CHUNK, 10, 0.0), batch.MAX_CHUNK)
+
+
+# ----------------------------------------------------------------------
+# One-shot helpers and pool lifecycle
+# ----------------------------------------------------------------------
+
+class TestHelpers(unittest.TestCase):
+    def test_helpers(self):
+        pairs = _random_pairs(43, 50)
+        values = [a for a, _ in pairs if a]
+        self.assertEqual(list(gcd_many(pairs, workers=1)), [Zi.gcd(a, b) for a, b in pairs])
+        self.assertEqual(list(xgcd_many(pairs, workers=1)), [Zi.xgcd(a, b) for a, b in pairs])
+        self.assertEqual(list(is_prime_many(values, workers=1)),
+                         [Zi.is_gaussian_prime(z) for z in values])
+        self.assertEqual(sorted(factor_many(values, workers=1, ordered=False)),
+                         list(enumerate(map(Zi.factor, values))))
+
+    def test_default_workers(self):
+        with ZiPool() as pool:
+            self.assertEqual(pool.workers, batch.default_workers())
+        self.assertGreaterEqual(batch.default_workers(), 1)
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            ZiPool(workers=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Unit tests for product/remainder-tree batch gcd (src.batchgcd)."""
+
+import random
+import unittest
+from functools import reduce
+from operator import mul
+
+from src import batchgcd
+from src.batchgcd import batch_gcd, product_tree
+from src.zi import Zi
+
+
+def _random_zi(rng, bound=10 ** 6):
+    while True:
+        z = Zi(rng.randint(-bound, bound), rng.randint(-bound, bound))
+        if z:
+            return z
+
+
+def _naive(values):
+    """gcd(x, product of the others) for each x, the slow way."""
+    out = []
+    for k, x in enumerate(values):
+        others = reduce(mul, values[:k] + values[k + 1:], Zi(1))
+        out.append(Zi.gcd(x, others).canonical()[0])
+    return out
+
+
+def _planted(seed, n):
+    """n random values, some sharing planted primes."""
+    rng = random.Random(seed)
+    primes = [Zi(2, 1), Zi(3, 2), Zi(7), Zi(10, 3), Zi(1, 1)]
+    values = [_random_zi(rng) for _ in range(n)]
+    for k in range(0, n, 3):
+        values[k] = values[k] * rng.choice(primes)
+    return values
+
+
+# ----------------------------------------------------------------------
+# The product tree
+# ----------------------------------------------------------------------
+
+class TestProductTree(unittest.TestCase):
+    def test_levels(self):
+        values = [Zi(k, 1) for k in range(1, 8)]
+        tree = product_tree(values)
+        self.assertEqual(tree[0], values)
+        self.assertEqual([len(level) for level in tree], [7, 4, 2, 1])
+        self.assertEqual(tree[1][:3], [values[0] * values[1], values[2] * values[3],
+                                       values[4] * values[5]])
+        self.assertEqual(tree[1][3], values[6])
+        self.assertEqual(tree[-1], [reduce(mul, values)])
+
+    def test_small(self):
+        self.assertEqual(product_tree([]), [])
+        self.assertEqual(product_tree([5]), [[Zi(5)]])
+
+    def test_zero_rejected(self):
+        with self.assertRaises(ValueError):
+            product_tree([Zi(1, 1), 0])
+        with self.assertRaises(ValueError):
+            batch_gcd([Zi(0)])
+
+
+# ----------------------------------------------------------------------
+# Batch gcd
+# ----------------------------------------------------------------------
+
+class TestBatchGcd(unittest.TestCase):
+    def test_matches_naive(self):
+        for n in (2, 3, 10, 33):
+            values = _planted(47 + n, n)
+            self.assertEqual(batch_gcd(values), _naive(values), msg=n)
+
+    def test_shared_primes_found(self):
+        p, q, r = Zi(5, 2), Zi(4, 1), Zi(11)
+        values = [p * q, q * r, Zi(3, 8) * Zi(2, 7), p * Zi(13)]
+        self.assertEqual(batch_gcd(values),
+                         [(p * q).canonical()[0], q.canonical()[0], Zi(1), p.canonical()[0]])
+
+    def test_associates_and_duplicates(self):
+        z = Zi(6, 5)
+        self.assertEqual(batch_gcd([z, z * Zi(0, 1), Zi(2)]),
+                         [z.canonical()[0], z.canonical()[0], Zi(1)])
+
+    def test_edge_cases(self):
+        self.assertEqual(batch_gcd([]), [])
+        self.assertEqual(batch_gcd([Zi(3, 4)]), [Zi(1)])
+        self.assertEqual(batch_gcd([1, -1, Zi(0, 1)]), [Zi(1)] * 3)
+        self.assertEqual(batch_gcd([4, 6]), [Zi(2), Zi(2)])
+
+    def test_large_components(self):
+        rng = random.Random(470)
+        p = Zi(2 ** 89 - 1, 3 ** 40)
+        values = [_random_zi(rng, 10 ** 40) for _ in range(12)]
+        values[2], values[9] = values[2] * p, values[9] * p
+        self.assertEqual(batch_gcd(values), _naive(values))
+
+    def test_parallel_matches_serial(self):
+        values = _planted(4700, 300)
+        old = batchgcd.MIN_PARALLEL_NODES
+        batchgcd.MIN_PARALLEL_NODES = 8
+        try:
+            self.assertEqual(batch_gcd(values, workers=2), batch_gcd(values))
+            self.assertEqual(product_tree(values, workers=2), product_tree(values))
+        finally:
+            batchgcd.MIN_PARALLEL_NODES = old
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            batch_gcd([Zi(2)], workers=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""Unit tests for the big-integer backends (src/bigint.py)."""
+
+import random
+import unittest
+from fractions import Fraction
+
+from src import bigint
+from src.qi import Qi
+from src.zi import Zi
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _big_pairs(seed, n, digits):
+    rng = random.Random(seed)
+    bound = 10 ** digits
+    return [(Zi(rng.randint(-bound, bound), rng.randint(-bound, bound)),
+             Zi(rng.randint(-bound, bound), rng.randint(-bound, bound)))
+            for _ in range(n)]
+
+
+# ----------------------------------------------------------------------
+# Backend selection (always available)
+# ----------------------------------------------------------------------
+
+class TestSelection(unittest.TestCase):
+    def setUp(self):
+        self.saved = bigint.get_backend()
+
+    def tearDown(self):
+        bigint.set_backend(self.saved)
+
+    def test_python_backend_always_available(self):
+        self.assertIn('python', bigint.available_backends())
+        bigint.set_backend('python')
+        z = Zi(3 ** 9000, -1)
+        self.assertIs(bigint.promote(z), z)
+        self.assertIs(bigint.demote(z), z)
+        self.assertIs(type(bigint.to_backend_int(10 ** 50)), int)
+
+    def test_unknown_backend_raises(self):
+        with self.assertRaises(ValueError):
+            bigint.set_backend('decimal')
+
+    @unittest.skipIf(gmpy2 is not None, "gmpy2 is installed")
+    def test_gmpy2_missing(self):
+        self.assertFalse(bigint.HAVE_GMPY2)
+        self.assertEqual(bigint.get_backend(), 'python')
+        with self.assertRaises(ImportError):
+            bigint.set_backend('gmpy2')
+
+    def test_bool_components_become_ints(self):
+        z = Zi(True, False)
+        self.assertIs(type(z.real), int)
+        self.assertEqual(z, Zi(1, 0))
+
+    def test_other_integrals_become_ints(self):
+        class MyInt(int):
+            pass
+
+        for a, b in [(7, 9), (10 ** 30, -(10 ** 20))]:
+            z = Zi(MyInt(a), MyInt(b))
+            self.assertEqual(z, Zi(a, b))
+            self.assertIs(type(z.real), int)
+            self.assertIs(type(z.imag), int)
+        self.assertIs(type(bigint.demote(Zi(7, 9)).real), int)
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_integers_do_not_overflow(self):
+        z = Zi(np.int64(3_000_000_000), np.int64(5))
+        self.assertIs(type(z.real), int)
+        self.assertIs(type(z.imag), int)
+        self.assertEqual(z * z * z, Zi(26999999999999999775000000000, 134999999999999999875))
+        self.assertIs(type(Zi._require_zi(np.int64(1 << 40)).real), int)
+
+
+# ----------------------------------------------------------------------
+# mpz components (gmpy2 only)
+# ----------------------------------------------------------------------
+
+@unittest.skipIf(gmpy2 is None, "gmpy2 is not installed")
+class TestGmpy2(unittest.TestCase):
+    def setUp(self):
+        self.saved = bigint.get_backend()
+        bigint.set_backend('gmpy2')
+
+    def tearDown(self):
+        bigint.set_backend(self.saved)
+
+    def test_promote_threshold(self):
+        small, big = Zi(12345, 6), Zi(3 ** 9000, 7)
+        self.assertIs(bigint.promote(small), small)
+        p = bigint.promote(big)
+        self.assertIs(type(p.real), type(gmpy2.mpz(0)))
+        self.assertIs(type(p.imag), int)
+        self.assertEqual(p, big)
+        self.assertEqual(hash(p), hash(big))
+        self.assertIs(type(bigint.demote(p).real), int)
+
+    def test_results_match_python_ints(self):
+        for a, b in _big_pairs(40, 20, 1500):
+            pa, pb = bigint.promote(a, 0), bigint.promote(b, 0)
+            self.assertEqual(pa * pb, a * b)
+            self.assertEqual(pa // pb, a // b)
+            self.assertEqual(pa % pb, a % b)
+            self.assertEqual(Zi.gcd(pa, pb), Zi.gcd(a, b))
+            self.assertEqual(Zi.xgcd(pa, pb), Zi.xgcd(a, b))
+            self.assertEqual(str(pa), str(a))
+
+    def test_mixed_operands_and_qi(self):
+        z = Zi(gmpy2.mpz(6), 4)
+        self.assertEqual(z * gmpy2.mpz(2), Zi(12, 8))
+        self.assertEqual(Zi(3, gmpy2.mpz(4)), Zi(3, 4))
+        self.assertEqual(Qi(gmpy2.mpq(1, 2), gmpy2.mpz(3)), Qi(Fraction(1, 2), 3))
+        self.assertIs(type(Qi(gmpy2.mpq(1, 2), 0).real), Fraction)
+
+
+if __name__ == '__main__':
+    unittest.main()
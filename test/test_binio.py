@@ -0,0 +1,161 @@
+"""Unit tests for the streaming varint binary format (src/binio.py)."""
+
+import io
+import random
+import unittest
+from fractions import Fraction
+
+from src.binio import MAGIC, ZiReader, ZiWriter, _decode, _encode, dumps, loads
+from src.qi import Qi
+from src.zi import Zi
+
+
+def _zis(seed, n, bound):
+    rng = random.Random(seed)
+    return [Zi(rng.randint(-bound, bound), rng.randint(-bound, bound)) for _ in range(n)]
+
+
+def _qis(seed, n):
+    rng = random.Random(seed)
+    return [Qi(Fraction(rng.randint(-999, 999), rng.randint(1, 12)),
+               Fraction(rng.randint(-999, 999), rng.randint(1, 12)))
+            for _ in range(n)]
+
+
+# ----------------------------------------------------------------------
+# Varint encoding
+# ----------------------------------------------------------------------
+
+class TestVarints(unittest.TestCase):
+    def test_zigzag_byte_counts(self):
+        for n, size in ((0, 1), (-1, 1), (63, 1), (-64, 1), (64, 2), (-65, 2), (2 ** 61, 9), (2 ** 62, 10)):
+            out = bytearray()
+            _encode([n], out)
+            self.assertEqual(len(out), size, n)
+            self.assertEqual(_decode(out, 1), ([n], size))
+
+    def test_round_trip_any_size(self):
+        ints = [0, 1, -1, 2 ** 63, -2 ** 63 - 1, 10 ** 100, -10 ** 100] + list(range(-300, 300))
+        out = bytearray()
+        _encode(ints, out)
+        self.assertEqual(_decode(out, 1), (ints, len(out)))
+
+    def test_partial_record_left_unconsumed(self):
+        out = bytearray()
+        _encode([5, 300, 7, 10 ** 20], out)
+        whole = bytearray()
+        _encode([5, 300], whole)
+        for cut in range(len(whole), len(out)):
+            self.assertEqual(_decode(out[:cut], 2), ([5, 300], len(whole)))
+        self.assertEqual(_decode(out, 2), ([5, 300, 7, 10 ** 20], len(out)))
+
+
+# ----------------------------------------------------------------------
+# Streams
+# ----------------------------------------------------------------------
+
+class TestStreams(unittest.TestCase):
+    def test_zi_round_trip(self):
+        for bound in (10, 10 ** 9, 10 ** 40):
+            zs = _zis(bound, 500, bound)
+            self.assertEqual(loads(dumps(zs)), zs)
+
+    def test_header(self):
+        data = dumps([Zi(1, 2)])
+        self.assertTrue(data.startswith(MAGIC))
+        self.assertEqual(ZiReader(io.BytesIO(data)).kind, 'zi')
+
+    def test_small_components_are_compact(self):
+        zs = _zis(1, 1000, 60)
+        self.assertEqual(len(dumps(zs)), 11 + 2 * len(zs))
+
+    def test_qi_round_trip(self):
+        values = _qis(37, 500) + [Zi(3, -4), Qi(Fraction(10 ** 30, 7), 0)]
+        got = loads(dumps(values, 'qi'))
+        self.assertEqual(got, values)
+        self.assertEqual([type(v) for v in got], [type(v) for v in values])
+
+    def test_shared_denominator(self):
+        rng = random.Random(38)
+        values = [Qi(Fraction(rng.randint(-999, 999), 12), Fraction(rng.randint(-999, 999), 12))
+                  for _ in range(500)] + [Zi(5, 6)]
+        data = dumps(values, 'qi', denominator=12)
+        reader = ZiReader(io.BytesIO(data))
+        self.assertEqual((reader.kind, reader.denominator), ('qi', 12))
+        got = reader.read_all()
+        self.assertEqual(got, values)
+        self.assertIs(type(got[-1]), Zi)
+        self.assertLess(len(data), len(dumps(values, 'qi')))
+
+    def test_shared_denominator_must_divide(self):
+        w = ZiWriter(io.BytesIO(), 'qi', denominator=6)
+        w.write(Qi('1/3', '1/2'))
+        with self.assertRaises(ValueError):
+            w.write(Qi('1/4', 0))
+
+    def test_small_chunks(self):
+        values = _qis(39, 200) + [Zi(10 ** 50, -1)]
+        data = dumps(values, 'qi')
+        for chunk_size in (1, 2, 3, 7):
+            self.assertEqual(ZiReader(io.BytesIO(data), chunk_size).read_all(), values)
+        f = io.BytesIO()
+        with ZiWriter(f, 'qi', chunk_size=5) as w:
+            for v in values:
+                w.write(v)
+        self.assertEqual(f.getvalue(), data)
+        self.assertEqual(w.count, len(values))
+
+    def test_incremental_writes_and_reads_on_a_file(self):
+        zs = _zis(40, 20000, 10 ** 12)
+        f = io.BytesIO()
+        with ZiWriter(f) as w:
+            w.write_many(zs[:7000])
+            w.write_many(iter(zs[7000:]))
+        f.seek(0)
+        reader = ZiReader(f, chunk_size=4096)
+        chunks = list(reader.chunks())
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual([z for c in chunks for z in c], zs)
+
+    def test_failed_write_keeps_earlier_values(self):
+        f = io.BytesIO()
+        with ZiWriter(f) as w:
+            with self.assertRaises(TypeError):
+                w.write_many([Zi(1, 2), 3 + 4j, "nope", Zi(5, 6)])
+        self.assertEqual(loads(f.getvalue()), [Zi(1, 2), Zi(3, 4)])
+
+    def test_empty_stream(self):
+        self.assertEqual(loads(dumps([])), [])
+        self.assertEqual(loads(dumps([], 'qi', 5)), [])
+
+
+# ----------------------------------------------------------------------
+# Errors
+# ----------------------------------------------------------------------
+
+class TestErrors(unittest.TestCase):
+    def test_bad_header(self):
+        for data in (b'', b'ZIVAR', b'NOTVARIN\x01\x00\x00',
+                     MAGIC + b'\x02\x00\x00', MAGIC + b'\x01\x00\x09'):
+            with self.assertRaises(ValueError):
+                ZiReader(io.BytesIO(data))
+
+    def test_truncated_value(self):
+        data = dumps([Zi(10 ** 6, 10 ** 6)] * 3)
+        for cut in range(1, 6):
+            with self.assertRaises(ValueError):
+                loads(data[:-cut])
+
+    def test_bad_writer_arguments(self):
+        with self.assertRaises(ValueError):
+            ZiWriter(io.BytesIO(), 'zz')
+        with self.assertRaises(ValueError):
+            ZiWriter(io.BytesIO(), 'zi', denominator=5)
+        with self.assertRaises(ValueError):
+            ZiWriter(io.BytesIO(), 'qi', denominator=0)
+        with self.assertRaises(TypeError):
+            ZiWriter(io.BytesIO(), 'qi').write(1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
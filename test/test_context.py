@@ -0,0 +1,199 @@
+"""Unit tests for context-local Gaussian configuration (src.context)."""
+
+import asyncio
+import threading
+import unittest
+from fractions import Fraction
+
+from src import context
+from src.context import DefaultContext, GaussianContext, getcontext, localcontext, setcontext
+from src.qi import Qi
+
+
+class _ContextTest(unittest.TestCase):
+    def setUp(self):
+        # Every test runs against a fresh copy of the defaults.
+        self._saved = getcontext()
+        setcontext(DefaultContext.copy())
+
+    def tearDown(self):
+        setcontext(self._saved)
+
+
+# ----------------------------------------------------------------------
+# The context object
+# ----------------------------------------------------------------------
+
+class TestGaussianContext(_ContextTest):
+    def test_defaults(self):
+        ctx = getcontext()
+        self.assertEqual((ctx.max_denominator, ctx.unit_symbol), (1_000_000, 'j'))
+        self.assertEqual(GaussianContext(), DefaultContext)
+
+    def test_constructor_overrides(self):
+        ctx = GaussianContext(max_denominator=7)
+        self.assertEqual(ctx.max_denominator, 7)
+        self.assertEqual(ctx.unit_symbol, 'j')
+
+    def test_validation(self):
+        ctx = GaussianContext()
+        for name, bad in [('max_denominator', 0), ('max_denominator', 1.5),
+                          ('max_denominator', True), ('unit_symbol', 'k')]:
+            with self.assertRaises(ValueError, msg=name):
+                setattr(ctx, name, bad)
+        with self.assertRaises(AttributeError):
+            ctx.precision = 5
+        self.assertEqual(ctx, DefaultContext)
+
+    def test_copy_is_independent(self):
+        ctx = GaussianContext(unit_symbol='i')
+        other = ctx.copy()
+        other.unit_symbol = 'j'
+        self.assertEqual(ctx.unit_symbol, 'i')
+        self.assertNotEqual(ctx, other)
+
+    def test_replace(self):
+        ctx = GaussianContext(unit_symbol='i')
+        other = ctx.replace(max_denominator=9)
+        self.assertEqual((other.unit_symbol, other.max_denominator), ('i', 9))
+        self.assertEqual(ctx.max_denominator, 1_000_000)
+        with self.assertRaises(ValueError):
+            ctx.replace(unit_symbol='k')
+        with self.assertRaises(TypeError):
+            ctx.replace(cache=True)
+
+    def test_repr(self):
+        self.assertEqual(repr(GaussianContext()),
+                         "GaussianContext(max_denominator=1000000, unit_symbol='j')")
+
+    def test_setcontext_rejects_other_types(self):
+        with self.assertRaises(TypeError):
+            setcontext({'unit_symbol': 'i'})
+
+
+# ----------------------------------------------------------------------
+# localcontext
+# ----------------------------------------------------------------------
+
+class TestLocalContext(_ContextTest):
+    def test_settings_apply_inside_and_are_restored(self):
+        q = Qi('1/3', '-2/7')
+        with localcontext(unit_symbol='i', max_denominator=3) as ctx:
+            self.assertIs(getcontext(), ctx)
+            self.assertEqual(str(q), '(1/3-2/7i)')
+            self.assertEqual(q.limit_denominator(), Qi('1/3', '-1/3'))
+            self.assertEqual(Qi.get_max_denominator(), 3)
+        self.assertEqual(str(q), '(1/3-2/7j)')
+        self.assertEqual(Qi.get_max_denominator(), 1_000_000)
+
+    def test_nesting(self):
+        with localcontext(unit_symbol='i'):
+            with localcontext(max_denominator=10) as inner:
+                self.assertEqual((inner.unit_symbol, inner.max_denominator), ('i', 10))
+            self.assertEqual(getcontext().max_denominator, 1_000_000)
+            self.assertEqual(getcontext().unit_symbol, 'i')
+        self.assertEqual(getcontext().unit_symbol, 'j')
+
+    def test_restored_after_exception(self):
+        with self.assertRaises(KeyError):
+            with localcontext(unit_symbol='i'):
+                raise KeyError
+        self.assertEqual(getcontext().unit_symbol, 'j')
+
+    def test_changes_inside_do_not_leak(self):
+        outer = getcontext()
+        with localcontext() as ctx:
+            Qi.set_unit_symbol('i')
+            self.assertEqual(Qi.get_unit_symbol(), 'i')
+            self.assertEqual(ctx.unit_symbol, 'j')
+        self.assertIs(getcontext(), outer)
+        self.assertEqual(outer.unit_symbol, 'j')
+
+    def test_from_given_context(self):
+        base = GaussianContext(unit_symbol='i')
+        with localcontext(base, max_denominator=5) as ctx:
+            self.assertEqual((ctx.unit_symbol, ctx.max_denominator), ('i', 5))
+            self.assertIsNot(ctx, base)
+        self.assertEqual(base.max_denominator, 1_000_000)
+
+    def test_bad_settings(self):
+        with self.assertRaises(TypeError):
+            with localcontext(precision=3):
+                pass
+        with self.assertRaises(ValueError):
+            with localcontext(unit_symbol='x'):
+                pass
+        self.assertEqual(getcontext(), DefaultContext)
+
+
+# ----------------------------------------------------------------------
+# Isolation between threads and tasks
+# ----------------------------------------------------------------------
+
+class TestIsolation(_ContextTest):
+    def test_threads_have_their_own_context(self):
+        barrier = threading.Barrier(2)
+        seen = {}
+
+        def worker(symbol):
+            Qi.set_unit_symbol(symbol)
+            barrier.wait()  # both threads have now set their symbol
+            seen[symbol] = str(Qi('1/2', '1/3'))
+
+        threads = [threading.Thread(target=worker, args=(s,)) for s in 'ij']
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(seen, {'i': '(1/2+1/3i)', 'j': '(1/2+1/3j)'})
+        self.assertEqual(Qi.get_unit_symbol(), 'j')
+
+    def test_new_threads_start_from_default_context(self):
+        Qi.set_max_denominator(17)
+        result = []
+        t = threading.Thread(target=lambda: result.append(Qi.get_max_denominator()))
+        t.start()
+        t.join()
+        self.assertEqual(result, [1_000_000])
+
+    def test_asyncio_tasks_with_localcontext(self):
+        async def render(symbol, delay):
+            with localcontext(unit_symbol=symbol, max_denominator=4):
+                await asyncio.sleep(delay)
+                q = Qi(Fraction(2, 7), Fraction(-1, 3))
+                return str(q.limit_denominator()), str(q)
+
+        async def main():
+            return await asyncio.gather(render('i', 0.02), render('j', 0.01))
+
+        self.assertEqual(asyncio.run(main()), [('(1/4-1/3i)', '(2/7-1/3i)'),
+                                               ('(1/4-1/3j)', '(2/7-1/3j)')])
+        self.assertEqual(getcontext(), DefaultContext)
+
+    def test_setters_in_a_task_leave_siblings_and_parent_alone(self):
+        async def setter(changed):
+            Qi.set_unit_symbol('i')
+            Qi.set_max_denominator(3)
+            changed.set()
+            return str(Qi('1', '1/2')), Qi.get_max_denominator()
+
+        async def sibling(changed):
+            await changed.wait()
+            return str(Qi('1', '1/2')), Qi.get_max_denominator()
+
+        async def main():
+            getcontext()  # the tasks inherit this context object
+            changed = asyncio.Event()
+            results = await asyncio.gather(setter(changed), sibling(changed))
+            return results, str(Qi('1', '1/2')), Qi.get_max_denominator()
+
+        results, parent, max_denominator = asyncio.run(main())
+        self.assertEqual(results, [('(1+1/2i)', 3), ('(1+1/2j)', 1_000_000)])
+        self.assertEqual((parent, max_denominator), ('(1+1/2j)', 1_000_000))
+
+    def test_module_exports(self):
+        self.assertEqual(context.UNIT_SYMBOLS, ('i', 'j'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Unit tests for rational and Gaussian integer factorization."""
+
+import random
+import unittest
+from math import prod
+
+from src.factor import factor, factor_int, is_prime, sqrt_minus_one, two_squares
+from src.zi import Zi
+
+
+def _reassemble(unit, factors):
+    z = unit
+    for p, e in factors:
+        z *= p ** e
+    return z
+
+
+# ----------------------------------------------------------------------
+# Rational integers
+# ----------------------------------------------------------------------
+
+class TestRational(unittest.TestCase):
+    def test_is_prime_matches_trial_division(self):
+        def slow(n):
+            return n >= 2 and all(n % d for d in range(2, int(n ** 0.5) + 1))
+        for n in range(-5, 3000):
+            self.assertEqual(is_prime(n), slow(n), n)
+
+    def test_is_prime_large(self):
+        self.assertTrue(is_prime(2 ** 61 - 1))
+        self.assertTrue(is_prime(2 ** 127 - 1))
+        self.assertFalse(is_prime((2 ** 61 - 1) * (2 ** 31 - 1)))
+        # A strong pseudoprime to bases 2, 3, 5 and 7.
+        self.assertFalse(is_prime(3215031751))
+
+    def test_factor_int(self):
+        self.assertEqual(factor_int(1), {})
+        self.assertEqual(factor_int(-360), {2: 3, 3: 2, 5: 1})
+        self.assertEqual(factor_int(2 ** 64 + 1), {274177: 1, 67280421310721: 1})
+        rng = random.Random(41)
+        for _ in range(200):
+            n = rng.randint(1, 10 ** 15)
+            f = factor_int(n)
+            self.assertEqual(prod(p ** e for p, e in f.items()), n)
+            self.assertTrue(all(is_prime(p) for p in f))
+            self.assertEqual(list(f), sorted(f))
+
+    def test_factor_int_zero(self):
+        with self.assertRaises(ValueError):
+            factor_int(0)
+
+    def test_sqrt_minus_one(self):
+        for p in (5, 13, 17, 29, 1000000009):
+            k = sqrt_minus_one(p)
+            self.assertEqual(k * k % p, p - 1)
+        with self.assertRaises(ValueError):
+            sqrt_minus_one(7)
+
+    def test_two_squares(self):
+        for p in (5, 13, 17, 29, 37, 1000000009, 4611686018427387709):
+            a, b = two_squares(p)
+            self.assertEqual(a * a + b * b, p)
+            self.assertGreater(a, b)
+            self.assertGreater(b, 0)
+
+
+# ----------------------------------------------------------------------
+# Gaussian integers
+# ----------------------------------------------------------------------
+
+class TestGaussian(unittest.TestCase):
+    def test_small_known(self):
+        self.assertEqual(factor(Zi(2)), (Zi(0, -1), [(Zi(1, 1), 2)]))
+        self.assertEqual(factor(Zi(3)), (Zi(1), [(Zi(3), 1)]))
+        unit, fs = factor(Zi(5))
+        self.assertEqual(fs, [(Zi(1, 2), 1), (Zi(2, 1), 1)])
+        self.assertEqual(_reassemble(unit, fs), Zi(5))
+
+    def test_units(self):
+        for u in Zi.units():
+            self.assertEqual(factor(u), (u, []))
+
+    def test_round_trip_random(self):
+        rng = random.Random(41)
+        for _ in range(500):
+            z = Zi(rng.randint(-10 ** 6, 10 ** 6), rng.randint(-10 ** 6, 10 ** 6))
+            if not z:
+                continue
+            unit, fs = factor(z)
+            self.assertIn(unit, Zi.units())
+            self.assertEqual(_reassemble(unit, fs), z)
+            for p, e in fs:
+                self.assertGreater(e, 0)
+                self.assertTrue(Zi.is_gaussian_prime(p), p)
+                self.assertEqual(p.canonical()[0], p)
+            keys = [(p.norm(), p.real, p.imag) for p, _ in fs]
+            self.assertEqual(keys, sorted(keys))
+            self.assertEqual(len(set(keys)), len(keys))
+
+    def test_accepts_int(self):
+        self.assertEqual(factor(12), factor(Zi(12)))
+
+    def test_zero(self):
+        with self.assertRaises(ValueError):
+            factor(Zi(0))
+
+    def test_rejects_non_integers(self):
+        with self.assertRaises(TypeError):
+            factor('12')
+
+
+if __name__ == '__main__':
+    unittest.main()
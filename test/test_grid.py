@@ -0,0 +1,192 @@
+"""Unit tests for the lazy ZiGrid and ZiRange collections, and by_norm."""
+
+import itertools
+import unittest
+
+from src.grid import ZiGrid, ZiRange, by_norm
+from src.zi import Zi
+
+
+def _materialized(lower_left, upper_right, step=(1, 1)):
+    """The grid as a plain list, built the way the notebook prototype did."""
+    (x0, y0), (x1, y1), (sx, sy) = lower_left, upper_right, step
+    return [Zi(x, y)
+            for y in range(y0, y1 + (1 if sy > 0 else -1), sy)
+            for x in range(x0, x1 + (1 if sx > 0 else -1), sx)]
+
+
+# ----------------------------------------------------------------------
+# ZiGrid
+# ----------------------------------------------------------------------
+
+class TestZiGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = ZiGrid(Zi(1, 1), Zi(7, 7), (2, 2))
+        self.expected = _materialized(Zi(1, 1), Zi(7, 7), (2, 2))
+
+    def test_single_argument_starts_at_zero(self):
+        self.assertEqual(list(ZiGrid(Zi(1, 1))), [Zi(0, 0), Zi(1, 0), Zi(0, 1), Zi(1, 1)])
+
+    def test_iteration_matches_materialized_grid(self):
+        self.assertEqual(list(self.grid), self.expected)
+        self.assertEqual(len(self.grid), 16)
+        self.assertEqual(self.grid.shape, (4, 4))
+
+    def test_negative_steps(self):
+        g = ZiGrid(Zi(3, 2), Zi(-3, -2), (-3, -2))
+        self.assertEqual(list(g), _materialized(Zi(3, 2), Zi(-3, -2), (-3, -2)))
+
+    def test_empty_grid(self):
+        self.assertEqual(len(ZiGrid(Zi(5, 5), Zi(0, 0))), 0)
+
+    def test_zero_step_raises(self):
+        with self.assertRaises(ValueError):
+            ZiGrid(Zi(0, 0), Zi(5, 5), (0, 1))
+
+    def test_indexing(self):
+        for k in range(-16, 16):
+            self.assertEqual(self.grid[k], self.expected[k])
+        with self.assertRaises(IndexError):
+            self.grid[16]
+
+    def test_slices_are_lazy_grids(self):
+        for s in (slice(2, 9, 3), slice(None, None, -1), slice(-5, None), slice(3, 3)):
+            view = self.grid[s]
+            self.assertIsInstance(view, ZiGrid)
+            self.assertEqual(list(view), self.expected[s])
+            self.assertEqual(list(view[::2]), self.expected[s][::2])
+
+    def test_huge_grid_is_constant_time(self):
+        n = 10 ** 9
+        g = ZiGrid(Zi(-n, -n), Zi(n, n))
+        self.assertEqual(len(g), (2 * n + 1) ** 2)
+        self.assertEqual(g[-1], Zi(n, n))
+        self.assertIn(Zi(12345, -678), g)
+        self.assertEqual(g[g.index(Zi(12345, -678))], Zi(12345, -678))
+
+    def test_containment(self):
+        for z in self.expected:
+            self.assertIn(z, self.grid)
+        self.assertNotIn(Zi(2, 1), self.grid)
+        self.assertNotIn(Zi(9, 1), self.grid)
+        self.assertNotIn("nope", self.grid)
+        view = self.grid[2:9:3]
+        for z in self.expected:
+            self.assertEqual(z in view, z in self.expected[2:9:3])
+
+    def test_index_and_count(self):
+        view = self.grid[::-1]
+        self.assertEqual(view.index(Zi(1, 1)), 15)
+        self.assertEqual(view.count(Zi(1, 1)), 1)
+        with self.assertRaises(ValueError):
+            view.index(Zi(2, 2))
+
+    def test_reversed(self):
+        self.assertEqual(list(reversed(self.grid)), self.expected[::-1])
+
+    def test_rows(self):
+        rows = ZiGrid(Zi(6, 6)).rows()
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[2][5], Zi(5, 2))
+
+    def test_to_ziarray(self):
+        for layout in ('interleaved', 'split'):
+            self.assertEqual(self.grid.to_ziarray(layout).tolist(), self.expected)
+            self.assertEqual(self.grid[7:1:-2].to_ziarray(layout).tolist(), self.expected[7:1:-2])
+
+
+# ----------------------------------------------------------------------
+# ZiRange
+# ----------------------------------------------------------------------
+
+class TestZiRange(unittest.TestCase):
+    def test_diagonal(self):
+        self.assertEqual(list(ZiRange(0, 5 + 5j, 2 + 2j)), [Zi(0, 0), Zi(2, 2), Zi(4, 4)])
+
+    def test_single_argument(self):
+        self.assertEqual(list(ZiRange(3)), [Zi(0), Zi(1), Zi(2)])
+
+    def test_stop_not_reached_exactly(self):
+        r = ZiRange(Zi(1, 2), Zi(1, -10), -3j)
+        self.assertEqual(list(r), [Zi(1, 2), Zi(1, -1), Zi(1, -4), Zi(1, -7)])
+
+    def test_empty_when_stop_behind_start(self):
+        self.assertEqual(len(ZiRange(5, 0, 1)), 0)
+
+    def test_stop_off_the_line_raises(self):
+        with self.assertRaises(ValueError):
+            ZiRange(0, 5 + 4j, 1 + 1j)
+
+    def test_zero_step_raises(self):
+        with self.assertRaises(ValueError):
+            ZiRange(0, 5, 0)
+
+    def test_indexing_and_slicing(self):
+        r = ZiRange(Zi(1, 1), Zi(1, 1) + 20 * Zi(2, -1), Zi(2, -1))
+        expected = [Zi(1, 1) + k * Zi(2, -1) for k in range(20)]
+        self.assertEqual(len(r), 20)
+        self.assertEqual(r[7], expected[7])
+        self.assertEqual(r[-1], expected[-1])
+        for s in (slice(3, 15, 4), slice(None, None, -3), slice(5, 2)):
+            self.assertIsInstance(r[s], ZiRange)
+            self.assertEqual(list(r[s]), expected[s])
+
+    def test_containment_and_index(self):
+        r = ZiRange(0, 10 + 10j, 1 + 1j)[::3]
+        self.assertIn(Zi(6, 6), r)
+        self.assertNotIn(Zi(5, 5), r)
+        self.assertNotIn(Zi(6, 5), r)
+        self.assertEqual(r.index(Zi(9, 9)), 3)
+
+    def test_equality(self):
+        self.assertEqual(ZiRange(0, 6, 2), ZiRange(0, 5, 2))
+        self.assertNotEqual(ZiRange(0, 6, 2), ZiRange(0, 6, 3))
+
+    def test_to_ziarray(self):
+        for r in (ZiRange(Zi(3, -2), Zi(3, 30), 4j), ZiRange(0, 12 - 6j, 2 - 1j)[::-2]):
+            for layout in ('interleaved', 'split'):
+                self.assertEqual(r.to_ziarray(layout).tolist(), list(r))
+
+
+# ----------------------------------------------------------------------
+# by_norm: enumeration in nondecreasing norm
+# ----------------------------------------------------------------------
+
+class TestByNorm(unittest.TestCase):
+    def test_matches_brute_force_disc(self):
+        max_norm = 200
+        brute = {Zi(a, b) for a in range(-15, 16) for b in range(-15, 16)
+                 if a * a + b * b <= max_norm}
+        got = list(by_norm(max_norm))
+        self.assertEqual(len(got), len(brute))
+        self.assertEqual(set(got), brute)
+
+    def test_norms_nondecreasing(self):
+        norms = [z.norm() for z in by_norm(500)]
+        self.assertEqual(norms, sorted(norms))
+
+    def test_starts_with_zero_then_units(self):
+        first = list(itertools.islice(by_norm(), 5))
+        self.assertEqual(first[0], Zi(0, 0))
+        self.assertEqual(set(first[1:]), set(Zi.units()))
+
+    def test_unbounded(self):
+        self.assertEqual(len(list(itertools.islice(by_norm(), 10000))), 10000)
+
+    def test_up_to_units_one_per_class(self):
+        reps = list(by_norm(300, up_to_units=True))
+        self.assertEqual(reps[0], Zi(0, 0))
+        for z in reps[1:]:
+            self.assertTrue(z.real > 0 and z.imag >= 0)
+        everything = list(by_norm(300))
+        self.assertEqual(4 * (len(reps) - 1) + 1, len(everything))
+        classes = {frozenset(u * z for u in Zi.units()) for z in everything[1:]}
+        self.assertEqual(len(classes), len(reps) - 1)
+
+    def test_negative_max_norm_is_empty(self):
+        self.assertEqual(list(by_norm(-1)), [])
+        self.assertEqual(list(by_norm(0)), [Zi(0, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,208 @@
+"""Unit tests for the ZiMatrix (Gaussian integer matrix) class."""
+
+import random
+import unittest
+from fractions import Fraction
+from itertools import permutations
+
+from src import matrix
+from src.matrix import ZiMatrix
+from src.zi import Zi
+
+
+def _random_matrix(rng, n, m, bound=20):
+    return ZiMatrix([[Zi(rng.randint(-bound, bound), rng.randint(-bound, bound))
+                      for _ in range(m)] for _ in range(n)])
+
+
+def _naive_matmul(a, b):
+    n, k = a.shape
+    m = b.shape[1]
+    return ZiMatrix([[sum((a[i, t] * b[t, j] for t in range(k)), Zi(0)) for j in range(m)]
+                     for i in range(n)])
+
+
+def _leibniz_det(a):
+    n = a.shape[0]
+    total = Zi(0)
+    for perm in permutations(range(n)):
+        inversions = sum(perm[i] > perm[j] for i in range(n) for j in range(i + 1, n))
+        term = Zi(-1 if inversions & 1 else 1)
+        for i, j in enumerate(perm):
+            term = term * a[i, j]
+        total = total + term
+    return total
+
+
+def _rank_over_fractions(a):
+    """The rank by elimination over Q(i), with components as Fractions."""
+    rows = [[(Fraction(z.real), Fraction(z.imag)) for z in row] for row in a]
+    rank, ncols = 0, a.shape[1]
+    for c in range(ncols):
+        p = next((i for i in range(rank, len(rows)) if rows[i][c] != (0, 0)), None)
+        if p is None:
+            continue
+        rows[rank], rows[p] = rows[p], rows[rank]
+        pr, pi = rows[rank][c]
+        n = pr * pr + pi * pi
+        inv = (pr / n, -pi / n)
+        for i in range(rank + 1, len(rows)):
+            fr, fi = rows[i][c]
+            qr, qi = fr * inv[0] - fi * inv[1], fr * inv[1] + fi * inv[0]
+            rows[i] = [(x - (qr * y - qi * w), v - (qr * w + qi * y))
+                       for (x, v), (y, w) in zip(rows[i], rows[rank])]
+        rank += 1
+    return rank
+
+
+# ----------------------------------------------------------------------
+# Construction and access
+# ----------------------------------------------------------------------
+
+class TestBasics(unittest.TestCase):
+    def test_construction(self):
+        a = ZiMatrix([[1, 2j], [Zi(3, 4), 5]])
+        self.assertEqual(a.shape, (2, 2))
+        self.assertEqual(a[0, 1], Zi(0, 2))
+        self.assertEqual(a[1], (Zi(3, 4), Zi(5)))
+        self.assertEqual(a.tolist(), [[Zi(1), Zi(0, 2)], [Zi(3, 4), Zi(5)]])
+        self.assertEqual(list(a), [a[0], a[1]])
+        self.assertEqual(len(a), 2)
+
+    def test_ragged_rows_rejected(self):
+        with self.assertRaises(ValueError):
+            ZiMatrix([[1, 2], [3]])
+
+    def test_zeros_and_identity(self):
+        self.assertEqual(ZiMatrix.zeros(2, 3), ZiMatrix([[0, 0, 0], [0, 0, 0]]))
+        self.assertEqual(ZiMatrix.identity(2), ZiMatrix([[1, 0], [0, 1]]))
+        self.assertEqual(ZiMatrix().shape, (0, 0))
+
+    def test_equality_and_hash(self):
+        a, b = ZiMatrix([[1, 2]]), ZiMatrix([[Zi(1), Zi(2)]])
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertNotEqual(a, a.T)
+        self.assertEqual(len({a, b, a.T}), 2)
+
+    def test_repr_round_trips(self):
+        a = ZiMatrix([[Zi(1, -1), 2], [0, Zi(0, 3)]])
+        self.assertEqual(eval(repr(a)), a)
+
+
+# ----------------------------------------------------------------------
+# Arithmetic
+# ----------------------------------------------------------------------
+
+class TestArithmetic(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(50)
+
+    def test_elementwise(self):
+        a, b = _random_matrix(self.rng, 3, 4), _random_matrix(self.rng, 3, 4)
+        self.assertEqual((a + b)[2, 3], a[2, 3] + b[2, 3])
+        self.assertEqual((a - b)[1, 0], a[1, 0] - b[1, 0])
+        self.assertEqual(-a + a, ZiMatrix.zeros(3, 4))
+        self.assertEqual((Zi(0, 1) * a)[0, 2], Zi(0, 1) * a[0, 2])
+        self.assertEqual(a * 2, a + a)
+        with self.assertRaises(ValueError):
+            a + a.T
+
+    def test_transpose(self):
+        a = _random_matrix(self.rng, 2, 5)
+        self.assertEqual(a.T.shape, (5, 2))
+        self.assertEqual(a.T[4, 1], a[1, 4])
+        self.assertEqual(a.T.T, a)
+
+    def test_transpose_of_empty_shapes(self):
+        for n, m in [(0, 5), (5, 0), (0, 0)]:
+            a = ZiMatrix.zeros(n, m)
+            self.assertEqual(a.T.shape, (m, n))
+            self.assertEqual(a.T.T, a)
+
+    def test_matmul(self):
+        for n, k, m in [(1, 1, 1), (2, 3, 4), (5, 1, 3), (7, 7, 7)]:
+            a, b = _random_matrix(self.rng, n, k), _random_matrix(self.rng, k, m)
+            self.assertEqual(a @ b, _naive_matmul(a, b))
+        self.assertEqual(ZiMatrix.zeros(2, 0) @ ZiMatrix.zeros(0, 3), ZiMatrix.zeros(2, 3))
+        with self.assertRaises(ValueError):
+            ZiMatrix.zeros(2, 3) @ ZiMatrix.zeros(2, 3)
+
+    def test_strassen_matches_classical(self):
+        old = matrix.STRASSEN_THRESHOLD
+        matrix.STRASSEN_THRESHOLD = 2
+        try:
+            for n, k, m in [(4, 4, 4), (7, 5, 9), (16, 16, 16), (3, 11, 6)]:
+                a = _random_matrix(self.rng, n, k, bound=10 ** 20)
+                b = _random_matrix(self.rng, k, m, bound=10 ** 20)
+                self.assertEqual(a @ b, _naive_matmul(a, b), msg=(n, k, m))
+        finally:
+            matrix.STRASSEN_THRESHOLD = old
+
+    def test_identity_is_neutral(self):
+        a = _random_matrix(self.rng, 4, 6)
+        self.assertEqual(ZiMatrix.identity(4) @ a, a)
+        self.assertEqual(a @ ZiMatrix.identity(6), a)
+
+
+# ----------------------------------------------------------------------
+# Determinant and rank
+# ----------------------------------------------------------------------
+
+class TestElimination(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(500)
+
+    def test_det_matches_leibniz(self):
+        for n in range(1, 6):
+            a = _random_matrix(self.rng, n, n)
+            self.assertEqual(a.det(), _leibniz_det(a), msg=n)
+
+    def test_det_needs_pivoting(self):
+        a = ZiMatrix([[0, 1, 0], [1, 0, 0], [0, 0, Zi(2, 1)]])
+        self.assertEqual(a.det(), Zi(-2, -1))
+        b = ZiMatrix([[0, 0, 1], [0, Zi(0, 1), 3], [5, 2, 7]])
+        self.assertEqual(b.det(), _leibniz_det(b))
+
+    def test_det_special_cases(self):
+        self.assertEqual(ZiMatrix().det(), Zi(1))
+        self.assertEqual(ZiMatrix([[Zi(3, -2)]]).det(), Zi(3, -2))
+        self.assertEqual(ZiMatrix([[1, 2], [2, 4]]).det(), Zi(0))
+        with self.assertRaises(ValueError):
+            ZiMatrix.zeros(2, 3).det()
+
+    def test_det_is_multiplicative(self):
+        a, b = _random_matrix(self.rng, 8, 8), _random_matrix(self.rng, 8, 8)
+        self.assertEqual((a @ b).det(), a.det() * b.det())
+        self.assertEqual(a.T.det(), a.det())
+
+    def test_det_large_entries(self):
+        a = _random_matrix(self.rng, 5, 5, bound=10 ** 30)
+        self.assertEqual(a.det(), _leibniz_det(a))
+
+    def test_det_does_not_modify(self):
+        a = _random_matrix(self.rng, 4, 4)
+        before = a.tolist()
+        a.det()
+        a.rank()
+        self.assertEqual(a.tolist(), before)
+
+    def test_rank(self):
+        self.assertEqual(ZiMatrix.identity(4).rank(), 4)
+        self.assertEqual(ZiMatrix.zeros(3, 5).rank(), 0)
+        self.assertEqual(ZiMatrix().rank(), 0)
+        u = _random_matrix(self.rng, 6, 2)
+        v = _random_matrix(self.rng, 2, 7)
+        self.assertEqual((u @ v).rank(), 2)
+        for n, m in [(3, 5), (5, 3), (6, 6)]:
+            a = _random_matrix(self.rng, n, m, bound=2)
+            self.assertEqual(a.rank(), _rank_over_fractions(a), msg=(n, m))
+
+    def test_rank_with_dependent_columns(self):
+        # The zero first column and the repeated column are both skipped.
+        a = ZiMatrix([[0, 1, 1, Zi(0, 1)], [0, 2, 2, 5], [0, 3, 3, Zi(2, 1)]])
+        self.assertEqual(a.rank(), _rank_over_fractions(a))
+
+
+if __name__ == '__main__':
+    unittest.main()
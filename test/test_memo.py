@@ -0,0 +1,123 @@
+"""Unit tests for the ZiMemo gcd/xgcd/mod_inverse cache."""
+
+import random
+import threading
+import unittest
+
+from src.memo import MemoStats, ZiMemo
+from src.zi import Zi
+
+
+def _random_pairs(seed, n, bound=300):
+    rng = random.Random(seed)
+    return [(Zi(rng.randint(-bound, bound), rng.randint(-bound, bound)),
+             Zi(rng.randint(-bound, bound), rng.randint(-bound, bound)))
+            for _ in range(n)]
+
+
+# ----------------------------------------------------------------------
+# Results match the uncached functions exactly
+# ----------------------------------------------------------------------
+
+class TestResults(unittest.TestCase):
+    def test_gcd_and_xgcd_match_exactly(self):
+        memo = ZiMemo(maxsize=64)
+        pairs = _random_pairs(34, 300)
+        for a, b in pairs + pairs:
+            self.assertEqual(memo.gcd(a, b), Zi.gcd(a, b))
+            self.assertEqual(memo.xgcd(a, b), Zi.xgcd(a, b))
+
+    def test_associates_share_an_entry_with_unit_adjusted(self):
+        memo = ZiMemo()
+        a, b = Zi(12, -5), Zi(3, 8)
+        for u in Zi.units():
+            self.assertEqual(memo.gcd(u * a, u * b), Zi.gcd(u * a, u * b))
+            self.assertEqual(memo.xgcd(u * a, u * b), Zi.xgcd(u * a, u * b))
+        self.assertEqual(memo.stats().misses, 2)
+        self.assertEqual(memo.stats().hits, 6)
+
+    def test_zero_operands(self):
+        memo = ZiMemo()
+        for a, b in ((0, 0), (0, Zi(3, -4)), (Zi(-3, 4), 0)):
+            self.assertEqual(memo.gcd(a, b), Zi.gcd(a, b))
+            self.assertEqual(memo.xgcd(a, b), Zi.xgcd(a, b))
+
+    def test_mod_inverse(self):
+        memo = ZiMemo()
+        m = Zi(7, 12)
+        for a, _ in _random_pairs(35, 200):
+            if a % m == Zi(0, 0):
+                with self.assertRaises(ValueError):
+                    memo.mod_inverse(a, m)
+                continue
+            self.assertEqual(memo.mod_inverse(a, m), Zi.mod_inverse(a, m))
+        with self.assertRaises(ZeroDivisionError):
+            memo.mod_inverse(Zi(1, 1), 0)
+
+
+# ----------------------------------------------------------------------
+# Bounds and statistics
+# ----------------------------------------------------------------------
+
+class TestStats(unittest.TestCase):
+    def test_lru_eviction(self):
+        memo = ZiMemo(maxsize=2)
+        a, b, c = Zi(5, 1), Zi(7, 2), Zi(9, 4)
+        memo.gcd(a, 3)
+        memo.gcd(b, 3)
+        memo.gcd(a, 3)      # refreshes a
+        memo.gcd(c, 3)      # evicts b
+        memo.gcd(a, 3)
+        self.assertEqual(memo.stats(), MemoStats(hits=2, misses=3, evictions=1, size=2, maxsize=2))
+        memo.gcd(b, 3)
+        self.assertEqual(memo.stats().misses, 4)
+
+    def test_clear(self):
+        memo = ZiMemo(maxsize=8)
+        memo.xgcd(Zi(5, 1), Zi(2, 3))
+        memo.clear()
+        self.assertEqual(memo.stats(), MemoStats(0, 0, 0, 0, 8))
+        self.assertEqual(len(memo), 0)
+
+    def test_unbounded(self):
+        memo = ZiMemo(maxsize=None)
+        for a, b in _random_pairs(36, 500):
+            memo.gcd(a, b)
+        self.assertEqual(memo.stats().evictions, 0)
+
+    def test_bad_maxsize_raises(self):
+        for bad in (0, -3, 2.5):
+            with self.assertRaises(ValueError):
+                ZiMemo(maxsize=bad)
+
+
+# ----------------------------------------------------------------------
+# Sharing between threads
+# ----------------------------------------------------------------------
+
+class TestThreads(unittest.TestCase):
+    def test_concurrent_use(self):
+        memo = ZiMemo(maxsize=32)
+        pairs = _random_pairs(37, 100)
+        expected = [Zi.xgcd(a, b) for a, b in pairs]
+        errors = []
+
+        def worker():
+            for _ in range(5):
+                for (a, b), want in zip(pairs, expected):
+                    if memo.xgcd(a, b) != want:
+                        errors.append((a, b))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        stats = memo.stats()
+        self.assertEqual(stats.hits + stats.misses, 8 * 5 * len(pairs))
+        self.assertLessEqual(stats.size, 32)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Unit tests for batch modular inversion (src.modular)."""
+
+import random
+import unittest
+from unittest import mock
+
+from src.modular import batch_inverse
+from src.zi import Zi
+
+
+def _random_zi(rng, bound=10 ** 6):
+    return Zi(rng.randint(-bound, bound), rng.randint(-bound, bound))
+
+
+def _inverse_or_none(a, m):
+    try:
+        return Zi.mod_inverse(a, m)
+    except ValueError:
+        return None
+
+
+class TestBatchInverse(unittest.TestCase):
+    def _check(self, values, m):
+        result = batch_inverse(values, m)
+        self.assertEqual(len(result), len(values))
+        for a, x in zip(values, result):
+            expected = _inverse_or_none(a, m)
+            if expected is None:
+                self.assertIsNone(x, msg=a)
+            else:
+                self.assertEqual((x - expected) % m, 0, msg=a)
+                self.assertEqual((Zi._require_zi(a) * x - 1) % m, 0, msg=a)
+                self.assertLessEqual(x.norm(), m.norm() // 2, msg=a)
+        return result
+
+    def test_prime_modulus(self):
+        rng = random.Random(48)
+        m = Zi(848494, 529205)      # norm 1000000000061, a prime
+        values = [_random_zi(rng) for _ in range(300)]
+        self.assertNotIn(None, self._check(values, m))
+
+    def test_composite_modulus_reports_non_invertible(self):
+        rng = random.Random(480)
+        m = Zi(3, 2) * Zi(7) * Zi(1, 1)
+        values = [_random_zi(rng) for _ in range(200)]
+        result = self._check(values, m)
+        self.assertIn(None, result)
+        self.assertGreater(sum(x is not None for x in result), 50)
+
+    def test_zero_and_multiples_of_the_modulus(self):
+        m = Zi(5, 2)
+        self.assertEqual(self._check([0, m, Zi(1), m * Zi(3, 1), Zi(2)], m)[:4:2],
+                         [None, Zi(1)])
+
+    def test_small_inputs(self):
+        self.assertEqual(batch_inverse([], Zi(7)), [])
+        self.assertEqual(batch_inverse([3], 7), [Zi.mod_inverse(3, 7)])
+        self.assertEqual(batch_inverse([Zi(2, 1)], Zi(5)), [None])
+        self._check([Zi(2), Zi(0, 1), 4], Zi(11, 4))
+
+    def test_unit_modulus(self):
+        self.assertEqual(batch_inverse([Zi(3, 4), 0], Zi(0, 1)), [Zi(0), Zi(0)])
+
+    def test_zero_modulus(self):
+        with self.assertRaises(ZeroDivisionError):
+            batch_inverse([Zi(1)], 0)
+
+    def test_large_components(self):
+        rng = random.Random(4800)
+        m = Zi(2 ** 127 - 1)
+        self._check([_random_zi(rng, 10 ** 50) for _ in range(50)], m)
+
+    def test_one_xgcd_when_all_invertible(self):
+        rng = random.Random(48)
+        values = [_random_zi(rng) for _ in range(100)]
+        with mock.patch.object(Zi, 'xgcd', wraps=Zi.xgcd) as xgcd:
+            batch_inverse(values, Zi(848494, 529205))
+        self.assertEqual(xgcd.call_count, 1)
+
+    def test_few_xgcds_with_one_bad_value(self):
+        rng = random.Random(48)
+        m = Zi(848494, 529205)
+        values = [_random_zi(rng) for _ in range(1024)]
+        values[300] = m * 5
+        with mock.patch.object(Zi, 'xgcd', wraps=Zi.xgcd) as xgcd:
+            result = batch_inverse(values, m)
+        self.assertIsNone(result[300])
+        self.assertEqual(result.count(None), 1)
+        self.assertLessEqual(xgcd.call_count, 2 * 10 + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""Unit tests for simultaneous multi-exponentiation (src.multiexp)."""
+
+import random
+import unittest
+from functools import reduce
+from operator import mul
+
+from src.multiexp import METHODS, multi_pow, plan
+from src.zi import Zi
+
+M = Zi(848494, 529205)          # a Gaussian prime of norm 10^12 + 61
+
+
+def _random_case(seed, k, bits, bound=10 ** 4):
+    rng = random.Random(seed)
+    bases = [Zi(rng.randint(-bound, bound), rng.randint(-bound, bound)) for _ in range(k)]
+    exponents = [rng.getrandbits(bits) for _ in range(k)]
+    return bases, exponents
+
+
+def _naive(bases, exponents, m=None):
+    if m is None:
+        return reduce(mul, (b ** e for b, e in zip(bases, exponents)), Zi(1))
+    out = Zi(1)
+    for b, e in zip(bases, exponents):
+        p = Zi(1)
+        for _ in range(e):
+            p = p * b % m
+        out = out * p % m
+    return out
+
+
+def _modpow(b, e, m):
+    """b ** e mod m by square-and-multiply, for the reference results."""
+    result, b = Zi(1), b % m
+    while e:
+        if e & 1:
+            result = result * b % m
+        b = b * b % m
+        e >>= 1
+    return result
+
+
+# ----------------------------------------------------------------------
+# Exact products
+# ----------------------------------------------------------------------
+
+class TestExact(unittest.TestCase):
+    def test_both_methods(self):
+        for k, bits in [(1, 10), (3, 9), (20, 8), (50, 5)]:
+            bases, exponents = _random_case(49 + k, k, bits, bound=50)
+            expected = _naive(bases, exponents)
+            for method in METHODS + (None,):
+                self.assertEqual(multi_pow(bases, exponents, method=method), expected,
+                                 msg=(k, bits, method))
+
+    def test_zero_and_small_exponents(self):
+        bases = [Zi(2, 1), Zi(0, 0), Zi(3, -1)]
+        for method in METHODS:
+            self.assertEqual(multi_pow(bases, [0, 0, 0], method=method), Zi(1))
+            self.assertEqual(multi_pow(bases, [1, 0, 2], method=method), Zi(2, 1) * Zi(3, -1) ** 2)
+            self.assertEqual(multi_pow(bases, [1, 3, 1], method=method), Zi(0))
+        self.assertEqual(multi_pow([], []), Zi(1))
+
+    def test_other_number_types(self):
+        self.assertEqual(multi_pow([2, 3j], [5, 2]), Zi(-288))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            multi_pow([Zi(2)], [1, 2])
+        with self.assertRaises(ValueError):
+            multi_pow([Zi(2)], [-1])
+        with self.assertRaises(TypeError):
+            multi_pow([Zi(2)], [1.5])
+        with self.assertRaises(ValueError):
+            multi_pow([Zi(2)], [1], method='binary')
+        with self.assertRaises(ZeroDivisionError):
+            multi_pow([Zi(2)], [1], mod=0)
+
+
+# ----------------------------------------------------------------------
+# Modular products
+# ----------------------------------------------------------------------
+
+class TestModular(unittest.TestCase):
+    def _check(self, result, expected, m):
+        self.assertEqual((result - expected) % m, 0)
+        self.assertLessEqual(result.norm(), m.norm() // 2)
+
+    def test_matches_separate_powers(self):
+        for k in (1, 4, 300):
+            bases, exponents = _random_case(490 + k, k, 128)
+            expected = reduce(lambda a, b: a * b % M,
+                              (_modpow(b, e, M) for b, e in zip(bases, exponents)), Zi(1))
+            for method in METHODS + (None,):
+                self._check(multi_pow(bases, exponents, mod=M, method=method), expected, M)
+
+    def test_small_exponents_against_repeated_multiplication(self):
+        bases, exponents = _random_case(4900, 30, 6)
+        m = Zi(101, 6)
+        for method in METHODS:
+            self._check(multi_pow(bases, exponents, mod=m, method=method),
+                        _naive(bases, exponents, m), m)
+
+    def test_negative_exponents(self):
+        b, c = Zi(5, 3), Zi(2, -7)
+        result = multi_pow([b, c], [-3, 2], mod=M)
+        self.assertEqual((result * b ** 3 - c ** 2) % M, 0)
+        self._check(multi_pow([b, b], [-4, 4], mod=M), Zi(1), M)
+
+    def test_non_invertible_base(self):
+        with self.assertRaises(ValueError):
+            multi_pow([Zi(2), M * 3], [1, -1], mod=M)
+
+    def test_unit_modulus(self):
+        self.assertEqual(multi_pow([Zi(3, 4)], [5], mod=Zi(0, 1)), Zi(0))
+
+
+# ----------------------------------------------------------------------
+# Method choice
+# ----------------------------------------------------------------------
+
+class TestPlan(unittest.TestCase):
+    def test_few_bases_use_straus(self):
+        self.assertEqual(plan(2, 256)[0], 'straus')
+        self.assertEqual(plan(8, 128)[0], 'straus')
+
+    def test_many_bases_use_pippenger(self):
+        self.assertEqual(plan(500, 256)[0], 'pippenger')
+        self.assertEqual(plan(10_000, 64)[0], 'pippenger')
+
+    def test_beats_separate_powers(self):
+        # Separate square-and-multiply costs about 1.5 * bits per base.
+        for k in (2, 10, 100, 1000):
+            self.assertLess(plan(k, 256)[2], 1.5 * 256 * k)
+
+
+if __name__ == '__main__':
+    unittest.main()
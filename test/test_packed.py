@@ -0,0 +1,64 @@
+"""Unit tests for PackedList, the packed pickling of Zi/Qi lists."""
+
+import copy
+import pickle
+import random
+import unittest
+from fractions import Fraction
+
+from src.packed import PackedList, dumps, loads
+from src.qi import Qi
+from src.zi import Zi
+
+
+def _zis(seed, n, bound):
+    rng = random.Random(seed)
+    return [Zi(rng.randint(-bound, bound), rng.randint(-bound, bound)) for _ in range(n)]
+
+
+class TestPackedList(unittest.TestCase):
+    def test_zi_round_trip_at_every_width(self):
+        for bound in (100, 30_000, 2 * 10 ** 9, 2 ** 63 - 1, 10 ** 40):
+            zs = _zis(bound, 300, bound)
+            got = loads(dumps(zs))
+            self.assertIsInstance(got, PackedList)
+            self.assertEqual(got, zs)
+            self.assertTrue(all(type(z) is Zi for z in got))
+
+    def test_mixed_qi_and_zi(self):
+        rng = random.Random(36)
+        values = [Qi(Fraction(rng.randint(-99, 99), rng.randint(1, 9)), rng.randint(-9, 9))
+                  for _ in range(300)] + [Zi(10 ** 25, -1), Qi('1/3', 0)]
+        got = loads(dumps(values))
+        self.assertEqual(got, values)
+        self.assertEqual([type(v) for v in got], [type(v) for v in values])
+
+    def test_empty(self):
+        self.assertEqual(loads(dumps([])), [])
+
+    def test_smaller_than_plain_pickle(self):
+        zs = _zis(1, 1000, 1000)
+        self.assertLess(len(dumps(zs)), len(pickle.dumps(zs, pickle.HIGHEST_PROTOCOL)) / 2)
+
+    def test_every_protocol(self):
+        zs = PackedList(_zis(2, 50, 10 ** 6))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(pickle.loads(pickle.dumps(zs, protocol)), zs)
+
+    def test_nested_in_other_containers(self):
+        payload = {'values': PackedList(_zis(3, 20, 50)), 'tag': 'x'}
+        self.assertEqual(pickle.loads(pickle.dumps(payload)), payload)
+
+    def test_is_a_list(self):
+        zs = PackedList(_zis(4, 5, 9))
+        zs.append(Zi(1, 1))
+        self.assertEqual(len(zs), 6)
+        self.assertIsInstance(copy.copy(zs), PackedList)
+
+    def test_rejects_other_types(self):
+        with self.assertRaises(TypeError):
+            dumps([Zi(1, 2), 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 """Unit tests for the Qi (Gaussian rational) class."""
 
+import copy
+import pickle
 import random
 import unittest
 from fractions import Fraction
@@ -233,6 +235,25 @@ class TestProtocols(unittest.TestCase):
         s = {Qi('1/2', '1/3'), Qi('1/2', '1/3'), Qi('1/2', '2/3')}
         self.assertEqual(len(s), 2)
 
+    def test_hash_and_norm_are_cached(self):
+        q = Qi('1/2', '-1/3')
+        self.assertEqual(hash(q), hash((Fraction(1, 2), Fraction(-1, 3))))
+        self.assertEqual(q._hash, hash(q))
+        self.assertEqual(q.norm(), Fraction(13, 36))
+        self.assertEqual(q._norm, Fraction(13, 36))
+        self.assertEqual(hash(q), hash(Qi('1/2', '-1/3')))
+
+    def test_pickle_round_trip(self):
+        for q in (Qi('1/2', '-1/3'), Qi(Fraction(10 ** 30, 7), -5)):
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                self.assertEqual(pickle.loads(pickle.dumps(q, protocol)), q)
+        self.assertNotIn(b'Fraction', pickle.dumps(Qi('1/2', '-1/3')))
+
+    def test_copy_returns_self(self):
+        q = Qi('1/2', '-1/3')
+        self.assertIs(copy.copy(q), q)
+        self.assertIs(copy.deepcopy({'q': q})['q'], q)
+
 
 # ----------------------------------------------------------------------
 # Equality
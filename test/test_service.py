@@ -0,0 +1,245 @@
+"""Unit tests for the asyncio JSON-lines compute service."""
+
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from src.batch import ZiPool
+from src.service import DeadlineExceeded, ServiceError, ZiClient, ZiServer
+from src.zi import Zi
+
+
+class _SlowPool:
+    """A stand-in for ZiPool that computes in-process after a delay, and
+    records the batches it is given."""
+
+    workers = 1
+    _OPS = {
+        'gcd': lambda args: Zi.gcd(*args),
+        'xgcd': lambda args: Zi.xgcd(*args),
+        'is_prime': Zi.is_gaussian_prime,
+        'factor': Zi.factor,
+    }
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.batches = []
+
+    def map(self, op, inputs):
+        self.batches.append(list(inputs))
+        time.sleep(self.delay)
+        return [self._OPS[op](x) for x in inputs]
+
+
+class _ServiceTest(unittest.IsolatedAsyncioTestCase):
+    pool = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ZiPool(workers=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    async def asyncSetUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'zi.sock')
+
+    async def asyncTearDown(self):
+        self._tmp.cleanup()
+
+    async def _start(self, pool=None, **kwargs):
+        server = ZiServer(pool=pool or self.pool, **kwargs)
+        await server.start(path=self.path)
+        self.addAsyncCleanup(server.close)
+        client = await ZiClient.connect(path=self.path)
+        self.addAsyncCleanup(client.close)
+        return server, client
+
+    async def _raw(self, *lines):
+        """Send raw request lines; return the responses, by id."""
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        writer.write(b''.join(line.encode() + b'\n' for line in lines))
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in lines]
+        writer.close()
+        await writer.wait_closed()
+        return responses
+
+
+# ----------------------------------------------------------------------
+# Results
+# ----------------------------------------------------------------------
+
+class TestResults(_ServiceTest):
+    async def test_operations(self):
+        _, client = await self._start()
+        a, b = Zi(12, 5), Zi(3, -4)
+        self.assertEqual(await client.gcd(a, b), Zi.gcd(a, b))
+        self.assertEqual(await client.xgcd(a, b), Zi.xgcd(a, b))
+        self.assertEqual(await client.mod_inverse(Zi(3, 2), Zi(7)), Zi.mod_inverse(Zi(3, 2), Zi(7)))
+        self.assertIs(await client.is_prime(Zi(2, 1)), True)
+        self.assertIs(await client.is_prime(Zi(2, 0)), False)
+        self.assertEqual(await client.factor(Zi(-30, 10)), Zi.factor(Zi(-30, 10)))
+        self.assertEqual(await client.gcd(12, 18), Zi.gcd(12, 18))
+
+    async def test_big_components(self):
+        _, client = await self._start()
+        a, b = Zi(3 ** 200, -(7 ** 150)), Zi(5 ** 120, 11 ** 90)
+        self.assertEqual(await client.gcd(a * b, b * Zi(2, 1)), Zi.gcd(a * b, b * Zi(2, 1)))
+
+    async def test_tcp(self):
+        server = ZiServer(pool=self.pool)
+        await server.start(host='127.0.0.1', port=0)
+        self.addAsyncCleanup(server.close)
+        host, port = server.address[:2]
+        async with await ZiClient.connect(host=host, port=port) as client:
+            self.assertEqual(await client.gcd(Zi(5), Zi(2, 1)), Zi.gcd(Zi(5), Zi(2, 1)))
+
+    async def test_no_inverse_is_an_error(self):
+        _, client = await self._start()
+        with self.assertRaises(ServiceError) as cm:
+            await client.mod_inverse(Zi(2), Zi(4))
+        self.assertEqual(cm.exception.kind, 'ValueError')
+
+    async def test_bad_requests(self):
+        await self._start()
+        responses = await self._raw(
+            'not json',
+            '[1, 2]',
+            '{"id": 1, "op": "sqrt", "args": [1]}',
+            '{"id": 2, "op": "gcd", "args": [1]}',
+            '{"id": 3, "op": "is_prime", "args": [[1, 2, 3]]}',
+            '{"id": 4, "op": "is_prime", "args": [1.5]}',
+            '{"id": 5, "op": "factor", "args": [[0, 0]]}',
+            '{"id": 6, "op": "gcd", "args": [1, 2], "timeout": -1}',
+        )
+        self.assertTrue(all(r['error']['type'] == 'BadRequest' for r in responses))
+        self.assertEqual(sorted(r['id'] for r in responses if r['id'] is not None),
+                         [1, 2, 3, 4, 5, 6])
+
+    async def test_raw_protocol(self):
+        await self._start()
+        [response] = await self._raw('{"id": "x", "op": "xgcd", "args": [[4, 1], 3]}')
+        g, s, t = Zi.xgcd(Zi(4, 1), Zi(3))
+        self.assertEqual(response, {'id': 'x', 'result': [[g.real, g.imag], [s.real, s.imag],
+                                                           [t.real, t.imag]]})
+
+
+# ----------------------------------------------------------------------
+# Batching, caching and coalescing
+# ----------------------------------------------------------------------
+
+class TestBatching(_ServiceTest):
+    async def test_concurrent_requests_are_batched(self):
+        server, client = await self._start(batch_delay=0.02)
+        rng = random.Random(44)
+        pairs = [(Zi(rng.randint(-999, 999), rng.randint(-999, 999)),
+                  Zi(rng.randint(-999, 999), rng.randint(-999, 999))) for _ in range(200)]
+        results = await asyncio.gather(*(client.gcd(a, b) for a, b in pairs))
+        self.assertEqual(results, [Zi.gcd(a, b) for a, b in pairs])
+        stats = server.stats()
+        self.assertEqual(stats.computed, len(set(pairs)))
+        self.assertLess(stats.batches, 20)
+
+    async def test_mixed_operations_in_one_batch(self):
+        _, client = await self._start(batch_delay=0.02)
+        results = await asyncio.gather(client.gcd(Zi(6), Zi(4)), client.is_prime(Zi(3)),
+                                       client.factor(Zi(10)))
+        self.assertEqual(results, [Zi.gcd(Zi(6), Zi(4)), True, Zi.factor(Zi(10))])
+
+    async def test_cache_is_shared_across_clients(self):
+        server, client = await self._start()
+        await client.factor(Zi(1234, 567))
+        async with await ZiClient.connect(path=self.path) as other:
+            self.assertEqual(await other.factor(Zi(1234, 567)), Zi.factor(Zi(1234, 567)))
+        self.assertEqual(server.stats().cache_hits, 1)
+        self.assertEqual(server.stats().computed, 1)
+
+    async def test_identical_requests_in_flight_are_coalesced(self):
+        server, client = await self._start(pool=_SlowPool(0.05), batch_delay=0.01)
+        results = await asyncio.gather(*(client.is_prime(Zi(7, 2)) for _ in range(10)))
+        self.assertEqual(results, [Zi.is_gaussian_prime(Zi(7, 2))] * 10)
+        self.assertEqual(server.stats().computed, 1)
+        self.assertEqual(server.stats().coalesced, 9)
+
+    async def test_cache_size_zero_disables_cache(self):
+        server, client = await self._start(cache_size=0)
+        await client.gcd(Zi(3), Zi(6))
+        await client.gcd(Zi(3), Zi(6))
+        self.assertEqual(server.stats().cache_hits, 0)
+        self.assertEqual(server.stats().computed, 2)
+
+
+# ----------------------------------------------------------------------
+# Deadlines and backpressure
+# ----------------------------------------------------------------------
+
+class TestDeadlines(_ServiceTest):
+    async def test_deadline_exceeded(self):
+        _, client = await self._start(pool=_SlowPool(0.3))
+        start = time.perf_counter()
+        with self.assertRaises(DeadlineExceeded):
+            await client.gcd(Zi(10), Zi(4), timeout=0.05)
+        self.assertLess(time.perf_counter() - start, 0.25)
+        # The computation still finishes, and is cached for later.
+        self.assertEqual(await client.gcd(Zi(10), Zi(4)), Zi.gcd(Zi(10), Zi(4)))
+
+    async def test_expired_requests_are_not_computed(self):
+        pool = _SlowPool(0.2)
+        server, client = await self._start(pool=pool, batch_delay=0)
+        first = asyncio.ensure_future(client.gcd(Zi(1), Zi(2)))
+        await asyncio.sleep(0.05)  # the only slot is now busy
+        with self.assertRaises(DeadlineExceeded):
+            await client.gcd(Zi(3), Zi(5), timeout=0.05)
+        await first
+        await asyncio.sleep(0.05)
+        self.assertEqual(server.stats().expired, 1)
+        # (The first batch is the server's warm-up.)
+        self.assertEqual(pool.batches[1:], [[(Zi(1), Zi(2))]])
+
+    async def test_a_later_deadline_keeps_a_shared_computation(self):
+        _, client = await self._start(pool=_SlowPool(0.1))
+        short = client.gcd(Zi(8), Zi(12), timeout=0.02)
+        long = client.gcd(Zi(8), Zi(12), timeout=5)
+        results = await asyncio.gather(short, long, return_exceptions=True)
+        self.assertIsInstance(results[0], DeadlineExceeded)
+        self.assertEqual(results[1], Zi.gcd(Zi(8), Zi(12)))
+
+    async def test_no_coalescing_onto_a_request_waiting_for_the_queue(self):
+        _, client = await self._start(pool=_SlowPool(0.2), queue_size=1, max_batch=1,
+                                      batch_delay=0)
+        # One batch running, one waiting for the slot, one filling the queue.
+        busy = [asyncio.ensure_future(client.gcd(Zi(n), Zi(n + 1))) for n in (1, 3, 5)]
+        await asyncio.sleep(0.05)
+        short = client.gcd(Zi(8), Zi(12), timeout=0.05)
+        long = client.gcd(Zi(8), Zi(12))
+        results = await asyncio.gather(short, long, return_exceptions=True)
+        self.assertIsInstance(results[0], DeadlineExceeded)
+        self.assertEqual(results[1], Zi.gcd(Zi(8), Zi(12)))
+        await asyncio.gather(*busy)
+
+    async def test_small_limits_still_answer_everything(self):
+        server, client = await self._start(pool=_SlowPool(0.001), max_pending=1, queue_size=1,
+                                           max_batch=2)
+        values = [Zi(n, 1) for n in range(40)]
+        results = await asyncio.gather(*(client.is_prime(z) for z in values))
+        self.assertEqual(results, [Zi.is_gaussian_prime(z) for z in values])
+        self.assertEqual(server.stats().computed, 40)
+
+    async def test_client_after_server_closes(self):
+        server, client = await self._start()
+        await client.gcd(Zi(2), Zi(4))
+        await server.close()
+        await asyncio.sleep(0.05)
+        with self.assertRaises(ConnectionError):
+            await client.gcd(Zi(2), Zi(6))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""Unit tests for shared-memory ZiArrays (src.shared)."""
+
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from src.shared import SharedZiArray
+from src.zi import Zi
+from src.ziarray import ZiArray
+
+VALUES = [Zi(i, 3 * i - 7) for i in range(-40, 40)]
+
+
+def _square_range(src, dst, lo, hi):
+    with src, dst:
+        for i in range(lo, hi):
+            dst[i] = src[i] * src[i]
+        return src.owner or dst.owner
+
+
+def _slice_sum(src, lo, hi):
+    with src:
+        return src.array[lo:hi].sum()
+
+
+def _exists(name):
+    try:
+        shm = SharedMemory(name)
+    except FileNotFoundError:
+        return False
+    shm.close()
+    return True
+
+
+# ----------------------------------------------------------------------
+# Creating, reading and writing
+# ----------------------------------------------------------------------
+
+class TestSharedZiArray(unittest.TestCase):
+    def test_holds_values(self):
+        for layout in ('interleaved', 'split'):
+            with SharedZiArray(VALUES, layout) as s:
+                self.assertEqual(len(s), len(VALUES))
+                self.assertEqual(s.layout, layout)
+                self.assertEqual(s.array.layout, layout)
+                self.assertEqual(s.array.tolist(), VALUES)
+                self.assertEqual(s[3], VALUES[3])
+                self.assertTrue(s.owner)
+
+    def test_from_ziarray_in_other_layout(self):
+        src = ZiArray(VALUES, 'interleaved')
+        with SharedZiArray(src, 'split') as s:
+            self.assertEqual(s.array.layout, 'split')
+            self.assertEqual(s.array, src.copy('split'))
+
+    def test_zeros_and_writes(self):
+        with SharedZiArray.zeros(10) as s:
+            self.assertEqual(s.array.tolist(), [Zi(0)] * 10)
+            s[2] = Zi(5, -6)
+            s[4:6] = [Zi(1, 1), Zi(2, 2)]
+            self.assertEqual(s.array.tolist()[:6], [Zi(0), Zi(0), Zi(5, -6), Zi(0), Zi(1, 1), Zi(2, 2)])
+
+    def test_empty(self):
+        with SharedZiArray([]) as s:
+            self.assertEqual(len(s), 0)
+            self.assertEqual(s.array.tolist(), [])
+        with SharedZiArray.zeros(0, 'split') as s:
+            self.assertEqual(len(s.array), 0)
+
+    def test_attach_sees_and_makes_changes(self):
+        with SharedZiArray(VALUES) as s:
+            with SharedZiArray.attach(s.name, len(s), s.layout) as other:
+                self.assertFalse(other.owner)
+                self.assertEqual(other.array.tolist(), VALUES)
+                other[0] = Zi(99, 98)
+            self.assertEqual(s[0], Zi(99, 98))
+            # Closing an attached array leaves the block in place.
+            self.assertTrue(_exists(s.name))
+
+    def test_invalid_layout(self):
+        with self.assertRaises(ValueError):
+            SharedZiArray(VALUES, 'planar')
+        with self.assertRaises(ValueError):
+            SharedZiArray.zeros(3, 'planar')
+
+    def test_overflow(self):
+        with self.assertRaises(OverflowError):
+            SharedZiArray([Zi(2 ** 63, 0)])
+
+
+# ----------------------------------------------------------------------
+# Lifetime and pickling
+# ----------------------------------------------------------------------
+
+class TestLifetime(unittest.TestCase):
+    def test_owner_close_unlinks(self):
+        with SharedZiArray(VALUES) as s:
+            name = s.name
+            self.assertIn('owner', repr(s))
+        self.assertTrue(s.closed)
+        self.assertIn('closed', repr(s))
+        self.assertFalse(_exists(name))
+        s.close()  # idempotent
+
+    def test_close_with_live_view_raises_but_unlinks(self):
+        s = SharedZiArray(VALUES)
+        name = s.name
+        view = s.array[2:5]
+        self.assertEqual(view.tolist(), VALUES[2:5])
+        with self.assertRaises(BufferError):
+            s.close()
+        self.assertFalse(_exists(name))
+        for v in (view._re, view._im, view._buf):
+            v.release()
+        s._shm.close()
+
+    def test_pickle_attaches(self):
+        with SharedZiArray(VALUES) as s:
+            with pickle.loads(pickle.dumps(s)) as copy:
+                self.assertFalse(copy.owner)
+                self.assertEqual(copy.name, s.name)
+                self.assertEqual(copy.array.tolist(), VALUES)
+            self.assertLess(len(pickle.dumps(s)), 200)
+
+    def test_pickle_closed_raises(self):
+        s = SharedZiArray(VALUES)
+        s.close()
+        with self.assertRaises(ValueError):
+            pickle.dumps(s)
+
+
+# ----------------------------------------------------------------------
+# Worker processes
+# ----------------------------------------------------------------------
+
+class TestWorkers(unittest.TestCase):
+    def test_workers_read_slices_and_write_in_place(self):
+        values = [Zi(i, -i // 3) for i in range(1000)]
+        with SharedZiArray(values) as src, SharedZiArray.zeros(len(values), 'split') as dst:
+            with ProcessPoolExecutor(2) as pool:
+                futures = [pool.submit(_square_range, src, dst, lo, min(lo + 128, len(src)))
+                           for lo in range(0, len(src), 128)]
+                self.assertFalse(any(f.result() for f in futures))
+                sums = [pool.submit(_slice_sum, src, lo, lo + 100).result()
+                        for lo in range(0, 1000, 100)]
+            self.assertEqual(dst.array.tolist(), [z * z for z in values])
+            self.assertEqual(sums, [sum(values[lo:lo + 100], Zi(0)) for lo in range(0, 1000, 100)])
+            name = src.name
+        self.assertFalse(_exists(name))
+
+
+if __name__ == '__main__':
+    unittest.main()
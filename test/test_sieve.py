@@ -0,0 +1,163 @@
+"""Unit tests for the segmented Gaussian prime sieve."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.sieve import INDEX_NAME, JOURNAL_NAME, Shard, ShardIndex, segment_primes, sieve
+from src.zi import Zi
+
+
+def _brute(lo, hi):
+    bound = int(hi ** 0.5) + 2
+    primes = [Zi(a, b) for a in range(1, bound) for b in range(bound)
+              if lo <= a * a + b * b < hi and Zi.is_gaussian_prime(Zi(a, b))]
+    return sorted(primes, key=lambda z: (z.norm(), z.real))
+
+
+# ----------------------------------------------------------------------
+# In-memory segments
+# ----------------------------------------------------------------------
+
+class TestSegmentPrimes(unittest.TestCase):
+    def test_matches_brute_force(self):
+        self.assertEqual(segment_primes(0, 5000), _brute(0, 5000))
+        self.assertEqual(segment_primes(1234, 4321), _brute(1234, 4321))
+
+    def test_small_norms(self):
+        self.assertEqual(segment_primes(0, 10), [Zi(1, 1), Zi(1, 2), Zi(2, 1), Zi(3, 0)])
+        self.assertEqual(segment_primes(0, 2), [])
+        self.assertEqual(segment_primes(9, 10), [Zi(3, 0)])
+        self.assertEqual(segment_primes(10, 10), [])
+
+    def test_segments_concatenate(self):
+        whole = segment_primes(0, 3000)
+        for size in (1, 7, 100, 2999):
+            parts = []
+            for lo in range(0, 3000, size):
+                parts += segment_primes(lo, min(lo + size, 3000))
+            self.assertEqual(parts, whole, size)
+
+    def test_large_norms(self):
+        lo = 10 ** 12
+        primes = segment_primes(lo, lo + 2000)
+        self.assertTrue(primes)
+        for z in primes:
+            self.assertTrue(lo <= z.norm() < lo + 2000)
+            self.assertTrue(Zi.is_gaussian_prime(z))
+            self.assertEqual(z.canonical()[0], z)
+
+
+# ----------------------------------------------------------------------
+# Sharded runs, the index and resuming
+# ----------------------------------------------------------------------
+
+class TestSieve(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.dir = self._tmp.name
+
+    def test_sieve_writes_shards_and_index(self):
+        index = sieve(self.dir, 5000, segment_size=512, workers=2)
+        self.assertTrue(index.complete)
+        self.assertEqual([(s.lo, s.hi) for s in index.shards],
+                         [(lo, min(lo + 512, 5001)) for lo in range(0, 5001, 512)])
+        expected = segment_primes(0, 5001)
+        self.assertEqual(list(index.primes()), expected)
+        self.assertEqual(len(index), len(expected))
+        for s in index.shards:
+            self.assertTrue(os.path.exists(index.path(s)))
+        self.assertFalse([n for n in os.listdir(self.dir) if n.endswith('.tmp')])
+
+    def test_load_matches_returned_index(self):
+        index = sieve(self.dir, 2000, segment_size=300, workers=1)
+        loaded = ShardIndex.load(self.dir)
+        self.assertEqual(loaded.shards, index.shards)
+        self.assertEqual((loaded.limit, loaded.segment_size, loaded.complete), (2000, 300, True))
+
+    def test_shard_for_and_ranges(self):
+        index = sieve(self.dir, 3000, segment_size=1000, workers=1)
+        self.assertEqual(index.shard_for(0).lo, 0)
+        self.assertEqual(index.shard_for(999).lo, 0)
+        self.assertEqual(index.shard_for(1000).lo, 1000)
+        self.assertEqual(index.shard_for(3000).lo, 3000)
+        self.assertIsNone(index.shard_for(3001))
+        self.assertEqual(list(index.primes(500, 1500)), segment_primes(500, 1500))
+        self.assertEqual(list(index.primes(2000)), segment_primes(2000, 3001))
+
+    def test_resume_skips_finished_shards(self):
+        sieve(self.dir, 4000, segment_size=500, workers=1)
+        # Simulate an interrupted run: two shards not yet recorded, one
+        # recorded but its file lost.
+        path = os.path.join(self.dir, INDEX_NAME)
+        with open(path) as f:
+            data = json.load(f)
+        data['complete'] = False
+        data['shards'] = data['shards'][:-2]
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        os.remove(os.path.join(self.dir, Shard(*data['shards'][0]).file))
+        kept = {s[2]: os.stat(os.path.join(self.dir, s[2])).st_mtime_ns
+                for s in data['shards'][1:]}
+
+        index = sieve(self.dir, 4000, segment_size=500, workers=1)
+        self.assertTrue(index.complete)
+        self.assertEqual(len(index.shards), 9)
+        self.assertEqual(list(index.primes()), segment_primes(0, 4001))
+        for name, mtime in kept.items():
+            self.assertEqual(os.stat(os.path.join(self.dir, name)).st_mtime_ns, mtime)
+
+    def test_shards_are_journalled_not_saved_one_by_one(self):
+        with mock.patch.object(ShardIndex, 'save', autospec=True,
+                               side_effect=ShardIndex.save) as save:
+            index = sieve(self.dir, 6000, segment_size=200, workers=1)
+        self.assertEqual(len(index.shards), 31)
+        self.assertEqual(save.call_count, 2)      # at the start and at the end
+        self.assertFalse(os.path.exists(os.path.join(self.dir, JOURNAL_NAME)))
+        self.assertEqual(ShardIndex.load(self.dir).shards, index.shards)
+
+    def test_resume_from_journal(self):
+        full = sieve(self.dir, 4000, segment_size=500, workers=1)
+        # Simulate a run killed mid-way: index.json as saved at the start,
+        # four shards in the journal, the last line torn.
+        path = os.path.join(self.dir, INDEX_NAME)
+        with open(path) as f:
+            data = json.load(f)
+        data['complete'], data['shards'] = False, []
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        with open(os.path.join(self.dir, JOURNAL_NAME), 'w') as f:
+            for shard in full.shards[:4]:
+                f.write(json.dumps(list(shard)) + '\n')
+            f.write('[4000, 45')
+        self.assertEqual(ShardIndex.load(self.dir).shards, full.shards[:4])
+        kept = {s.file: os.stat(os.path.join(self.dir, s.file)).st_mtime_ns
+                for s in full.shards[:4]}
+
+        index = sieve(self.dir, 4000, segment_size=500, workers=1)
+        self.assertTrue(index.complete)
+        self.assertEqual(index.shards, full.shards)
+        self.assertEqual(list(index.primes()), segment_primes(0, 4001))
+        for name, mtime in kept.items():
+            self.assertEqual(os.stat(os.path.join(self.dir, name)).st_mtime_ns, mtime)
+        self.assertFalse(os.path.exists(os.path.join(self.dir, JOURNAL_NAME)))
+
+    def test_resume_with_other_parameters_raises(self):
+        sieve(self.dir, 1000, segment_size=100, workers=1)
+        with self.assertRaises(ValueError):
+            sieve(self.dir, 2000, segment_size=100, workers=1)
+        index = sieve(self.dir, 2000, segment_size=100, workers=1, resume=False)
+        self.assertEqual(list(index.primes()), segment_primes(0, 2001))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            sieve(self.dir, -1)
+        with self.assertRaises(ValueError):
+            sieve(self.dir, 100, segment_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
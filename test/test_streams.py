@@ -0,0 +1,191 @@
+"""Unit tests for the lazy stream combinators (src.streams)."""
+
+import random
+import unittest
+from itertools import count, islice
+
+from src import streams
+from src.zi import Zi
+from src.ziarray import ZiArray, ZiDivisor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _values(n, bound=999, seed=46):
+    rng = random.Random(seed)
+    return [Zi(rng.randint(-bound, bound), rng.randint(-bound, bound)) for _ in range(n)]
+
+
+def _fold(op, start, values):
+    out, acc = [], start
+    for z in values:
+        acc = op(acc, z)
+        out.append(acc)
+    return out
+
+
+# ----------------------------------------------------------------------
+# Running results
+# ----------------------------------------------------------------------
+
+class TestRunning(unittest.TestCase):
+    def test_running_sum(self):
+        values = _values(100)
+        self.assertEqual(list(streams.running_sum(values)),
+                         _fold(lambda a, z: a + z, Zi(0), values))
+        self.assertEqual(list(streams.running_sum([1, 2, Zi(0, 3)])), [Zi(1), Zi(3), Zi(3, 3)])
+
+    def test_running_prod(self):
+        values = _values(20)
+        self.assertEqual(list(streams.running_prod(values)),
+                         _fold(lambda a, z: a * z, Zi(1), values))
+
+    def test_running_prod_mod(self):
+        values, m = _values(500), Zi(101, 7)
+        result = list(streams.running_prod(values, mod=m))
+        self.assertEqual(result, _fold(lambda a, z: a * z % m, Zi(1) % m, values))
+        self.assertEqual(result[-1], ZiArray(values).prod(mod=m))
+        self.assertTrue(all(r.norm() <= m.norm() for r in result))
+
+    def test_prefix_gcd(self):
+        g = Zi(3, 2)
+        values = [g * z for z in _values(50)]
+        result = list(streams.prefix_gcd(values))
+        self.assertEqual(result, _fold(Zi.gcd, Zi(0), values))
+        self.assertTrue(all(r % g == 0 for r in result))
+
+    def test_empty_input(self):
+        for gen in (streams.running_sum([]), streams.running_prod([], mod=5),
+                    streams.prefix_gcd([]), streams.norms([]), streams.norm_filter([]),
+                    streams.reduce_mod([], 5), streams.batched([], 3)):
+            self.assertEqual(list(gen), [])
+
+
+# ----------------------------------------------------------------------
+# Laziness
+# ----------------------------------------------------------------------
+
+class TestLaziness(unittest.TestCase):
+    @staticmethod
+    def _unbounded():
+        return (Zi(n % 97, n % 89 + 1) for n in count())
+
+    def test_unbounded_inputs(self):
+        for gen in (streams.running_sum(self._unbounded()),
+                    streams.running_prod(self._unbounded(), mod=Zi(7, 3)),
+                    streams.prefix_gcd(self._unbounded()),
+                    streams.norms(self._unbounded()),
+                    streams.norm_filter(self._unbounded(), 0, 50),
+                    streams.reduce_mod(self._unbounded(), Zi(5, 2)),
+                    streams.batched(self._unbounded(), 10)):
+            self.assertEqual(len(list(islice(gen, 25))), 25)
+
+    def test_input_is_read_on_demand(self):
+        seen = []
+
+        def source():
+            for z in _values(100):
+                seen.append(z)
+                yield z
+
+        gen = streams.running_prod(source(), mod=13)
+        next(gen)
+        next(gen)
+        self.assertEqual(len(seen), 2)
+        batches = streams.batched(source(), 10)
+        next(batches)
+        self.assertEqual(len(seen), 12)
+
+    def test_composition(self):
+        values = _values(300)
+        m = Zi(17, 4)
+        result = list(streams.prefix_gcd(streams.norm_filter(streams.reduce_mod(values, m), 1)))
+        reduced = [z % m for z in values if (z % m).norm() >= 1]
+        self.assertEqual(result, _fold(Zi.gcd, Zi(0), reduced))
+
+
+# ----------------------------------------------------------------------
+# Norms, filtering and reduction
+# ----------------------------------------------------------------------
+
+class TestNorms(unittest.TestCase):
+    def test_norms(self):
+        values = _values(200) + [3, Zi(0, -7)]
+        self.assertEqual(list(streams.norms(values)), [Zi(z).norm() for z in values])
+
+    def test_norm_filter(self):
+        values = _values(500)
+        self.assertEqual(list(streams.norm_filter(values, 1000, 50_000)),
+                         [z for z in values if 1000 <= z.norm() < 50_000])
+        self.assertEqual(list(streams.norm_filter(values, 900_000)),
+                         [z for z in values if z.norm() >= 900_000])
+        self.assertEqual(list(streams.norm_filter(values)), values)
+
+    def test_reduce_mod(self):
+        values, m = _values(300), Zi(12, -5)
+        expected = [z % m for z in values]
+        self.assertEqual(list(streams.reduce_mod(values, m)), expected)
+        self.assertEqual(list(streams.reduce_mod(values, ZiDivisor(m))), expected)
+        self.assertEqual(list(streams.reduce_mod([7, 8], 3)), [Zi(7) % 3, Zi(8) % 3])
+        with self.assertRaises(ZeroDivisionError):
+            list(streams.reduce_mod(values, 0))
+
+    def test_batched(self):
+        values = _values(25)
+        batches = list(streams.batched(iter(values), 10))
+        self.assertEqual([len(b) for b in batches], [10, 10, 5])
+        self.assertEqual(sum(batches, []), values)
+        with self.assertRaises(ValueError):
+            next(streams.batched(values, 0))
+
+
+# ----------------------------------------------------------------------
+# The array path
+# ----------------------------------------------------------------------
+
+class TestArrayPath(unittest.TestCase):
+    def setUp(self):
+        self.values = _values(1000, bound=10 ** 6)
+
+    def test_matches_scalar_path(self):
+        m = Zi(1009, -31)
+        for layout in ('interleaved', 'split'):
+            a = ZiArray(self.values, layout=layout)
+            self.assertEqual(list(streams.norms(a, chunk_size=64)),
+                             list(streams.norms(self.values)))
+            self.assertEqual(list(streams.norm_filter(a, 10 ** 11, 10 ** 12, chunk_size=64)),
+                             list(streams.norm_filter(self.values, 10 ** 11, 10 ** 12)))
+            self.assertEqual(list(streams.norm_filter(a, 10 ** 12, chunk_size=64)),
+                             list(streams.norm_filter(self.values, 10 ** 12)))
+            self.assertEqual(list(streams.reduce_mod(a, m, chunk_size=64)),
+                             list(streams.reduce_mod(self.values, m)))
+            self.assertEqual(list(streams.running_prod(a, mod=m)),
+                             list(streams.running_prod(self.values, mod=m)))
+            self.assertEqual(list(streams.prefix_gcd(a)), list(streams.prefix_gcd(self.values)))
+
+    def test_batched_yields_views(self):
+        a = ZiArray(self.values)
+        batches = list(streams.batched(a, 300))
+        self.assertTrue(all(isinstance(b, ZiArray) for b in batches))
+        self.assertEqual([len(b) for b in batches], [300, 300, 300, 100])
+        self.assertEqual([z for b in batches for z in b], self.values)
+
+    def test_large_components(self):
+        # Norms overflow int64 here, but stay exact.
+        big = 2 ** 62
+        a = ZiArray([Zi(big, -big), Zi(3, 4), Zi(-big, 1)])
+        self.assertEqual(list(streams.norms(a)), [z.norm() for z in a])
+        self.assertEqual(list(streams.norm_filter(a, 2 ** 125)), [Zi(big, -big)])
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestArrayPathNumpy(TestArrayPath):
+    """The same checks, now that numpy is imported (see the import above),
+    so the array path goes through numpy where the bounds allow."""
+
+
+if __name__ == '__main__':
+    unittest.main()
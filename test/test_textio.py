@@ -0,0 +1,132 @@
+"""Unit tests for the bulk text parser (src/textio.py)."""
+
+import io
+import random
+import unittest
+from fractions import Fraction
+
+from src.qi import Qi
+from src.textio import (ParseError, dump, dumps, format_lines, iter_parse, load, load_array,
+                        parse, parse_chunks)
+from src.zi import Zi
+
+
+# ----------------------------------------------------------------------
+# Single literals
+# ----------------------------------------------------------------------
+
+class TestParse(unittest.TestCase):
+    def test_forms(self):
+        cases = {
+            '5': Zi(5, 0), '-7': Zi(-7, 0), '4j': Zi(0, 4), '-2i': Zi(0, -2),
+            '(3+4j)': Zi(3, 4), '(3-4j)': Zi(3, -4), '7-2i': Zi(7, -2),
+            ' ( 1 + 2j ) \n': Zi(1, 2), '(-0+4j)': Zi(0, 4), '4/2': Zi(2, 0),
+            '-3/4': Qi('-3/4', 0), '2.5': Qi('5/2', 0), '-3/5i': Qi(0, '-3/5'),
+            '(1/2-3/5j)': Qi('1/2', '-3/5'), '1.5+2/3j': Qi('3/2', '2/3'),
+        }
+        for text, expected in cases.items():
+            got = parse(text)
+            self.assertEqual(got, expected, text)
+            self.assertIs(type(got), type(expected), text)
+
+    def test_agrees_with_qi_and_str(self):
+        rng = random.Random(38)
+        for _ in range(300):
+            q = Qi(Fraction(rng.randint(-99, 99), rng.randint(1, 9)),
+                   Fraction(rng.randint(-99, 99), rng.randint(1, 9)))
+            self.assertEqual(parse(str(q)), Qi(str(q)))
+            z = Zi(rng.randint(-10 ** 6, 10 ** 6), rng.randint(-10 ** 6, 10 ** 6))
+            self.assertEqual(parse(str(z)), z)
+
+    def test_invalid(self):
+        for text in ('', '(3+4j', '3+4j)', '3+4', 'j', 'abc', '3+-4j', '1/0', '(1/2)/3'):
+            with self.assertRaises(ValueError, msg=text):
+                parse(text)
+
+
+# ----------------------------------------------------------------------
+# Bulk parsing
+# ----------------------------------------------------------------------
+
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(39)
+        self.values = []
+        for _ in range(1000):
+            if rng.random() < 0.5:
+                self.values.append(Zi(rng.randint(-999, 999), rng.randint(-999, 999)))
+            else:
+                self.values.append(Qi(Fraction(rng.randint(-99, 99), rng.randint(2, 9)),
+                                      rng.randint(-9, 9)))
+        self.text = ''.join(f"{v}\n" for v in self.values)
+
+    def test_load_from_file(self):
+        self.assertEqual(load(io.StringIO(self.text)), self.values)
+
+    def test_chunks(self):
+        chunks = list(parse_chunks(io.StringIO(self.text), chunk_size=128))
+        self.assertEqual(len(chunks), 8)
+        self.assertEqual([v for c in chunks for v in c], self.values)
+        self.assertEqual(list(iter_parse(self.text.splitlines(), 7)), self.values)
+
+    def test_blank_lines_skipped(self):
+        self.assertEqual(load(['1', '', '  \n', '2j']), [Zi(1), Zi(0, 2)])
+
+    def test_error_reports_line_number(self):
+        lines = self.text.splitlines()
+        lines[700] = '(1+2j'
+        with self.assertRaises(ParseError) as cm:
+            load(lines, chunk_size=64)
+        self.assertEqual(cm.exception.lineno, 701)
+        self.assertEqual(cm.exception.line, '(1+2j')
+        self.assertIn('line 701', str(cm.exception))
+
+    def test_zero_denominator_is_a_parse_error(self):
+        with self.assertRaises(ParseError) as cm:
+            load(['1', '2/0'])
+        self.assertEqual(cm.exception.lineno, 2)
+
+    def test_decimal_with_denominator_is_a_parse_error(self):
+        for bad in ('2.5/3', '1+2.5/3j', '(0.5/2-1j)'):
+            with self.assertRaises(ParseError) as cm:
+                load(['1', bad])
+            self.assertEqual(cm.exception.lineno, 2)
+        with self.assertRaises(ValueError):
+            parse('2.5/3')
+
+    def test_load_array(self):
+        zs = [v for v in self.values if isinstance(v, Zi)]
+        for layout in ('interleaved', 'split'):
+            arr = load_array(io.StringIO(''.join(f"{z}\n" for z in zs)), layout)
+            self.assertEqual(arr.layout, layout)
+            self.assertEqual(arr.tolist(), zs)
+        with self.assertRaises(ParseError) as cm:
+            load_array(['1', '2', '1/2'])
+        self.assertEqual(cm.exception.lineno, 3)
+
+
+
+# ----------------------------------------------------------------------
+# Formatting
+# ----------------------------------------------------------------------
+
+class TestFormatting(unittest.TestCase):
+    def test_round_trip_exact(self):
+        values = [Zi(10 ** 40, -3), Zi(0, -(2 ** 100)), Zi(5), Qi(Fraction(10 ** 30, 7), '-1/3'),
+                  Qi(0, '5/9'), Zi(0, 0)]
+        self.assertEqual(load(dumps(values).splitlines()), values)
+
+    def test_dump_in_chunks(self):
+        zs = [Zi(k, -k) for k in range(1000)]
+        f = io.StringIO()
+        self.assertEqual(dump(zs, f, chunk_size=300), 1000)
+        self.assertEqual(f.getvalue(), ''.join(f"{z}\n" for z in zs))
+        self.assertEqual(len(list(format_lines(zs, 300))), 4)
+
+    def test_empty(self):
+        self.assertEqual(dumps([]), '')
+        self.assertEqual(dump([], io.StringIO()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
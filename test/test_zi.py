@@ -1,7 +1,10 @@
 """Unit tests for the Zi (Gaussian integer) class."""
 
+import copy
+import pickle
 import random
 import unittest
+from fractions import Fraction
 
 from src.zi import Zi
 
@@ -65,6 +68,14 @@ class TestProtocols(unittest.TestCase):
     def test_str_complex(self):
         self.assertEqual(str(Zi(3, 4)), str(complex(3, 4)))
 
+    def test_str_matches_complex_format(self):
+        for a, b in ((3, -4), (-3, 4), (0, 7), (0, -7), (-12, 1)):
+            self.assertEqual(str(Zi(a, b)), str(complex(a, b)))
+
+    def test_str_exact_for_huge_components(self):
+        self.assertEqual(str(Zi(10 ** 30, -1)), f"({10 ** 30}-1j)")
+        self.assertEqual(str(Zi(0, 2 ** 2000)), f"{2 ** 2000}j")
+
     def test_getitem(self):
         z = Zi(3, 4)
         self.assertEqual(z[0], 3)
@@ -91,6 +102,14 @@ class TestProtocols(unittest.TestCase):
         s = {Zi(1, 1), Zi(1, 1), Zi(2, 2)}
         self.assertEqual(len(s), 2)
 
+    def test_hash_and_norm_are_cached(self):
+        z = Zi(10 ** 12, -3)
+        self.assertEqual(hash(z), hash((10 ** 12, -3)))
+        self.assertEqual(z._hash, hash(z))
+        self.assertEqual(z.norm(), 10 ** 24 + 9)
+        self.assertEqual(z._norm, 10 ** 24 + 9)
+        self.assertEqual(hash(z), hash(Zi(10 ** 12, -3)))
+
 
 # ----------------------------------------------------------------------
 # Equality / inequality
@@ -326,6 +345,13 @@ class TestFloorDivMod(unittest.TestCase):
         with self.assertRaises(ZeroDivisionError):
             Zi(1, 1) // Zi(0, 0)
 
+    def test_round_div_matches_fraction_round(self):
+        # _round_div replaces round(Fraction(x, n)) in __floordiv__, so it
+        # must agree exactly, including round-half-to-even on ties.
+        for n in range(1, 13):
+            for x in range(-40, 41):
+                self.assertEqual(Zi._round_div(x, n), round(Fraction(x, n)))
+
     def test_rfloordiv(self):
         self.assertEqual(4 // Zi(2, 0), Zi(2, 0))
         self.assertEqual((4 // Zi(2, 0)), (Zi(4, 0) // Zi(2, 0)))
@@ -581,6 +607,32 @@ class TestNumberTheory(unittest.TestCase):
         self.assertEqual(g, Zi(3, 4))
         self.assertEqual(Zi(0, 0) * s + Zi(3, 4) * t, g)
 
+    def test_mod_inverse(self):
+        rng = random.Random(34)
+        m = Zi(7, 12)  # norm 193, a rational prime: every nonzero residue inverts
+        for _ in range(100):
+            a = Zi(rng.randint(-500, 500), rng.randint(-500, 500))
+            if a % m == Zi(0, 0):
+                continue
+            x = Zi.mod_inverse(a, m)
+            self.assertEqual((a * x) % m, Zi(1, 0))
+            self.assertEqual(x % m, x)
+
+    def test_mod_inverse_not_coprime_raises(self):
+        with self.assertRaises(ValueError):
+            Zi.mod_inverse(Zi(2, 0), Zi(1, 1))
+        with self.assertRaises(ZeroDivisionError):
+            Zi.mod_inverse(Zi(2, 0), Zi(0, 0))
+
+    def test_factor(self):
+        unit, factors = Zi.factor(Zi(-30, 10))
+        z = unit
+        for p, e in factors:
+            self.assertTrue(Zi.is_gaussian_prime(p))
+            z *= p ** e
+        self.assertEqual(z, Zi(-30, 10))
+        self.assertEqual(Zi.factor(Zi(1, 0)), (Zi(1, 0), []))
+
 
 # ----------------------------------------------------------------------
 # Utilities: random, eye, units, is_unit, two
@@ -630,6 +682,83 @@ class TestUtilities(unittest.TestCase):
         self.assertEqual(Zi.two().norm(), 2)
         self.assertTrue(Zi.is_gaussian_prime(Zi.two()))
 
+    def test_canonical(self):
+        rng = random.Random(35)
+        for _ in range(200):
+            z = Zi(rng.randint(-50, 50), rng.randint(-50, 50))
+            c, u = z.canonical()
+            self.assertEqual(u * c, z)
+            self.assertIn(u, Zi.units())
+            if z:
+                self.assertTrue(c.real > 0 and c.imag >= 0)
+            self.assertEqual({w.canonical()[0] for w in (u * z for u in Zi.units())}, {c})
+        self.assertEqual(Zi(0, 0).canonical(), (Zi(0, 0), Zi(1, 0)))
+        self.assertEqual(Zi(0, 5).canonical(), (Zi(5, 0), Zi(0, 1)))
+
+
+# ----------------------------------------------------------------------
+# Interning of small values, immutability, pickling
+# ----------------------------------------------------------------------
+
+class TestInterning(unittest.TestCase):
+    def test_small_values_are_shared(self):
+        self.assertIs(Zi(3, -4), Zi(3, -4))
+        self.assertIs(Zi(256, -256), Zi(256.0, -256.0))
+        self.assertIs(Zi(2 - 5j), Zi(2, -5))
+
+    def test_arithmetic_results_reuse_interned_values(self):
+        self.assertIs(Zi(1, 2) + Zi(2, 3), Zi(3, 5))
+        self.assertIs(Zi(1, 1) * Zi(1, -1), Zi(2, 0))
+
+    def test_large_values_are_not_interned(self):
+        a, b = Zi(257, 0), Zi(257, 0)
+        self.assertEqual(a, b)
+        self.assertIsNot(a, b)
+
+    def test_subclasses_do_not_share_the_table(self):
+        class MyZi(Zi):
+            __slots__ = ()
+
+        self.assertIs(type(MyZi(3, 7)), MyZi)
+        self.assertIs(type(Zi(3, 7)), Zi)
+        self.assertIs(type(MyZi(3, 7)), MyZi)
+        self.assertIsNot(MyZi(3, 7), Zi(3, 7))
+        self.assertEqual(MyZi(3, 7), Zi(3, 7))
+
+    def test_constants_are_shared(self):
+        self.assertIs(Zi.eye(), Zi(0, 1))
+        self.assertIs(Zi.two(), Zi(1, 1))
+        for u, v in zip(Zi.units(), Zi.units()):
+            self.assertIs(u, v)
+
+    def test_units_returns_a_fresh_list(self):
+        us = Zi.units()
+        us.append(Zi(5, 5))
+        self.assertEqual(len(Zi.units()), 4)
+
+    def test_zi_of_zi_is_same_object(self):
+        z = Zi(10 ** 6, 1)
+        self.assertIs(Zi(z), z)
+
+    def test_immutable(self):
+        z = Zi(3, 4)
+        with self.assertRaises(AttributeError):
+            z._real = 5
+        with self.assertRaises(AttributeError):
+            del z._imag
+
+    def test_pickle_and_copy_round_trip(self):
+        for z in (Zi(3, 4), Zi(10 ** 30, -7)):
+            self.assertEqual(pickle.loads(pickle.dumps(z)), z)
+            self.assertEqual(copy.copy(z), z)
+            self.assertEqual(copy.deepcopy(z), z)
+        self.assertIs(pickle.loads(pickle.dumps(Zi(3, 4))), Zi(3, 4))
+
+    def test_copy_returns_self(self):
+        z = Zi(10 ** 30, -7)
+        self.assertIs(copy.copy(z), z)
+        self.assertIs(copy.deepcopy([z])[0], z)
+
 
 # ----------------------------------------------------------------------
 # Fuzz tests: algebraic properties that must hold for ALL Gaussian ints
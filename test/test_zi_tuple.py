@@ -0,0 +1,90 @@
+"""Unit tests for the tuple-backed Zi (src/zi_tuple.py).
+
+The backend is chosen when src.zi is first imported, so everything here
+runs in a fresh interpreter with GAUSSIANS_ZI_BACKEND=tuple set.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(args, backend='tuple', cwd=ROOT):
+    env = dict(os.environ, GAUSSIANS_ZI_BACKEND=backend, PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable, *args], cwd=cwd, env=env,
+                          capture_output=True, text=True)
+
+
+def _python(code, backend='tuple'):
+    return _run(['-c', code], backend)
+
+
+# ----------------------------------------------------------------------
+# The full Zi-based suites, under the tuple backend
+# ----------------------------------------------------------------------
+
+class TestSuites(unittest.TestCase):
+    def test_zi_qi_and_array_suites_pass(self):
+        proc = _run(['-m', 'unittest', '-q', 'test_zi', 'test_qi', 'test_ziarray',
+                     'test_zifile', 'test_grid'], cwd=os.path.join(ROOT, 'test'))
+        self.assertEqual(proc.returncode, 0, proc.stderr[-3000:])
+
+
+# ----------------------------------------------------------------------
+# Backend-specific behavior
+# ----------------------------------------------------------------------
+
+class TestTupleBackend(unittest.TestCase):
+    def test_selected(self):
+        proc = _python(
+            "from src.zi import Zi, SlotsZi, BACKEND\n"
+            "from src.qi import Qi\n"
+            "z = Zi(3, -4)\n"
+            "assert BACKEND == 'tuple' and Zi is not SlotsZi\n"
+            "assert isinstance(z, tuple) and tuple(z) == (3, -4)\n"
+            "assert type(Qi(6, 8)) is Zi and type(Zi(1, 2) * 10**30) is Zi\n"
+            "assert hash(z) == hash(SlotsZi._make(3, -4))\n"
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+
+    def test_no_tuple_behavior_leaks_through(self):
+        proc = _python(
+            "from src.zi import Zi\n"
+            "z = Zi(3, 4)\n"
+            "assert z * 2 == Zi(6, 8) and 2 * z == Zi(6, 8)\n"
+            "assert not Zi(0, 0) and len(z) == 2\n"
+            "assert z != (3, 4) and (3, 4) != z and not (3, 4) == z\n"
+            "for op in ('+', '<', '<=', '>', '>='):\n"
+            "    try:\n"
+            "        eval('z' + op + '(1, 2)')\n"
+            "    except TypeError:\n"
+            "        pass\n"
+            "    else:\n"
+            "        raise AssertionError(op)\n"
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+
+    def test_pickles_load_under_either_backend(self):
+        dumped = _python("import pickle, sys\n"
+                         "from src.zi import Zi\n"
+                         "sys.stdout.write(pickle.dumps([Zi(3, 4), Zi(10**20, -1)]).hex())\n")
+        self.assertEqual(dumped.returncode, 0, dumped.stderr)
+        for backend in ('slots', 'tuple'):
+            proc = _python("import pickle\n"
+                           "from src.zi import Zi\n"
+                           f"zs = pickle.loads(bytes.fromhex({dumped.stdout!r}))\n"
+                           "assert all(type(z) is Zi for z in zs)\n"
+                           "assert zs == [Zi(3, 4), Zi(10**20, -1)]\n", backend)
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+
+    def test_unknown_backend_raises(self):
+        proc = _python("import src.zi", backend='bogus')
+        self.assertNotEqual(proc.returncode, 0)
+        self.assertIn('GAUSSIANS_ZI_BACKEND', proc.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,334 @@
+"""Unit tests for the ZiArray (Gaussian integer array) class."""
+
+import random
+import unittest
+from array import array
+
+from src.zi import Zi
+from src.ziarray import ZiArray, ZiDivisor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+VALUES = [Zi(1, 2), Zi(3, 0), Zi(0, 4), Zi(-5, 6)]
+
+
+# ----------------------------------------------------------------------
+# Construction
+# ----------------------------------------------------------------------
+
+class TestInit(unittest.TestCase):
+    def test_default_is_empty(self):
+        self.assertEqual(len(ZiArray()), 0)
+
+    def test_from_zi_values(self):
+        a = ZiArray(VALUES)
+        self.assertEqual(len(a), 4)
+        self.assertEqual(a.tolist(), VALUES)
+
+    def test_mixed_values_are_converted(self):
+        a = ZiArray([Zi(1, 2), 3, 4j, 2.6 - 1.2j])
+        self.assertEqual(a.tolist(), [Zi(1, 2), Zi(3, 0), Zi(0, 4), Zi(3, -1)])
+
+    def test_interleaved_storage(self):
+        a = ZiArray(VALUES)
+        self.assertEqual(a.buffer.tolist(), [1, 2, 3, 0, 0, 4, -5, 6])
+
+    def test_split_storage(self):
+        a = ZiArray(VALUES, layout='split')
+        self.assertEqual(a.buffer.tolist(), [1, 3, 0, -5, 2, 0, 4, 6])
+        self.assertEqual(a.tolist(), VALUES)
+
+    def test_bad_layout_raises(self):
+        with self.assertRaises(ValueError):
+            ZiArray(VALUES, layout='columns')
+
+    def test_component_too_large_raises(self):
+        with self.assertRaises(OverflowError):
+            ZiArray([Zi(2 ** 70, 0)])
+
+    def test_invalid_value_raises(self):
+        with self.assertRaises(TypeError):
+            ZiArray(["nope"])
+
+    def test_zeros(self):
+        for layout in ('interleaved', 'split'):
+            self.assertEqual(ZiArray.zeros(3, layout).tolist(), [Zi()] * 3)
+
+
+# ----------------------------------------------------------------------
+# Buffers: zero-copy wrapping of array.array, bytes, split halves
+# ----------------------------------------------------------------------
+
+class TestFromBuffer(unittest.TestCase):
+    def test_wraps_array_without_copy(self):
+        data = array('q', [1, 2, 3, 4])
+        a = ZiArray.from_buffer(data)
+        self.assertEqual(a.tolist(), [Zi(1, 2), Zi(3, 4)])
+        data[0] = 10
+        self.assertEqual(a[0], Zi(10, 2))
+        a[1] = Zi(-7, 8)
+        self.assertEqual(data.tolist(), [10, 2, -7, 8])
+
+    def test_split_layout(self):
+        a = ZiArray.from_buffer(array('q', [1, 2, 3, 4]), layout='split')
+        self.assertEqual(a.tolist(), [Zi(1, 3), Zi(2, 4)])
+
+    def test_raw_bytes(self):
+        raw = ZiArray(VALUES).tobytes()
+        self.assertEqual(ZiArray.from_buffer(bytearray(raw)).tolist(), VALUES)
+
+    def test_read_only_buffer(self):
+        a = ZiArray.from_buffer(ZiArray(VALUES).tobytes())
+        self.assertTrue(a.readonly)
+        with self.assertRaises(TypeError):
+            a[0] = Zi(1, 1)
+
+    def test_odd_component_count_raises(self):
+        with self.assertRaises(ValueError):
+            ZiArray.from_buffer(array('q', [1, 2, 3]))
+
+    def test_wrong_format_raises(self):
+        with self.assertRaises(TypeError):
+            ZiArray.from_buffer(array('d', [1.0, 2.0]))
+        with self.assertRaises(TypeError):
+            ZiArray.from_buffer(array('i', [1, 2]))
+
+    def test_from_split(self):
+        re, im = array('q', [1, 2]), array('q', [3, 4])
+        a = ZiArray.from_split(re, im)
+        self.assertEqual(a.tolist(), [Zi(1, 3), Zi(2, 4)])
+        a[0] = Zi(9, 9)
+        self.assertEqual((re[0], im[0]), (9, 9))
+
+    def test_from_split_length_mismatch_raises(self):
+        with self.assertRaises(ValueError):
+            ZiArray.from_split(array('q', [1, 2]), array('q', [3]))
+
+    def test_component_views_share_storage(self):
+        a = ZiArray(VALUES)
+        self.assertEqual(a.real.tolist(), [1, 3, 0, -5])
+        self.assertEqual(a.imag.tolist(), [2, 0, 4, 6])
+        a.real[0] = 100
+        self.assertEqual(a[0], Zi(100, 2))
+
+    def test_from_complex_doubles(self):
+        a = ZiArray.from_complex(array('d', [1.4, 2.6, -3.5, 4.5]))
+        self.assertEqual(a.tolist(), [Zi(1.4 + 2.6j), Zi(-3.5 + 4.5j)])
+
+    def test_from_complex_iterable(self):
+        a = ZiArray.from_complex([1 + 2j, 3.6 - 1j], layout='split')
+        self.assertEqual(a.tolist(), [Zi(1, 2), Zi(4, -1)])
+
+
+# ----------------------------------------------------------------------
+# Indexing, slicing (views), assignment, equality
+# ----------------------------------------------------------------------
+
+class TestIndexing(unittest.TestCase):
+    def test_getitem(self):
+        a = ZiArray(VALUES)
+        self.assertEqual(a[0], Zi(1, 2))
+        self.assertEqual(a[-1], Zi(-5, 6))
+        with self.assertRaises(IndexError):
+            a[4]
+
+    def test_slices_are_views(self):
+        for layout in ('interleaved', 'split'):
+            a = ZiArray(VALUES, layout=layout)
+            view = a[1:3]
+            self.assertEqual(view.tolist(), VALUES[1:3])
+            view[0] = Zi(7, 7)
+            self.assertEqual(a[1], Zi(7, 7))
+
+    def test_stepped_slices(self):
+        a = ZiArray(VALUES)
+        self.assertEqual(a[::2].tolist(), VALUES[::2])
+        self.assertEqual(a[::-1].tolist(), VALUES[::-1])
+        self.assertEqual(a[::2][1:].tolist(), VALUES[::2][1:])
+
+    def test_contiguous_slice_has_buffer(self):
+        a = ZiArray(VALUES)
+        self.assertEqual(a[1:3].buffer.tolist(), [3, 0, 0, 4])
+
+    def test_strided_slice_has_no_buffer(self):
+        with self.assertRaises(BufferError):
+            ZiArray(VALUES)[::2].buffer
+
+    def test_slice_assignment(self):
+        a = ZiArray(VALUES)
+        a[0:2] = [Zi(8, 8), Zi(9, 9)]
+        self.assertEqual(a.tolist()[:2], [Zi(8, 8), Zi(9, 9)])
+        a[::2] = ZiArray([Zi(-1, -1), Zi(-2, -2)], layout='split')[::1]
+        self.assertEqual(a[0], Zi(-1, -1))
+        self.assertEqual(a[2], Zi(-2, -2))
+
+    def test_slice_assignment_length_mismatch_raises(self):
+        with self.assertRaises(ValueError):
+            ZiArray(VALUES)[0:2] = [Zi(1, 1)]
+
+    def test_equality_across_layouts(self):
+        self.assertEqual(ZiArray(VALUES), ZiArray(VALUES, layout='split'))
+        self.assertNotEqual(ZiArray(VALUES), ZiArray(VALUES[::-1]))
+
+    def test_copy_changes_layout_and_detaches(self):
+        a = ZiArray(VALUES)
+        b = a.copy(layout='split')
+        self.assertEqual(b.layout, 'split')
+        self.assertEqual(b, a)
+        b[0] = Zi(0, 0)
+        self.assertEqual(a[0], Zi(1, 2))
+
+    def test_copy_of_strided_view_is_contiguous(self):
+        b = ZiArray(VALUES)[::-2].copy()
+        self.assertEqual(b.buffer.tolist(), [-5, 6, 3, 0])
+
+
+# ----------------------------------------------------------------------
+# Chunked reductions: sum, prod (optionally mod m), gcd
+# ----------------------------------------------------------------------
+
+class TestReductions(unittest.TestCase):
+    def setUp(self):
+        self.values = [Zi(i % 17 - 8, (3 * i) % 11 - 5) for i in range(100)]
+        self.arr = ZiArray(self.values)
+
+    def test_chunks_cover_array_in_order(self):
+        chunks = list(self.arr.chunks(7))
+        self.assertEqual(len(chunks), 15)
+        self.assertEqual([z for c in chunks for z in c], self.values)
+
+    def test_chunk_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            list(self.arr.chunks(0))
+
+    def test_sum(self):
+        expected = Zi(0, 0)
+        for z in self.values:
+            expected += z
+        for size in (1, 7, 1000):
+            self.assertEqual(self.arr.sum(chunk_size=size), expected)
+
+    def test_sum_does_not_overflow_int64(self):
+        big = (1 << 63) - 1
+        self.assertEqual(ZiArray([Zi(big, -big)] * 4).sum(), Zi(4 * big, -4 * big))
+
+    def test_prod_mod(self):
+        m = Zi(7, 3)
+        expected = Zi(1, 0)
+        for z in self.values[:30]:
+            expected = (expected * z) % m
+        self.assertEqual(ZiArray(self.values[:30]).prod(mod=m, chunk_size=4), expected)
+
+    def test_prod_without_mod(self):
+        self.assertEqual(ZiArray(VALUES).prod(), Zi(1, 2) * 3 * Zi(0, 4) * Zi(-5, 6))
+        self.assertEqual(ZiArray().prod(), Zi(1, 0))
+
+    def test_gcd(self):
+        a = ZiArray([Zi(4, 2) * z for z in (Zi(3, 1), Zi(1, 5), Zi(2, 0))])
+        g = a.gcd(chunk_size=2)
+        self.assertEqual(g.norm(), Zi(4, 2).norm() * Zi.gcd(Zi.gcd(Zi(3, 1), Zi(1, 5)), 2).norm())
+        for z in a:
+            self.assertEqual(z % g, Zi(0, 0))
+
+    def test_gcd_stops_at_unit(self):
+        self.assertTrue(self.arr.gcd().is_unit)
+        self.assertEqual(ZiArray().gcd(), Zi(0, 0))
+
+
+# ----------------------------------------------------------------------
+# Array divmod / mod by a fixed divisor
+# ----------------------------------------------------------------------
+
+class TestDivisor(unittest.TestCase):
+    DIVISORS = (Zi(2, 0), Zi(1, 1), Zi(7, 3), Zi(-5, 12), Zi(0, -1), Zi(1000, 1))
+
+    def setUp(self):
+        rng = random.Random(30)
+        self.values = [Zi(rng.randint(-10 ** 6, 10 ** 6), rng.randint(-10 ** 6, 10 ** 6))
+                       for _ in range(500)]
+        # Small odd values divided by 2 or 1+i hit exact ties, which must
+        # round half to even like the scalar path.
+        self.values += [Zi(a, b) for a in range(-3, 4) for b in range(-3, 4)]
+
+    def test_divmod_matches_scalar(self):
+        for layout in ('interleaved', 'split'):
+            arr = ZiArray(self.values, layout=layout)
+            for b in self.DIVISORS:
+                q, r = arr.divmod(b, chunk_size=64)
+                self.assertEqual(q.layout, layout)
+                expected = [Zi.modified_divmod(z, b) for z in self.values]
+                self.assertEqual(q.tolist(), [e[0] for e in expected])
+                self.assertEqual(r.tolist(), [e[1] for e in expected])
+
+    def test_mod_matches_scalar(self):
+        arr = ZiArray(self.values)
+        for b in self.DIVISORS:
+            self.assertEqual(arr.mod(ZiDivisor(b)).tolist(), [z % b for z in self.values])
+
+    def test_large_components(self):
+        big = (1 << 62) - 1
+        values = [Zi(big, -big), Zi(-big, 3), Zi(12345, big)]
+        b = Zi(3, -7)
+        q, r = ZiArray(values).divmod(b)
+        self.assertEqual(q.tolist(), [z // b for z in values])
+        self.assertEqual(r.tolist(), [z % b for z in values])
+
+    def test_divisor_reused(self):
+        d = ZiDivisor(Zi(4, 1))
+        self.assertEqual(d.divisor, Zi(4, 1))
+        self.assertEqual(d.mod([Zi(10, 10)]).tolist(), [Zi(10, 10) % Zi(4, 1)])
+        self.assertEqual(d.mod(ZiArray([Zi(3, 3)]))[0], Zi(3, 3) % Zi(4, 1))
+
+    def test_zero_divisor_raises(self):
+        with self.assertRaises(ZeroDivisionError):
+            ZiDivisor(Zi(0, 0))
+        with self.assertRaises(ZeroDivisionError):
+            ZiArray(VALUES).mod(0)
+
+    def test_empty(self):
+        q, r = ZiArray().divmod(Zi(3, 1))
+        self.assertEqual((len(q), len(r)), (0, 0))
+
+
+# ----------------------------------------------------------------------
+# numpy interoperability (skipped when numpy isn't installed)
+# ----------------------------------------------------------------------
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestNumpy(unittest.TestCase):
+    def test_array_is_zero_copy_view(self):
+        a = ZiArray(VALUES)
+        arr = np.asarray(a)
+        self.assertEqual(arr.shape, (4, 2))
+        self.assertEqual(arr.tolist(), [[1, 2], [3, 0], [0, 4], [-5, 6]])
+        arr[0, 0] = 42
+        self.assertEqual(a[0], Zi(42, 2))
+
+    def test_split_array(self):
+        arr = np.asarray(ZiArray(VALUES, layout='split'))
+        self.assertEqual(arr.tolist(), [[1, 2], [3, 0], [0, 4], [-5, 6]])
+
+    def test_from_int64_array(self):
+        arr = np.array([[1, 2], [3, 4]], dtype=np.int64)
+        a = ZiArray.from_buffer(arr)
+        self.assertEqual(a.tolist(), [Zi(1, 2), Zi(3, 4)])
+
+    def test_complex_round_trip(self):
+        c = np.array([1.4 + 2.6j, -3.5 + 4.5j])
+        a = ZiArray.from_complex(c)
+        self.assertEqual(a.tolist(), [Zi(v) for v in c.tolist()])
+        self.assertEqual(a.to_complex().tolist(), [1 + 3j, -4 + 4j])
+
+    def test_from_complex_out_of_range(self):
+        for bad in (2.0 ** 63, -2.0 ** 63, float('nan'), float('inf')):
+            with self.assertRaises(OverflowError, msg=bad):
+                ZiArray.from_complex(np.array([complex(1, bad)]))
+            with self.assertRaises(OverflowError, msg=bad):
+                ZiArray.from_complex(np.array([complex(bad, 1)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""Unit tests for memory-mapped ZiArray files (src.zifile)."""
+
+import os
+import tempfile
+import unittest
+
+from src import zifile
+from src.zi import Zi
+from src.ziarray import ZiArray
+
+VALUES = [Zi(i, -2 * i + 1) for i in range(-50, 50)]
+
+
+class ZiFileTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'values.zia')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+
+# ----------------------------------------------------------------------
+# Header
+# ----------------------------------------------------------------------
+
+class TestHeader(ZiFileTestCase):
+    def test_header_fields(self):
+        zifile.save(self.path, VALUES, layout='split')
+        header = zifile.read_header(self.path)
+        self.assertEqual(header.version, zifile.VERSION)
+        self.assertEqual(header.dtype, 'q')
+        self.assertEqual(header.layout, 'split')
+        self.assertEqual(header.length, len(VALUES))
+
+    def test_file_size(self):
+        zifile.save(self.path, VALUES)
+        self.assertEqual(os.path.getsize(self.path), zifile.HEADER_SIZE + 16 * len(VALUES))
+
+    def test_bad_magic_raises(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 128)
+        with self.assertRaises(ValueError):
+            zifile.load(self.path)
+
+    def test_truncated_file_raises(self):
+        zifile.save(self.path, VALUES)
+        with open(self.path, 'r+b') as f:
+            f.truncate(zifile.HEADER_SIZE + 8)
+        with self.assertRaises(ValueError):
+            zifile.load(self.path)
+
+
+# ----------------------------------------------------------------------
+# Save / load round trips
+# ----------------------------------------------------------------------
+
+class TestRoundTrip(ZiFileTestCase):
+    def test_round_trip_each_layout(self):
+        for src_layout in ('interleaved', 'split'):
+            for file_layout in ('interleaved', 'split'):
+                zifile.save(self.path, ZiArray(VALUES, src_layout), layout=file_layout)
+                loaded = zifile.load(self.path)
+                self.assertEqual(loaded.layout, file_layout)
+                self.assertEqual(loaded.tolist(), VALUES)
+
+    def test_save_strided_view(self):
+        zifile.save(self.path, ZiArray(VALUES)[::3])
+        self.assertEqual(zifile.load(self.path).tolist(), VALUES[::3])
+
+    def test_empty(self):
+        zifile.save(self.path, [])
+        self.assertEqual(len(zifile.load(self.path)), 0)
+
+    def test_slices_of_mapped_array(self):
+        zifile.save(self.path, VALUES)
+        loaded = zifile.load(self.path)
+        self.assertEqual(loaded[10:20].tolist(), VALUES[10:20])
+        self.assertEqual(loaded[-1], VALUES[-1])
+
+
+# ----------------------------------------------------------------------
+# Access modes and create()
+# ----------------------------------------------------------------------
+
+class TestModes(ZiFileTestCase):
+    def test_read_only_by_default(self):
+        zifile.save(self.path, VALUES)
+        loaded = zifile.load(self.path)
+        self.assertTrue(loaded.readonly)
+        with self.assertRaises(TypeError):
+            loaded[0] = Zi(1, 1)
+
+    def test_read_write_persists(self):
+        zifile.save(self.path, VALUES)
+        loaded = zifile.load(self.path, mode='r+')
+        loaded[0] = Zi(99, 98)
+        del loaded
+        self.assertEqual(zifile.load(self.path)[0], Zi(99, 98))
+
+    def test_copy_on_write_does_not_persist(self):
+        zifile.save(self.path, VALUES)
+        loaded = zifile.load(self.path, mode='c')
+        loaded[0] = Zi(99, 98)
+        self.assertEqual(loaded[0], Zi(99, 98))
+        del loaded
+        self.assertEqual(zifile.load(self.path)[0], VALUES[0])
+
+    def test_bad_mode_raises(self):
+        zifile.save(self.path, VALUES)
+        with self.assertRaises(ValueError):
+            zifile.load(self.path, mode='w')
+
+    def test_create(self):
+        arr = zifile.create(self.path, 5, layout='split')
+        self.assertEqual(arr.tolist(), [Zi()] * 5)
+        arr[2] = Zi(-3, 4)
+        del arr
+        self.assertEqual(zifile.load(self.path)[2], Zi(-3, 4))
+
+
+# ----------------------------------------------------------------------
+# Streaming reductions over a mapped array
+# ----------------------------------------------------------------------
+
+class TestReductions(ZiFileTestCase):
+    def test_reductions_match_in_memory(self):
+        arr = ZiArray(VALUES)
+        zifile.save(self.path, arr)
+        loaded = zifile.load(self.path)
+        self.assertEqual(loaded.sum(chunk_size=16), arr.sum())
+        self.assertEqual(loaded.prod(mod=Zi(5, 2), chunk_size=16), arr.prod(mod=Zi(5, 2)))
+        self.assertEqual(loaded.gcd(chunk_size=16), arr.gcd())
+
+
+if __name__ == '__main__':
+    unittest.main()